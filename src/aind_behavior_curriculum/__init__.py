@@ -6,8 +6,12 @@ Modules in this file are public facing.
 
 __version__ = "0.0.42"
 
+from .base import json_schema, list_type_adapter, type_adapter
+from .binary import BinaryDocument, dump_binary, load_binary
 from .curriculum import (
     Curriculum,
+    CurriculumChange,
+    CurriculumDiff,
     Metrics,
     MetricsProvider,
     Policy,
@@ -15,15 +19,25 @@ from .curriculum import (
     Stage,
     StageGraph,
     StageTransition,
+    ValidationProblem,
+    ValidationReport,
     create_curriculum,
     make_task_discriminator,
+    parse_task,
+    peek_task_name,
+    task_dispatch_table,
 )
-from .curriculum_utils import GRADUATED, Graduated, export_diagram, export_json
+from .curriculum_utils import GRADUATED, Graduated, export_diagram, export_json, export_schemas
+from .migration import MigrationRegistry
+from .registry import CurriculumRegistry
+from .serialization import dump_compact_json, load_compact_json, load_json, load_trainer_states
 from .task import Task, TaskParameters, create_task
-from .trainer import Trainer, TrainerServer, TrainerState
+from .trainer import EvaluationTrace, Trainer, TrainerServer, TrainerState
 
 __all__ = [
     "Curriculum",
+    "CurriculumChange",
+    "CurriculumDiff",
     "Metrics",
     "MetricsProvider",
     "Policy",
@@ -31,16 +45,35 @@ __all__ = [
     "Stage",
     "StageGraph",
     "StageTransition",
+    "ValidationProblem",
+    "ValidationReport",
     "create_curriculum",
     "make_task_discriminator",
+    "parse_task",
+    "peek_task_name",
+    "task_dispatch_table",
     "GRADUATED",
     "Graduated",
     "Task",
     "TaskParameters",
     "create_task",
+    "EvaluationTrace",
     "Trainer",
     "TrainerServer",
     "TrainerState",
     "export_diagram",
     "export_json",
+    "export_schemas",
+    "json_schema",
+    "type_adapter",
+    "list_type_adapter",
+    "MigrationRegistry",
+    "CurriculumRegistry",
+    "dump_compact_json",
+    "load_compact_json",
+    "load_json",
+    "load_trainer_states",
+    "BinaryDocument",
+    "dump_binary",
+    "load_binary",
 ]
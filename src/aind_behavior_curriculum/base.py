@@ -2,10 +2,19 @@
 Base behavior pydantic object
 """
 
+import copy
+import datetime
+import decimal
+import enum
+import hashlib
+import json
+import uuid
 import warnings
-from typing import Literal, get_args, get_origin
+from functools import lru_cache
+from pathlib import PurePath
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Type, TypeVar, get_args, get_origin
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from semver import Version
 
 
@@ -73,3 +82,162 @@ def coerce_schema_version(cls: type[BaseModel], v: str, version_string: str = "v
             f"Will attempt to coerce. This will be considered a best-effort operation and may lead to a loss of information."
         )
     return str(_default_schema_version)
+
+
+_T = TypeVar("_T")
+
+# Types whose instances cannot be mutated and can therefore be shared between copies.
+_IMMUTABLE_TYPES = (
+    type(None),
+    bool,
+    int,
+    float,
+    complex,
+    str,
+    bytes,
+    range,
+    frozenset,
+    enum.Enum,
+    decimal.Decimal,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    uuid.UUID,
+    PurePath,
+)
+_ATOMIC_TYPES = frozenset((type(None), bool, int, float, str))
+
+
+def content_fingerprint(value: Any) -> str:
+    """Stable sha256 digest of a json-like value.
+
+    Dictionaries are hashed with sorted keys, so the digest does not depend on
+    dict ordering, nor on the process that computes it.
+    """
+    return hashlib.sha256(json.dumps(value, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+# Number of non-model types (e.g. unions of tasks) whose adapters are kept by type_adapter and list_type_adapter.
+TYPE_ADAPTER_CACHE_SIZE = 256
+
+# Name of the class attribute holding the cached schemas and adapters of a model type.
+_TYPE_CACHE_ATTRIBUTE = "_aind_type_cache"
+
+
+def _cached_on_model(model_type: Type[BaseModel], key: Tuple[str, ...], build: Callable[[], _T]) -> _T:
+    """Returns the value cached under key on the model type itself, building it on the first call.
+
+    The cache lives in the class dictionary (and is not inherited), so that
+    it is released together with dynamically created models, e.g. by `create_task`.
+    """
+    cache = model_type.__dict__.get(_TYPE_CACHE_ATTRIBUTE)
+    if cache is None:
+        cache = {}
+        setattr(model_type, _TYPE_CACHE_ATTRIBUTE, cache)
+    if (value := cache.get(key)) is None:
+        value = cache.setdefault(key, build())
+    return value
+
+
+def json_schema(
+    model_type: Type[BaseModel], mode: Literal["validation", "serialization"] = "validation"
+) -> Dict[str, Any]:
+    """JSON schema of a model type, generated once per type and mode.
+
+    Generating the schema of a curriculum or trainer state walks the whole
+    union of known tasks, so repeated exports reuse the cached schema.
+    A copy is returned, which callers are free to modify.
+    """
+    schema = _cached_on_model(model_type, ("json_schema", mode), lambda: model_type.model_json_schema(mode=mode))
+    return structural_copy(schema)
+
+
+def type_adapter(type_: Any) -> TypeAdapter:
+    """TypeAdapter of a type (e.g. a model or a union of tasks), built once per type.
+
+    Adapters of model types are stored on the model class; those of other
+    types in a cache bounded by TYPE_ADAPTER_CACHE_SIZE.
+    """
+    if isinstance(type_, type) and issubclass(type_, BaseModel):
+        return _cached_on_model(type_, ("type_adapter",), lambda: TypeAdapter(type_))
+    return _type_adapter(type_)
+
+
+def list_type_adapter(type_: Any) -> TypeAdapter:
+    """TypeAdapter of a list of a type, built once per type.
+
+    Useful to validate batches of trainer states or metrics in a single call,
+    e.g. `list_type_adapter(trainer.trainer_state_model).validate_json(data)`.
+    """
+    if isinstance(type_, type) and issubclass(type_, BaseModel):
+        # list[...] rather than typing.List[...], whose subscription cache would keep the model alive.
+        return _cached_on_model(type_, ("list_type_adapter",), lambda: TypeAdapter(list[type_]))
+    return _list_type_adapter(type_)
+
+
+@lru_cache(maxsize=TYPE_ADAPTER_CACHE_SIZE)
+def _type_adapter(type_: Any) -> TypeAdapter:
+    """Cached TypeAdapter of a non-model type, see type_adapter."""
+    return TypeAdapter(type_)
+
+
+@lru_cache(maxsize=TYPE_ADAPTER_CACHE_SIZE)
+def _list_type_adapter(type_: Any) -> TypeAdapter:
+    """Cached TypeAdapter of a list of a non-model type, see list_type_adapter."""
+    return TypeAdapter(List[type_])
+
+
+def structural_copy(value: _T, _memo: Optional[Dict[int, Any]] = None) -> _T:
+    """Copies value, sharing every immutable leaf with the original.
+
+    Pydantic models, lists, dicts and sets are copied, so that the copy can be
+    mutated (including in-place edits of nested models and containers) without
+    affecting the original. Immutable values (numbers, strings, enums, ...)
+    are shared instead of being duplicated, which makes this considerably cheaper
+    than `copy.deepcopy` for models holding large collections of scalars.
+    Unknown types fall back to `copy.deepcopy`.
+    """
+    if type(value) in _ATOMIC_TYPES or isinstance(value, _IMMUTABLE_TYPES):
+        return value
+
+    if _memo is None:
+        _memo = {}
+    elif (copied := _memo.get(id(value))) is not None:
+        return copied
+
+    if isinstance(value, BaseModel):
+        copied = value.__copy__()
+        _memo[id(value)] = copied
+        for attr in ("__dict__", "__pydantic_extra__", "__pydantic_private__"):
+            if (d := getattr(copied, attr, None)) is not None:
+                _copy_values_in_place(d, _memo)
+        return copied
+
+    if type(value) is list or type(value) is dict:
+        copied = value.copy()
+        _memo[id(value)] = copied
+        _copy_values_in_place(copied, _memo)
+        return copied
+
+    if type(value) is tuple:
+        copied = tuple(structural_copy(v, _memo) for v in value)
+        return value if all(a is b for a, b in zip(copied, value)) else copied
+
+    if type(value) is set:
+        # Set elements are hashable, and therefore (in practice) immutable.
+        copied = value.copy()
+        _memo[id(value)] = copied
+        return copied
+
+    return copy.deepcopy(value, _memo)
+
+
+def _copy_values_in_place(container: list | dict, memo: Dict[int, Any]) -> None:
+    """Replaces the non-atomic values of a (freshly copied) list or dict by their structural copies."""
+    items = enumerate(container) if isinstance(container, list) else container.items()
+    values = container if isinstance(container, list) else container.values()
+    if _ATOMIC_TYPES.issuperset(map(type, values)):
+        return
+    for k, v in items:
+        if type(v) not in _ATOMIC_TYPES:
+            container[k] = structural_copy(v, memo)
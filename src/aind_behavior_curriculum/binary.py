@@ -0,0 +1,487 @@
+"""
+Binary serialization of Curriculum and TrainerState objects.
+
+The binary format stores the tables of the compact format (see `serialization`)
+in length-prefixed sections, so that a reader can locate any rule, task,
+policy graph or stage in O(1) without decoding the rest of the document.
+
+Layout (little-endian):
+
+- header: magic `ABCB`, format version (u16), kind (u8), reserved (u8), number of sections (u32)
+- section directory: for each section, its tag (4 bytes), offset (u64) and length (u64)
+- sections:
+
+    - `RULE`: table of serialized rules (utf-8)
+    - `TASK`: table of serialized tasks (utf-8 json)
+    - `GRPH`: table of policy graph records
+    - `STGE`: table of stage records
+    - `BODY`: the curriculum or trainer state record
+
+A table is a u32 item count, followed by count + 1 u32 item offsets (relative to the
+end of the offsets) and the concatenated items. Records are made of u32 values,
+length-prefixed strings and length-prefixed json values. References to table items
+are u32 indices, 0xFFFFFFFF standing for None.
+"""
+
+import json
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable, Dict, List, Optional, Type, TypeVar, get_args
+
+from pydantic import BaseModel
+
+from aind_behavior_curriculum.curriculum import Curriculum, Stage
+from aind_behavior_curriculum.serialization import (
+    COMPACT_FORMAT,
+    COMPACT_FORMAT_VERSION,
+    _CompactDecoder,
+    from_compact,
+    to_compact,
+)
+from aind_behavior_curriculum.trainer import TrainerState
+
+BINARY_MAGIC = b"ABCB"
+BINARY_FORMAT_VERSION = 1
+
+TModel = TypeVar("TModel", bound=BaseModel)
+
+_KINDS = ("Curriculum", "TrainerState")
+_NONE = 0xFFFFFFFF
+_HEADER = struct.Struct("<4sHBBI")
+_SECTION = struct.Struct("<4sQQ")
+_U32 = struct.Struct("<I")
+_SECTIONS = (b"RULE", b"TASK", b"GRPH", b"STGE", b"BODY")
+
+
+class _RecordWriter:
+    """Appends the values of a binary record."""
+
+    def __init__(self) -> None:
+        """Initializes an empty record."""
+        self.data = bytearray()
+
+    def u32(self, value: Optional[int]) -> None:
+        """Appends an unsigned integer, or None."""
+        self.data += _U32.pack(_NONE if value is None else value)
+
+    def u32_list(self, values: Optional[List[int]]) -> None:
+        """Appends a length-prefixed list of unsigned integers, or None."""
+        if values is None:
+            self.u32(None)
+            return
+        self.u32(len(values))
+        self.data += struct.pack(f"<{len(values)}I", *values)
+
+    def string(self, value: str) -> None:
+        """Appends a length-prefixed utf-8 string."""
+        encoded = value.encode()
+        self.u32(len(encoded))
+        self.data += encoded
+
+    def json(self, value: Any) -> None:
+        """Appends a length-prefixed json value."""
+        self.string(json.dumps(value, separators=(",", ":")))
+
+    def graph(self, graph: Dict[str, Any]) -> None:
+        """Appends a graph of the compact format: node references, node ids and edges."""
+        self.u32_list(graph["nodes"])
+        self.u32_list(graph.get("ids"))
+        for edges in graph["edges"]:
+            self.u32_list(edges)
+
+
+class _RecordReader:
+    """Reads the values of a binary record."""
+
+    def __init__(self, buffer: memoryview, position: int) -> None:
+        """Starts reading buffer at position."""
+        self.buffer = buffer
+        self.position = position
+
+    def u32(self) -> Optional[int]:
+        """Reads an unsigned integer, or None."""
+        (value,) = _U32.unpack_from(self.buffer, self.position)
+        self.position += 4
+        return None if value == _NONE else value
+
+    def u32_list(self) -> Optional[List[int]]:
+        """Reads a length-prefixed list of unsigned integers, or None."""
+        if (count := self.u32()) is None:
+            return None
+        values = list(struct.unpack_from(f"<{count}I", self.buffer, self.position))
+        self.position += 4 * count
+        return values
+
+    def string(self) -> str:
+        """Reads a length-prefixed utf-8 string."""
+        length = self.u32()
+        assert length is not None
+        value = str(self.buffer[self.position : self.position + length], "utf-8")
+        self.position += length
+        return value
+
+    def json(self) -> Any:
+        """Reads a length-prefixed json value."""
+        return json.loads(self.string())
+
+    def graph(self) -> Dict[str, Any]:
+        """Reads a graph of the compact format."""
+        nodes = self.u32_list()
+        assert nodes is not None
+        graph: Dict[str, Any] = {"nodes": nodes}
+        if (ids := self.u32_list()) is not None:
+            graph["ids"] = ids
+        graph["edges"] = [self.u32_list() for _ in nodes]
+        return graph
+
+
+def _table(items: List[bytes]) -> bytes:
+    """Encodes a table of items."""
+    offsets = [0]
+    for item in items:
+        offsets.append(offsets[-1] + len(item))
+    return struct.pack(f"<I{len(offsets)}I", len(items), *offsets) + b"".join(items)
+
+
+class _Table(Sequence):
+    """
+    Table of a binary document. Items are decoded on access, and cached.
+    """
+
+    def __init__(self, buffer: memoryview, offset: int, decode: Callable[[memoryview], Any]) -> None:
+        """
+        Initializes the table stored at offset in buffer.
+
+        Args:
+            buffer (memoryview): The binary document.
+            offset (int): Offset of the table in the document.
+            decode (Callable[[memoryview], Any]): Decodes the bytes of an item.
+        """
+        self._buffer = buffer
+        (self._count,) = _U32.unpack_from(buffer, offset)
+        self._offsets = offset + 4
+        self._items = self._offsets + 4 * (self._count + 1)
+        self._decode = decode
+        self._decoded: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        """Number of items in the table."""
+        return self._count
+
+    def __getitem__(self, index: int) -> Any:  # type: ignore[override]
+        """Decodes the item at index."""
+        if (item := self._decoded.get(index)) is None:
+            item = self._decoded[index] = self._decode(self.raw(index))
+        return item
+
+    def raw(self, index: int) -> memoryview:
+        """Undecoded bytes of the item at index."""
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        start, stop = struct.unpack_from("<2I", self._buffer, self._offsets + 4 * index)
+        return self._buffer[self._items + start : self._items + stop]
+
+
+def _utf8(item: memoryview) -> str:
+    """Decodes a table item as a string."""
+    return str(item, "utf-8")
+
+
+def _encode_stage(stage: Dict[str, Any]) -> bytes:
+    """Encodes a stage of the compact format."""
+    record = _RecordWriter()
+    record.string(stage["name"])
+    record.u32(stage["task"])
+    record.u32(stage["graph"])
+    record.u32_list(stage["start_policies"])
+    record.u32(stage["metrics_provider"])
+    record.json(stage.get("fields"))
+    return bytes(record.data)
+
+
+def _decode_stage(item: memoryview) -> Dict[str, Any]:
+    """Decodes a stage of the compact format."""
+    record = _RecordReader(item, 0)
+    stage = {
+        "name": record.string(),
+        "task": record.u32(),
+        "graph": record.u32(),
+        "start_policies": record.u32_list(),
+        "metrics_provider": record.u32(),
+    }
+    if (fields := record.json()) is not None:
+        stage["fields"] = fields
+    return stage
+
+
+def _decode_graph(item: memoryview) -> Dict[str, Any]:
+    """Decodes a policy graph of the compact format."""
+    return _RecordReader(item, 0).graph()
+
+
+def _encode_graph(graph: Dict[str, Any]) -> bytes:
+    """Encodes a policy graph of the compact format."""
+    record = _RecordWriter()
+    record.graph(graph)
+    return bytes(record.data)
+
+
+def _encode_curriculum(record: _RecordWriter, curriculum: Dict[str, Any]) -> None:
+    """Encodes the curriculum body of the compact format."""
+    record.json(curriculum["fields"])
+    record.graph(curriculum["graph"])
+
+
+def _decode_curriculum(record: _RecordReader) -> Dict[str, Any]:
+    """Decodes the curriculum body of the compact format."""
+    return {"fields": record.json(), "graph": record.graph()}
+
+
+def _encode_body(kind: str, body: Dict[str, Any]) -> bytes:
+    """Encodes the body of a compact document."""
+    record = _RecordWriter()
+    if kind == "Curriculum":
+        _encode_curriculum(record, body)
+    else:
+        record.json(body["fields"])
+        record.u32(None if body["curriculum"] is None else 1)
+        if body["curriculum"] is not None:
+            _encode_curriculum(record, body["curriculum"])
+        record.u32(body["stage"])
+        record.u32_list(body["active_policies"])
+        record.u32(body["task"])
+    return bytes(record.data)
+
+
+def _decode_body(kind: str, item: memoryview) -> Dict[str, Any]:
+    """Decodes the body of a compact document."""
+    record = _RecordReader(item, 0)
+    if kind == "Curriculum":
+        return _decode_curriculum(record)
+    fields = record.json()
+    curriculum = None if record.u32() is None else _decode_curriculum(record)
+    return {
+        "fields": fields,
+        "curriculum": curriculum,
+        "stage": record.u32(),
+        "active_policies": record.u32_list(),
+        "task": record.u32(),
+    }
+
+
+def to_binary(model: Curriculum | TrainerState) -> bytes:
+    """
+    Encodes a Curriculum or TrainerState into the binary format.
+
+    Args:
+        model (Curriculum | TrainerState): The object to encode.
+
+    Returns:
+        bytes: The binary document.
+    """
+    compact = to_compact(model)
+    sections = {
+        b"RULE": _table([rule.encode() for rule in compact["rules"]]),
+        b"TASK": _table([json.dumps(task, separators=(",", ":")).encode() for task in compact["tasks"]]),
+        b"GRPH": _table([_encode_graph(graph) for graph in compact["graphs"]]),
+        b"STGE": _table([_encode_stage(stage) for stage in compact["stages"]]),
+        b"BODY": _encode_body(compact["kind"], compact["body"]),
+    }
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    directory = bytearray()
+    for tag, section in sections.items():
+        directory += _SECTION.pack(tag, offset, len(section))
+        offset += len(section)
+    header = _HEADER.pack(BINARY_MAGIC, BINARY_FORMAT_VERSION, _KINDS.index(compact["kind"]), 0, len(sections))
+    return header + bytes(directory) + b"".join(sections.values())
+
+
+class BinaryDocument:
+    """
+    Reads a binary document (see `to_binary`), decoding only what is accessed.
+
+    The document can be read from bytes or from a memory-mapped file. Opening it only
+    reads the header and section directory; rules, tasks, policy graphs and stages are
+    decoded on access. A single stage of the curriculum can therefore be loaded without
+    decoding the rest of the document.
+
+    Example:
+        with BinaryDocument.open("curriculum.bin") as document:
+            stage = document.load_stage(MyCurriculum, "StageA")
+    """
+
+    def __init__(self, data: bytes | bytearray | memoryview | mmap.mmap) -> None:
+        """
+        Reads the header and section directory of a binary document.
+
+        Args:
+            data (bytes | bytearray | memoryview | mmap.mmap): The binary document.
+
+        Raises:
+            ValueError: If data is not a binary document of a supported version.
+        """
+        self._mmap = data if isinstance(data, mmap.mmap) else None
+        self._buffer = memoryview(data)
+        if len(self._buffer) < _HEADER.size:
+            raise ValueError("Data is not a binary curriculum document.")
+        magic, version, kind, _, n_sections = _HEADER.unpack_from(self._buffer, 0)
+        if magic != BINARY_MAGIC:
+            raise ValueError("Data is not a binary curriculum document.")
+        if version != BINARY_FORMAT_VERSION:
+            raise ValueError(f"Unsupported binary format version {version}.")
+        self.kind: str = _KINDS[kind]
+
+        sections = {}
+        for i in range(n_sections):
+            tag, offset, length = _SECTION.unpack_from(self._buffer, _HEADER.size + _SECTION.size * i)
+            if offset + length > len(self._buffer):
+                raise ValueError(f"Section {tag.decode()} is truncated.")
+            sections[tag] = (offset, length)
+        if missing := [tag.decode() for tag in _SECTIONS if tag not in sections]:
+            raise ValueError(f"Binary document is missing sections {missing}.")
+
+        self._rules = _Table(self._buffer, sections[b"RULE"][0], _utf8)
+        self._tasks = _Table(self._buffer, sections[b"TASK"][0], lambda item: json.loads(_utf8(item)))
+        self._graphs = _Table(self._buffer, sections[b"GRPH"][0], _decode_graph)
+        self._stages = _Table(self._buffer, sections[b"STGE"][0], _decode_stage)
+        body_offset, body_length = sections[b"BODY"]
+        self._body_bytes = self._buffer[body_offset : body_offset + body_length]
+        self._body: Optional[Dict[str, Any]] = None
+        # Stage name -> stage id of the curriculum stages
+        self._stage_ids: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def open(cls, path: str | os.PathLike) -> "BinaryDocument":
+        """
+        Memory-maps a binary document stored in a file.
+        The file is only read as the document is accessed.
+        """
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __enter__(self) -> "BinaryDocument":
+        """Returns the document."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Closes the document."""
+        self.close()
+
+    def close(self) -> None:
+        """Releases the document, and closes its memory map if it was opened from a file."""
+        self._body_bytes.release()
+        self._buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def _compact_body(self) -> Dict[str, Any]:
+        """The decoded body."""
+        if self._body is None:
+            self._body = _decode_body(self.kind, self._body_bytes)
+        return self._body
+
+    def _curriculum_body(self) -> Dict[str, Any]:
+        """The decoded curriculum body."""
+        body = self._compact_body()
+        curriculum = body if self.kind == "Curriculum" else body["curriculum"]
+        if curriculum is None:
+            raise ValueError("The trainer state has no curriculum.")
+        return curriculum
+
+    def stage_names(self) -> List[str]:
+        """Names of the curriculum stages, in node order."""
+        return list(self._curriculum_stage_ids())
+
+    def _curriculum_stage_ids(self) -> Dict[str, int]:
+        """Stage name -> stage id of the curriculum stages."""
+        if self._stage_ids is None:
+            self._stage_ids = {
+                _RecordReader(self._stages.raw(stage_id), 0).string(): stage_id
+                for stage_id in self._curriculum_body()["graph"]["nodes"]
+            }
+        return self._stage_ids
+
+    def load_stage(self, curriculum_type: Type[Curriculum], name: str) -> Stage:
+        """
+        Loads a single stage of the curriculum, decoding only the records it references.
+
+        Args:
+            curriculum_type (Type[Curriculum]): The Curriculum type the document was created from,
+                which defines the task types of its stages.
+            name (str): Stage name.
+
+        Raises:
+            KeyError: If the curriculum has no stage with this name.
+        """
+        if (stage_id := self._curriculum_stage_ids().get(name)) is None:
+            raise KeyError(f"Stage {name} is not in the curriculum.")
+        stage = self._decoder().stage(stage_id)
+        return _stage_type(curriculum_type).model_validate_json(json.dumps(stage))
+
+    def load(self, model_type: Type[TModel], lazy_tasks: bool = False) -> TModel:
+        """
+        Decodes the whole document into an instance of model_type.
+
+        Args:
+            model_type (Type[TModel]): The Curriculum or TrainerState type to deserialize into.
+            lazy_tasks (bool): If True, the task of each stage is only validated
+                once it is accessed. See `serialization.load_json`.
+        """
+        document = {
+            "format": COMPACT_FORMAT,
+            "format_version": COMPACT_FORMAT_VERSION,
+            "kind": self.kind,
+            **self._header(),
+            "body": self._compact_body(),
+        }
+        return from_compact(model_type, document, lazy_tasks=lazy_tasks)
+
+    def _header(self) -> Dict[str, Any]:
+        """Tables of the compact format, decoded on access."""
+        return {"rules": self._rules, "tasks": self._tasks, "graphs": self._graphs, "stages": self._stages}
+
+    def _decoder(self) -> _CompactDecoder:
+        """Decoder of the compact format over the tables of the document."""
+        return _CompactDecoder(self._header())
+
+
+def _stage_type(curriculum_type: Type[Curriculum]) -> Type[Stage]:
+    """Stage type of the nodes of a Curriculum type, i.e. Stage[Metrics, <known tasks>]."""
+    nodes = curriculum_type.model_fields["graph"].annotation.model_fields["nodes"].annotation
+    return get_args(nodes)[1]
+
+
+def from_binary(model_type: Type[TModel], data: bytes | bytearray | memoryview, lazy_tasks: bool = False) -> TModel:
+    """
+    Decodes a binary document (see `to_binary`) into an instance of model_type.
+    """
+    document = BinaryDocument(data)
+    try:
+        return document.load(model_type, lazy_tasks=lazy_tasks)
+    finally:
+        document.close()
+
+
+def dump_binary(model: Curriculum | TrainerState, path: str | os.PathLike) -> None:
+    """
+    Writes a Curriculum or TrainerState to a binary file.
+    """
+    Path(path).write_bytes(to_binary(model))
+
+
+def load_binary(model_type: Type[TModel], path: str | os.PathLike, lazy_tasks: bool = False) -> TModel:
+    """
+    Reads a binary file (see `dump_binary`) into an instance of model_type.
+    """
+    with BinaryDocument.open(path) as document:
+        return document.load(model_type, lazy_tasks=lazy_tasks)
@@ -4,17 +4,28 @@ Core Stage and Curriculum Primitives.
 
 import importlib
 import inspect
+import json
+import pickle
+import re
+import threading
 import warnings
-from types import EllipsisType
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from types import EllipsisType, MappingProxyType, NoneType
 from typing import (
     Annotated,
     Any,
     Callable,
     Dict,
+    FrozenSet,
     Generic,
     Iterable,
     List,
     Literal,
+    Mapping,
     Optional,
     ParamSpec,
     Self,
@@ -24,14 +35,29 @@ from typing import (
     Union,
 )
 
-from pydantic import Field, GetJsonSchemaHandler, ValidationError, create_model, field_validator
+from pydantic import (
+    ConfigDict,
+    Field,
+    GetJsonSchemaHandler,
+    PrivateAttr,
+    SerializerFunctionWrapHandler,
+    ValidationError,
+    ValidationInfo,
+    create_model,
+    field_serializer,
+    field_validator,
+)
 from pydantic.json_schema import JsonSchemaValue
-from pydantic_core import core_schema
+from pydantic_core import PydanticCustomError, PydanticSerializationError, core_schema
 from typing_extensions import TypeAliasType, cast, deprecated, get_args, get_origin
 
 from aind_behavior_curriculum.base import (
     AindBehaviorModel,
     AindBehaviorModelExtra,
+    _cached_on_model,
+    content_fingerprint,
+    structural_copy,
+    type_adapter,
 )
 from aind_behavior_curriculum.task import SEMVER_REGEX, Task, TaskParameters
 
@@ -43,6 +69,75 @@ _R = TypeVar("_R")
 
 TTaskParameters = TypeVar("TTaskParameters", bound=TaskParameters)
 
+# Number of sets of task types (and of task annotations) whose union types and dispatch tables are kept.
+TASK_TYPE_CACHE_SIZE = 256
+
+# Set of task types -> discriminated union type, see make_task_discriminator. Least recently used first.
+_TASK_DISCRIMINATORS: "OrderedDict[FrozenSet[type], Any]" = OrderedDict()
+# Set of task types -> (task name -> task type), see task_dispatch_table. Least recently used first.
+_TASK_DISPATCH_TABLES: "OrderedDict[FrozenSet[type], Mapping[str, Any]]" = OrderedDict()
+_task_type_caches_lock = threading.Lock()
+# (name, version, set of tasks, pkg_location) -> Curriculum type created by create_curriculum.
+# Values are weak, so that curriculum types nobody uses any more are released.
+_CURRICULUM_TYPES: "weakref.WeakValueDictionary[Tuple[str, str, FrozenSet[type], Optional[str]], Any]" = (
+    weakref.WeakValueDictionary()
+)
+
+VALIDATION_CACHE_SIZE = 4096
+
+# (model type, fingerprint) of stages and curricula that passed validation,
+# least recently used first. See Stage.validate_stage and Curriculum.validate_curriculum.
+_validated_models: "OrderedDict[Tuple[type, str], None]" = OrderedDict()
+_validated_models_lock = threading.Lock()
+
+
+def _canonical_graph(
+    graph: Dict[Any, Any], node_name: Callable[[Any], str], canonical_node: Callable
+) -> Dict[str, Any]:
+    """
+    Canonical form of a serialized behavior graph, used for fingerprints.
+    Nodes and transitions are keyed by node name rather than by node id,
+    so that the form does not depend on the order in which nodes were added.
+    Transitions keep their priority order.
+    """
+    names = {int(node_id): node_name(node) for node_id, node in graph["nodes"].items()}
+    return {
+        "nodes": {names[int(node_id)]: canonical_node(node) for node_id, node in graph["nodes"].items()},
+        "transitions": {
+            names.get(int(node_id), f"#{node_id}"): [
+                [rule, names.get(dest_id, f"#{dest_id}")] for rule, dest_id in edges
+            ]
+            for node_id, edges in graph["graph"].items()
+        },
+    }
+
+
+def _canonical_stage(stage: Dict[str, Any]) -> Dict[str, Any]:
+    """Canonical form of a serialized stage, used for fingerprints."""
+    return {**stage, "graph": _canonical_graph(stage["graph"], lambda policy: policy, lambda policy: policy)}
+
+
+def _is_validated(key: Tuple[type, str]) -> bool:
+    """Whether the model with the given validation key passed validation before."""
+    with _validated_models_lock:
+        if key not in _validated_models:
+            return False
+        _validated_models.move_to_end(key)
+        return True
+
+
+def _mark_validated(key: Tuple[type, str]) -> None:
+    """Records that the model with the given validation key passed validation."""
+    with _validated_models_lock:
+        _validated_models[key] = None
+        if len(_validated_models) > VALIDATION_CACHE_SIZE:
+            _validated_models.popitem(last=False)
+
+
+# Callable -> _Rule types whose signature the callable has already been validated against.
+# Deserializing a graph validates the same few rules once per edge.
+_VALIDATED_CALLABLES: "weakref.WeakKeyDictionary[Callable, set]" = weakref.WeakKeyDictionary()
+
 
 class Metrics(AindBehaviorModelExtra):
     """
@@ -54,6 +149,10 @@ class Metrics(AindBehaviorModelExtra):
 TMetrics = TypeVar("TMetrics", bound=Metrics)
 
 
+# Validation context key of a dict in which deserialized rules are reused, see `serialization.load_trainer_states`.
+_RULES_CONTEXT_KEY = "rules"
+
+
 class _Rule(Generic[_P, _R]):
     """
     Custom Pydantic Type that defines de/serialization for Callables.
@@ -87,6 +186,7 @@ class _Rule(Generic[_P, _R]):
         if not skip_validation:
             self._validate_callable_typing(function)
         self._callable = function
+        self._name: Optional[str] = None
 
     def invoke(self, *args: _P.args, **kwargs: _P.kwargs) -> _R:
         """Wraps the inner callable."""
@@ -118,7 +218,10 @@ class _Rule(Generic[_P, _R]):
         """
         Name of the Rule.
         """
-        return self.serialize_rule(self)
+        # The wrapped callable never changes, so the name is computed once.
+        if self._name is None:
+            self._name = self.serialize_rule(self)
+        return self._name
 
     @property
     def callable(self) -> Callable[_P, _R]:
@@ -139,7 +242,7 @@ class _Rule(Generic[_P, _R]):
         from_str_schema = core_schema.chain_schema(
             [
                 core_schema.str_schema(),
-                core_schema.no_info_plain_validator_function(cls._deserialize_rule),
+                core_schema.with_info_plain_validator_function(cls._deserialize_rule_in_context),
             ]
         )
 
@@ -215,6 +318,19 @@ class _Rule(Generic[_P, _R]):
 
         return cls(callable_handle)
 
+    @classmethod
+    def _deserialize_rule_in_context(cls, value: str, info: ValidationInfo) -> "_Rule[_P, _R]":
+        """
+        Deserializes a rule, reusing the rules held by the validation context, if any.
+        Rules wrap a callable that never changes, so one instance can be shared by many models.
+        """
+        rules = info.context.get(_RULES_CONTEXT_KEY) if info.context else None
+        if rules is None:
+            return cls._deserialize_rule(value)
+        if (rule := rules.get((cls, value))) is None:
+            rule = rules[(cls, value)] = cls._deserialize_rule(value)
+        return rule
+
     @classmethod
     def serialize_rule(cls, value: Union[str, "_Rule[_P, _R]"]) -> str:
         """
@@ -260,6 +376,12 @@ class _Rule(Generic[_P, _R]):
         if not callable(r):
             raise ValueError("Rule must be callable.")
 
+        try:
+            if cls in _VALIDATED_CALLABLES.get(r, ()):
+                return
+        except TypeError:  # Not weak-referenceable or not hashable
+            pass
+
         # For some reason, generics do not materialize by default.
         # We fetch them manually....
         if isinstance(x := cls._solve_generic_typing(cls), TypeError):
@@ -282,6 +404,11 @@ class _Rule(Generic[_P, _R]):
             e.add_note(f"Expected callable type signature: {expected_callable} -> {expected_return}. Got {sig}.")
             raise e
 
+        try:
+            _VALIDATED_CALLABLES.setdefault(r, set()).add(cls)
+        except TypeError:
+            pass
+
     @staticmethod
     def _validate_signature_input(expected_callable: Any, sig: inspect.Signature) -> Optional[TypeError]:
         """Validates the input signature of the incoming callable against
@@ -458,34 +585,129 @@ class _BehaviorGraph(AindBehaviorModel, Generic[NodeTypes, EdgeType]):
     nodes: Dict[int, NodeTypes] = Field(default={}, validate_default=True)
     graph: Dict[int, List[Tuple[EdgeType, int]]] = Field(default={}, validate_default=True)
 
+    # Maps node names to the ids of the nodes with that name. Names are only a
+    # shortcut: distinct rules can share a qualified name (e.g. closures created
+    # by the same factory), so node identity is always resolved by equality.
+    _node_index: Dict[str, List[int]] = PrivateAttr(default_factory=dict)
+    # Number of node ids in the index, used to detect nodes added outside of the graph API.
+    _indexed_nodes: int = PrivateAttr(default=0)
+    # Largest node id, or -1 if the graph is empty. Maintained by the graph API.
+    _max_node_id: int = PrivateAttr(default=-1)
+    # Incremented on every structural change, used to invalidate derived caches.
+    _version: int = PrivateAttr(default=0)
+    # (graph version, node id -> transitions) lookup table used during evaluation.
+    _transition_table: Optional[Tuple[int, Dict[int, Tuple[Tuple[EdgeType, NodeTypes], ...]]]] = PrivateAttr(
+        default=None
+    )
+
+    def model_post_init(self, __context):
+        """Builds the node name index after validation."""
+        super().model_post_init(__context)
+        self._rebuild_node_index()
+
+    def _rebuild_node_index(self) -> None:
+        """
+        Rebuilds the node name index from scratch.
+        """
+        node_index: Dict[str, List[int]] = {}
+        for node_id, node in self.nodes.items():
+            node_index.setdefault(node.name, []).append(node_id)
+        self._node_index = node_index
+        self._indexed_nodes = len(self.nodes)
+        self._max_node_id = max(self.nodes, default=-1)
+        self._version += 1
+
+    def _node_ids_named(self, name: str) -> List[int]:
+        """
+        Resolves the ids of the nodes with the given name.
+        The index is rebuilt if the nodes were modified outside of the graph API.
+        """
+        node_ids = self._node_index.get(name, [])
+        if any(node_id not in self.nodes or self.nodes[node_id].name != name for node_id in node_ids):
+            self._rebuild_node_index()
+            node_ids = self._node_index.get(name, [])
+        return node_ids
+
+    def _lookup_node_id(self, name: str) -> Optional[int]:
+        """
+        Resolves the id of the first node with the given name, or None.
+        """
+        node_ids = self._node_ids_named(name)
+        if not node_ids and self._indexed_nodes != len(self.nodes):
+            # Only rebuild for a miss if nodes were added outside of the graph API,
+            # rebuilding on every miss makes building a graph quadratic.
+            self._rebuild_node_index()
+            node_ids = self._node_index.get(name, [])
+        return node_ids[0] if node_ids else None
+
+    def _find_node_id(self, node: NodeTypes) -> Optional[int]:
+        """
+        Resolves the id of the node equal to the given node, or None.
+        """
+        for _ in range(2):
+            for node_id in self._node_ids_named(node.name):
+                if self.nodes[node_id] == node:
+                    return node_id
+            if self._indexed_nodes == len(self.nodes):
+                return None
+            # Nodes were added outside of the graph API
+            self._rebuild_node_index()
+        return None
+
+    def _has_node(self, node: NodeTypes) -> bool:
+        """
+        Checks whether node is in the behavior graph.
+        """
+        return self._find_node_id(node) is not None
+
     def _get_node_id(self, node: NodeTypes) -> int:
         """
-        Dictionaries are ordered for Python 3.7+ so this is safe.
-        This library requires Python 3.8+.
+        Resolves the id of a node in the behavior graph.
+        """
+        node_id = self._find_node_id(node)
+        if node_id is None:
+            raise ValueError(f"Node {node} is not in the behavior graph.")
+        return node_id
+
+    def _check_mutable(self) -> None:
+        """
+        Called before the graph is modified.
         """
-        dict_keys = list(self.nodes.keys())
-        dict_values = list(self.nodes.values())
+        pass
 
-        i = dict_values.index(node)
-        return dict_keys[i]
+    def get_node(self, name: str) -> NodeTypes:
+        """
+        Get the node with the given name.
+        """
+        node_id = self._lookup_node_id(name)
+        if node_id is None:
+            raise ValueError(f"Node {name} is not in the behavior graph.")
+        return self.nodes[node_id]
 
     def _create_node_id(self) -> int:
         """
         Helper method for add_node and add_transition.
         More readable than using hash(Policy).
         """
-        new_id = 0
-        if len(self.nodes) > 0:
-            new_id = max(len(self.nodes), max(self.nodes.keys()) + 1)
+        new_id = max(len(self.nodes), self._max_node_id + 1)
+        if new_id in self.nodes or (self.nodes and self._max_node_id not in self.nodes):
+            # The nodes were modified outside of the graph API
+            self._rebuild_node_index()
+            new_id = max(len(self.nodes), self._max_node_id + 1)
         return new_id
 
     def add_node(self, node: NodeTypes) -> None:
         """
         Adds a floating node to the behavior graph.
         """
+        self._check_mutable()
         p_id = self._create_node_id()
         self.nodes[p_id] = node
         self.graph[p_id] = []
+        self._node_index.setdefault(node.name, []).append(p_id)
+        self._indexed_nodes += 1
+        self._max_node_id = max(self._max_node_id, p_id)
+        self._version += 1
 
     def remove_node(self, node: NodeTypes) -> None:
         """
@@ -494,7 +716,8 @@ class _BehaviorGraph(AindBehaviorModel, Generic[NodeTypes, EdgeType]):
         NOTE: Removed nodes and transitions have the side effect
         of changing transition priority.
         """
-        if node not in self.nodes.values():
+        self._check_mutable()
+        if not self._has_node(node):
             raise ValueError(f"Node {node} is not in the graph to be removed.")
 
         # Resolve node id
@@ -502,6 +725,14 @@ class _BehaviorGraph(AindBehaviorModel, Generic[NodeTypes, EdgeType]):
 
         # Remove node from node list
         del self.nodes[p_id]
+        node_ids = self._node_index[node.name]
+        node_ids.remove(p_id)
+        if not node_ids:
+            del self._node_index[node.name]
+        self._indexed_nodes -= 1
+        if p_id == self._max_node_id:
+            self._max_node_id = max(self.nodes, default=-1)
+        self._version += 1
 
         # Remove node from graph keys
         del self.graph[p_id]
@@ -530,23 +761,21 @@ class _BehaviorGraph(AindBehaviorModel, Generic[NodeTypes, EdgeType]):
         NOTE: The order in which this method
         is called sets the order of transition priority.
         """
+        self._check_mutable()
 
         # Resolve id of start_node
-        if start_node not in self.nodes.values():
-            new_id = self._create_node_id()
-            self.nodes[new_id] = start_node
-            self.graph[new_id] = []
+        if not self._has_node(start_node):
+            self.add_node(start_node)
         start_id = self._get_node_id(start_node)
 
         # Resolve id of dest_node
-        if dest_node not in self.nodes.values():
-            new_id = self._create_node_id()
-            self.nodes[new_id] = dest_node
-            self.graph[new_id] = []
+        if not self._has_node(dest_node):
+            self.add_node(dest_node)
         dest_id = self._get_node_id(dest_node)
 
         # Add the new transition to the graph
         self.graph[start_id].append((rule, dest_id))
+        self._version += 1
 
     def remove_node_transition(
         self,
@@ -562,11 +791,12 @@ class _BehaviorGraph(AindBehaviorModel, Generic[NodeTypes, EdgeType]):
         NOTE: Removed nodes and transitions has the side effect
         of changing transition priority.
         """
+        self._check_mutable()
 
-        if start_node not in self.nodes.values():
+        if not self._has_node(start_node):
             raise ValueError(f"Node {start_node} is not in the behavior graph to be removed.")
 
-        if dest_node not in self.nodes.values():
+        if not self._has_node(dest_node):
             raise ValueError(f"Node {dest_node} is not in the behavior graph to be removed.")
 
         start_id = self._get_node_id(start_node)
@@ -582,6 +812,7 @@ class _BehaviorGraph(AindBehaviorModel, Generic[NodeTypes, EdgeType]):
 
         # Remove transition
         self.graph[start_id].remove((rule, dest_id))
+        self._version += 1
 
     def see_nodes(self) -> List[NodeTypes]:
         """
@@ -594,13 +825,35 @@ class _BehaviorGraph(AindBehaviorModel, Generic[NodeTypes, EdgeType]):
         See transitions of node in behavior graph.
         """
 
-        if node not in self.nodes.values():
-            raise ValueError(f"Node {node} is not in the behavior graph.")
-
         node_id = self._get_node_id(node)
         node_list = self.graph[node_id]
         return [(rule, self.nodes[p_id]) for (rule, p_id) in node_list]
 
+    def _get_transitions(self, node: NodeTypes) -> Tuple[Tuple[EdgeType, NodeTypes], ...]:
+        """
+        Immutable, prioritized (rule, destination node) transitions of node, used during evaluation.
+        Transitions of all nodes are resolved at once, and cached until the graph changes through
+        the graph API. Unlike see_node_transitions, direct edits of `graph` are not picked up.
+        """
+        node_id = self._get_node_id(node)
+        return self._get_transition_table()[node_id]
+
+    def _get_transition_table(self) -> Dict[int, Tuple[Tuple[EdgeType, NodeTypes], ...]]:
+        """
+        Node id -> transitions lookup table, cached until the graph changes.
+        """
+        table = self._transition_table
+        if table is None or table[0] != self._version:
+            table = (
+                self._version,
+                {
+                    start_id: tuple((rule, self.nodes[dest_id]) for rule, dest_id in transitions)
+                    for start_id, transitions in self.graph.items()
+                },
+            )
+            self._transition_table = table
+        return table[1]
+
     def set_transition_priority(
         self,
         node: NodeTypes,
@@ -610,15 +863,17 @@ class _BehaviorGraph(AindBehaviorModel, Generic[NodeTypes, EdgeType]):
         Change order of node transitions listed under a node.
         Highest priority is ordered in node_transition from left -> right.
         """
+        self._check_mutable()
 
         input_transitions = []
         for rule, n in node_transitions:
-            if n not in self.nodes.values():
+            if not self._has_node(n):
                 raise ValueError(f"Node {n} is not a node inside the behavior graph.")
             input_transitions.append((rule, self._get_node_id(n)))
 
         n_id = self._get_node_id(node)
         self.graph[n_id] = input_transitions
+        self._version += 1
 
     def __eq__(self, other: Any) -> bool:
         """
@@ -638,9 +893,55 @@ class _BehaviorGraph(AindBehaviorModel, Generic[NodeTypes, EdgeType]):
 class PolicyGraph(_BehaviorGraph[Policy[TMetrics, TTask], PolicyTransition[TMetrics]], Generic[TMetrics, TTask]):
     """
     Graph for Stage.
+    Identical policy graphs may share their nodes and transitions (see Stage.share_policy_graph),
+    in which case each graph copies them before its first modification.
     """
 
-    pass
+    # True if the nodes and transitions of the graph may be shared with other graphs.
+    _shared: bool = PrivateAttr(default=False)
+
+    def _check_mutable(self) -> None:
+        """
+        Copies shared nodes and transitions before the graph is modified.
+        """
+        if self._shared:
+            self._unshare()
+
+    def _unshare(self) -> None:
+        """
+        Gives the graph its own copy of the containers it may share with other graphs.
+        Nodes and rules are immutable, and shared with the copy.
+        """
+        self.__dict__["nodes"] = dict(self.nodes)
+        self.__dict__["graph"] = {node_id: list(transitions) for node_id, transitions in self.graph.items()}
+        self._node_index = {name: list(node_ids) for name, node_ids in self._node_index.items()}
+        self._shared = False
+
+    def _share(self) -> Self:
+        """
+        Returns a new graph sharing the nodes, transitions and transition table of this graph.
+        Both graphs copy the shared containers before their next modification.
+        """
+        self._get_transition_table()
+        shared = super().__copy__()
+        self._shared = shared._shared = True
+        return shared
+
+    def __copy__(self) -> Self:
+        """
+        Shallow copy. The copy of a graph sharing its containers gets its own,
+        so that copying never changes the copied graph nor the graphs it shares with.
+        """
+        copied = super().__copy__()
+        if self._shared:
+            copied._unshare()
+        return copied
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> Self:
+        """Deep copies own all their containers."""
+        copied = super().__deepcopy__(memo)
+        copied._shared = False
+        return copied
 
 
 class MetricsProvider(_Rule[..., TMetrics], Generic[TMetrics]):
@@ -649,6 +950,141 @@ class MetricsProvider(_Rule[..., TMetrics], Generic[TMetrics]):
     pass
 
 
+# Validation context key under which tasks given as raw json are accepted, see `serialization.load_json`.
+_LAZY_TASKS_CONTEXT_KEY = "lazy_tasks"
+
+
+class _UnparsedTask:
+    """
+    Raw json payload of the task of a lazily loaded Stage.
+    The payload is immutable, so copies of a Stage share it.
+    """
+
+    __slots__ = ("payload", "task_type")
+
+    def __init__(self, payload: str, task_type: Any) -> None:
+        """Keeps the raw json payload and the type it validates against."""
+        self.payload = payload
+        self.task_type = task_type
+
+    def __repr__(self) -> str:
+        """Unparsed task representation."""
+        return f"{type(self).__name__}({self.payload!r})"
+
+    def __copy__(self) -> Self:
+        """Unparsed payloads are shared between copies."""
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Self:
+        """Unparsed payloads are shared between copies."""
+        return self
+
+    def load(self) -> Task:
+        """
+        Validates the payload into a new Task instance.
+        Unions of tasks are resolved through their dispatch table, see parse_task.
+        """
+        task_types = _task_types(self.task_type)
+        if len(task_types) > 1:
+            return parse_task(task_types, self.payload)
+        return type_adapter(self.task_type).validate_json(self.payload)
+
+
+class _DeferrableTask:
+    """
+    Schema of Stage.task.
+    In json, a task may be given as a raw json string when lazily loading tasks.
+    The string is kept as an _UnparsedTask and only validated on first access.
+    """
+
+    def __get_pydantic_core_schema__(
+        self,
+        source_type: Any,
+        handler: Callable[[Any], core_schema.CoreSchema],
+    ) -> core_schema.CoreSchema:
+        """
+        Custom validation, Ref:
+        https://docs.pydantic.dev/latest/concepts/types/#handling-third-party-types
+        """
+        task_schema = handler(source_type)
+
+        def defer_task(value: str, info: ValidationInfo) -> _UnparsedTask:
+            """Keeps a raw json task payload."""
+            if not (info.context and info.context.get(_LAZY_TASKS_CONTEXT_KEY)):
+                raise PydanticCustomError("unparsed_task", "Raw json tasks are only accepted when lazily loading tasks")
+            return _UnparsedTask(value, source_type)
+
+        # A callable discriminator validates the task from the json input itself, whereas
+        # function validators would receive (and revalidate) its python equivalent.
+        return core_schema.json_or_python_schema(
+            json_schema=core_schema.tagged_union_schema(
+                {"task": task_schema, "unparsed": core_schema.with_info_plain_validator_function(defer_task)},
+                discriminator=lambda value: "unparsed" if isinstance(value, str) else "task",
+            ),
+            python_schema=core_schema.no_info_wrap_validator_function(self._keep_unparsed_task, task_schema),
+            serialization=core_schema.wrap_serializer_function_ser_schema(self._serialize_task, schema=task_schema),
+        )
+
+    def __get_pydantic_json_schema__(
+        self,
+        _core_schema: core_schema.CoreSchema,
+        handler: GetJsonSchemaHandler,
+    ) -> JsonSchemaValue:
+        """
+        Raw json payloads are an implementation detail of lazy loading,
+        the json schema is the schema of the task.
+        """
+        return handler(_core_schema["python_schema"]["schema"])
+
+    @staticmethod
+    def _keep_unparsed_task(value: Any, handler: core_schema.ValidatorFunctionWrapHandler) -> Any:
+        """Unparsed tasks are carried over when a Stage is revalidated."""
+        return value if isinstance(value, _UnparsedTask) else handler(value)
+
+    @staticmethod
+    def _serialize_task(value: Any, handler: core_schema.SerializerFunctionWrapHandler) -> Any:
+        """Unparsed tasks are validated before serialization."""
+        return handler(value.load() if isinstance(value, _UnparsedTask) else value)
+
+
+def _drop_task_title(schema: Dict[str, Any]) -> None:
+    """
+    Stage json schema hook. Pydantic titles fields whose schema is not a plain reference,
+    which _DeferrableTask is not, although its json schema is the one of the task.
+    """
+    schema["properties"]["task"].pop("title", None)
+
+
+# Serializes the first access of lazily loaded tasks, so that every reader gets the same Task instance.
+_TASK_LOAD_LOCK = threading.Lock()
+
+
+class _LazyTask:
+    """
+    Value of the Stage.task field declaration, a data descriptor
+    that validates an _UnparsedTask on first access.
+    The descriptor hides from class level access, so pydantic does not take it for a field default.
+    """
+
+    def __get__(self, instance: Optional["Stage"], owner: Optional[type] = None) -> Any:
+        """Returns the task of the instance, validating it if needed."""
+        if instance is None:
+            raise AttributeError("task")
+        task = instance.__dict__["task"]
+        if isinstance(task, _UnparsedTask):
+            with _TASK_LOAD_LOCK:
+                task = instance.__dict__["task"]
+                if isinstance(task, _UnparsedTask):
+                    # Goes through validate_assignment, like any other edit of the stage
+                    instance.task = task.load()
+                    task = instance.__dict__["task"]
+        return task
+
+    def __set__(self, instance: "Stage", value: Any) -> None:
+        """Pydantic validates assignments before storing them in __dict__."""
+        instance.__dict__["task"] = value
+
+
 class Stage(AindBehaviorModel, Generic[TMetrics, TTask]):
     """
     Instance of a Task.
@@ -656,8 +1092,12 @@ class Stage(AindBehaviorModel, Generic[TMetrics, TTask]):
     Stage manages a BehaviorGraph instance with a read/write API.
     """
 
+    model_config = ConfigDict(json_schema_extra=_drop_task_title)
+
     name: str = Field(description="Stage name.")
-    task: TTask = Field(description="Task in which this stage is based off of.")
+    task: Annotated[TTask, _DeferrableTask(), Field(description="Task in which this stage is based off of.")] = (
+        _LazyTask()  # type: ignore[assignment]
+    )
     graph: PolicyGraph[TMetrics, TTask] = Field(
         default_factory=PolicyGraph[TMetrics, TTask],
         validate_default=True,
@@ -693,6 +1133,33 @@ class Stage(AindBehaviorModel, Generic[TMetrics, TTask]):
         super().model_post_init(__context)
         self.set_start_policies(self.start_policies, append_non_existing=True)
 
+    @field_serializer("task", mode="wrap")
+    def _serialize_task(self, task: Any, handler: SerializerFunctionWrapHandler):
+        """
+        A lazily loaded task is loaded, and kept by the stage, before it is serialized,
+        so that repeated dumps (and fingerprints) parse its payload at most once.
+        """
+        return handler(self.task if isinstance(task, _UnparsedTask) else task)
+
+    def share_policy_graph(self, graph: PolicyGraph[TMetrics, TTask]) -> None:
+        """
+        Uses the nodes and transitions of the given policy graph, without copying them,
+        so that they can be shared by many stages. Each stage copies them before modifying
+        its policy graph, leaving the other stages unaffected.
+        The start policies of the stage must be part of the graph.
+        """
+        for policy in self.start_policies:
+            if not graph._has_node(Policy.normalize_rule_or_callable(policy)):
+                raise ValueError(f"Start policy {policy} of Stage {self.name} is not in the policy graph.")
+        self.graph = graph._share()
+
+    @property
+    def is_task_loaded(self) -> bool:
+        """
+        False while the task of a lazily loaded stage has not been accessed.
+        """
+        return not isinstance(self.__dict__["task"], _UnparsedTask)
+
     def set_start_policies(
         self,
         start_policies: Policy[TMetrics, TTask] | Iterable[Policy[TMetrics, TTask]],
@@ -707,7 +1174,7 @@ class Stage(AindBehaviorModel, Generic[TMetrics, TTask]):
 
         for policy in start_policies:
             policy = Policy.normalize_rule_or_callable(policy)
-            if policy not in self.graph.see_nodes():
+            if not self.graph._has_node(policy):
                 if append_non_existing:
                     self.add_policy(policy)
                 else:
@@ -720,7 +1187,7 @@ class Stage(AindBehaviorModel, Generic[TMetrics, TTask]):
         Adds a floating policy to the Stage adjacency graph.
         """
         policy = Policy.normalize_rule_or_callable(policy)
-        if policy in self.graph.see_nodes():
+        if self.graph._has_node(policy):
             raise ValueError(f"Policy {policy.name} is a duplicate Policy in Stage {self.name}.")
 
         self.graph.add_node(policy)
@@ -795,6 +1262,12 @@ class Stage(AindBehaviorModel, Generic[TMetrics, TTask]):
         """
         return self.graph.see_nodes()
 
+    def get_policy(self, name: str) -> Policy[TMetrics, TTask]:
+        """
+        Get the policy of the policy graph with the given name.
+        """
+        return self.graph.get_node(name)
+
     def see_policy_transitions(
         self, policy: Policy[TMetrics, TTask]
     ) -> List[Tuple[PolicyTransition[TMetrics], Policy[TMetrics, TTask]]]:
@@ -804,6 +1277,14 @@ class Stage(AindBehaviorModel, Generic[TMetrics, TTask]):
 
         return self.graph.see_node_transitions(Policy.normalize_rule_or_callable(policy))
 
+    def _get_policy_transitions(
+        self, policy: Policy[TMetrics, TTask]
+    ) -> Tuple[Tuple[PolicyTransition[TMetrics], Policy[TMetrics, TTask]], ...]:
+        """
+        Cached, read-only equivalent of see_policy_transitions used during evaluation.
+        """
+        return self.graph._get_transitions(policy)
+
     def set_policy_transition_priority(
         self,
         policy: Policy[TMetrics, TTask],
@@ -835,15 +1316,17 @@ class Stage(AindBehaviorModel, Generic[TMetrics, TTask]):
 
     def get_task(self) -> TTask:
         """
-        Get the current task as a deep-copy for safe manipulation.
+        Get a copy of the current task for safe manipulation.
+        The copy shares immutable values with the stage's task,
+        while every model and container is duplicated.
         """
-        return self.task.model_copy(deep=True)
+        return structural_copy(self.task)
 
     def set_task(self, task: TTask) -> None:
         """
         Set the current task using a copy of the input.
         """
-        self.task = task.model_copy(deep=True)
+        self.task = structural_copy(task)
 
     @deprecated("This method is deprecated in favor of setting the task directly using set_task(...).")
     def set_task_parameters(self, task_parameters: TTaskParameters) -> None:
@@ -859,11 +1342,26 @@ class Stage(AindBehaviorModel, Generic[TMetrics, TTask]):
         """
         return self.get_task().task_parameters
 
+    def fingerprint(self) -> str:
+        """
+        Stable digest of the stage content: its name, task, policies, policy transitions
+        (in priority order), start policies and metrics provider. Rules are identified by
+        their serialized name. The digest does not depend on the order in which policies
+        were added, nor on the process that computes it.
+        """
+        return content_fingerprint(_canonical_stage(self.model_dump(mode="json")))
+
     def validate_stage(self) -> Self:
         """
         Validates that the stage can be (de)serialized.
+        The result is cached against the stage fingerprint,
+        so a stage is only validated again once its content changed.
         """
 
+        key = (type(self), self.fingerprint())
+        if _is_validated(key):
+            return self
+
         # Check round trip serialization
         try:
             instance_json = self.model_dump_json()
@@ -876,6 +1374,7 @@ class Stage(AindBehaviorModel, Generic[TMetrics, TTask]):
             )
             raise e
 
+        _mark_validated(key)
         return self
 
 
@@ -897,6 +1396,89 @@ class StageGraph(_BehaviorGraph[Stage[TMetrics, TTask], StageTransition[TMetrics
     pass
 
 
+class ValidationProblem(AindBehaviorModel):
+    """
+    A problem found while validating a Curriculum.
+    """
+
+    location: str = Field(description="Where the problem was found, e.g. 'stage[StageA].policy[...]'.")
+    kind: Literal[
+        "empty_curriculum",
+        "unknown_task",
+        "invalid_task",
+        "unresolvable_rule",
+        "dangling_transition",
+        "missing_start_policy",
+    ] = Field(description="Category of the problem.")
+    message: str = Field(description="Description of the problem.")
+
+
+class ValidationReport(AindBehaviorModel):
+    """
+    All problems found while validating a Curriculum, see Curriculum.validation_report.
+    """
+
+    problems: List[ValidationProblem] = Field(default_factory=list, description="Problems found.")
+
+    @property
+    def is_valid(self) -> bool:
+        """True if no problems were found."""
+        return len(self.problems) == 0
+
+    def raise_for_problems(self) -> None:
+        """
+        Raises a ValueError listing every problem, if any.
+        """
+        if not self.is_valid:
+            raise ValueError(
+                "Curriculum is not valid for export/serialization:\n"
+                + "\n".join(f"- {p.location}: {p.message}" for p in self.problems)
+            )
+
+
+class CurriculumChange(AindBehaviorModel):
+    """
+    A single difference between two curricula, see Curriculum.diff.
+    """
+
+    location: str = Field(description="Where the change was found, e.g. 'stage[StageA].policy[...]'.")
+    kind: Literal[
+        "curriculum_changed",
+        "stage_added",
+        "stage_removed",
+        "stage_renamed",
+        "task_changed",
+        "task_parameters_changed",
+        "policy_added",
+        "policy_removed",
+        "start_policies_changed",
+        "metrics_provider_changed",
+        "transition_added",
+        "transition_removed",
+        "rule_changed",
+        "priority_changed",
+    ] = Field(description="Category of the change.")
+    before: Any = Field(default=None, description="Serialized value before the change, if any.")
+    after: Any = Field(default=None, description="Serialized value after the change, if any.")
+
+
+class CurriculumDiff(AindBehaviorModel):
+    """
+    All changes from one curriculum to another, see Curriculum.diff.
+    """
+
+    changes: List[CurriculumChange] = Field(default_factory=list, description="Changes found.")
+
+    @property
+    def is_empty(self) -> bool:
+        """True if the curricula do not differ."""
+        return len(self.changes) == 0
+
+    def of_kind(self, *kinds: str) -> List[CurriculumChange]:
+        """Changes of the given kinds, in order."""
+        return [change for change in self.changes if change.kind in kinds]
+
+
 class Curriculum(AindBehaviorModel, Generic[TTask]):
     """
     Curriculum manages a StageGraph instance with a read/write API.
@@ -925,6 +1507,11 @@ class Curriculum(AindBehaviorModel, Generic[TTask]):
     )
     graph: StageGraph[Metrics, TTask] = Field(default_factory=StageGraph[Metrics, TTask], validate_default=True)
 
+    # (graph, graph version) at which the stage tasks were last checked against the known tasks.
+    _checked_task_graph: Optional[Tuple[StageGraph, int]] = PrivateAttr(default=None)
+    # (graph, graph version, target stage name, distances) of the last graduation distance query.
+    _graduation_distances: Optional[Tuple[StageGraph, int, str, Dict[str, int]]] = PrivateAttr(default=None)
+
     @field_validator("version", mode="before", check_fields=False)
     @classmethod
     def coerce_version(cls, v: str, ctx) -> str:
@@ -947,32 +1534,32 @@ class Curriculum(AindBehaviorModel, Generic[TTask]):
     @property
     def _known_tasks(self) -> List[Type[Task]]:
         """Get all known tasks in the curriculum."""
-
-        # We introspect into the StageGraph[T] type to get the known tasks.
-        _generic = type(self).model_fields["graph"].annotation
-        _inner_args = _generic.__dict__["__pydantic_generic_metadata__"]["args"]
-
-        _inner_union: Type
-        if len(_inner_args) == 0:
-            _inner_union = Task
-        else:
-            # TODO This may be an issue if people define a generic on TTask but not Metrics
-            _inner_args = _inner_args[1]
-            _inner_union = get_args(_inner_args.__value__)[0]
-
-        if isinstance(_inner_union, type):
-            _known_tasks = [_inner_union]
-        else:
-            _known_tasks = [x for x in get_args(_inner_union)]
+        _known_tasks = _curriculum_known_tasks(type(self))
 
         # Since we are here, we also check if the known tasks match the nodes in the graph
         # The tasks known to the graph type should be a super set of the known tasks in the nodes
-        _known_nodes = [type(stage.task) for stage in self.graph.see_nodes()]
-        if not set(_known_tasks).issuperset(set(_known_nodes)):
-            raise ValueError(
-                "Known tasks in the Curriculum do not match the tasks in the StageGraph. This is likely a problem with StageGraph type definition."
-            )
-        return _known_tasks
+        # Tasks of lazily loaded stages are validated against the stage task type once accessed.
+        # The check is skipped if the graph did not change since it last passed.
+        if not self._is_task_graph_checked(self.graph._version):
+            _known_nodes = [type(stage.task) for stage in self.graph.see_nodes() if stage.is_task_loaded]
+            if not set(_known_tasks).issuperset(set(_known_nodes)):
+                raise ValueError(
+                    "Known tasks in the Curriculum do not match the tasks in the StageGraph. This is likely a problem with StageGraph type definition."
+                )
+            self._checked_task_graph = (self.graph, self.graph._version)
+        return list(_known_tasks)
+
+    def _update_checked_task_graph(self, version: int) -> None:
+        """
+        Carries the task check over a graph change that only added stages with known tasks.
+        """
+        if self._is_task_graph_checked(version):
+            self._checked_task_graph = (self.graph, self.graph._version)
+
+    def _is_task_graph_checked(self, version: int) -> bool:
+        """Whether the stage tasks were checked at the given version of the current graph."""
+        checked = self._checked_task_graph
+        return checked is not None and checked[0] is self.graph and checked[1] == version
 
     def task_discriminator_type(self) -> Type[Task]:
         """Create a Discriminated Union  type for the known tasks."""
@@ -983,7 +1570,7 @@ class Curriculum(AindBehaviorModel, Generic[TTask]):
         if isinstance(task_type, Task):
             task_type = type(task_type)
         if isinstance(task_type, type):
-            return task_type in self._known_tasks
+            return task_type in _curriculum_known_tasks(type(self))
         raise ValueError("task_type must be a Task instance or a Task type.")
 
     @classmethod
@@ -997,14 +1584,20 @@ class Curriculum(AindBehaviorModel, Generic[TTask]):
         """
         Adds a floating stage to the Curriculum adjacency graph.
         """
-        task = stage.get_task()
-        if not self._is_task_type_known(task):
-            raise ValueError(f"Task {task} is not a known task type in the Curriculum.")
-
-        if stage in self.graph.see_nodes():
+        self._check_stage_task(stage)
+        if self.graph._has_node(stage):
             raise ValueError(f"Stage {stage.name} is a duplicate stage in Curriculum.")
 
+        version = self.graph._version
         self.graph.add_node(stage)
+        self._update_checked_task_graph(version)
+
+    def _check_stage_task(self, stage: Stage) -> None:
+        """
+        Raises if the task of stage is not a known task type in the Curriculum.
+        """
+        if stage.is_task_loaded and not self._is_task_type_known(stage.task):
+            raise ValueError(f"Task {stage.task} is not a known task type in the Curriculum.")
 
     def remove_stage(self, stage: Stage) -> None:
         """
@@ -1033,12 +1626,17 @@ class Curriculum(AindBehaviorModel, Generic[TTask]):
         NOTE: The order in which this method
         is called sets the order of transition priority.
         """
+        for stage in (start_stage, dest_stage):
+            if not self.graph._has_node(stage):
+                self._check_stage_task(stage)
 
+        version = self.graph._version
         self.graph.add_transition(
             start_stage,
             dest_stage,
             StageTransition.normalize_rule_or_callable(rule),
         )
+        self._update_checked_task_graph(version)
 
     def remove_stage_transition(
         self,
@@ -1068,12 +1666,41 @@ class Curriculum(AindBehaviorModel, Generic[TTask]):
         """
         return self.graph.see_nodes()
 
+    def get_stage(self, name: str) -> Stage:
+        """
+        Get the stage of the curriculum graph with the given name.
+        """
+        return self.graph.get_node(name)
+
+    def deduplicate_policy_graphs(self) -> int:
+        """
+        Makes stages with identical policy graphs share their nodes and transitions (see
+        Stage.share_policy_graph), so that memory and policy transition lookups scale with the
+        number of distinct graphs. A stage copies them before modifying its policy graph,
+        leaving the other stages unaffected.
+
+        Returns:
+            int: Number of distinct policy graphs in the curriculum.
+        """
+        templates: Dict[Tuple[type, str], PolicyGraph] = {}
+        for stage in self.see_stages():
+            key = (type(stage.graph), stage.graph.model_dump_json())
+            template = templates.setdefault(key, stage.graph)
+            stage.share_policy_graph(template)
+        return len(templates)
+
     def see_stage_transitions(self, stage: Stage) -> List[Tuple[StageTransition, Stage]]:
         """
         See transitions of stage in curriculum graph.
         """
         return self.graph.see_node_transitions(stage)
 
+    def _get_stage_transitions(self, stage: Stage) -> Tuple[Tuple[StageTransition, Stage], ...]:
+        """
+        Cached, read-only equivalent of see_stage_transitions used during evaluation.
+        """
+        return self.graph._get_transitions(stage)
+
     def set_stage_transition_priority(
         self,
         stage: Stage,
@@ -1096,9 +1723,199 @@ class Curriculum(AindBehaviorModel, Generic[TTask]):
 
         self.graph.set_transition_priority(stage, stage_transitions)
 
+    def graduation_distances(self, graduated_stage: str = "GRADUATED") -> Dict[str, int]:
+        """
+        Minimum number of stage transitions needed to reach graduated_stage from each stage.
+        Since a subject moves at most one stage per evaluation, this is also the minimum
+        number of evaluations left before graduation.
+        Stages that cannot reach graduated_stage are omitted.
+
+        The index is computed once with a breadth-first search over the reversed
+        StageGraph and cached until the graph changes.
+
+        Args:
+            graduated_stage (str): Name of the terminal stage. Defaults to "GRADUATED".
+
+        Returns:
+            Dict[str, int]: Stage name -> distance to graduated_stage.
+        """
+        return dict(self._graduation_distance_index(graduated_stage))
+
+    def _graduation_distance_index(self, graduated_stage: str) -> Dict[str, int]:
+        """Returns the cached graduation distance index, (re)building it if needed."""
+        cached = self._graduation_distances
+        if (
+            cached is not None
+            and cached[0] is self.graph
+            and cached[1] == self.graph._version
+            and cached[2] == graduated_stage
+        ):
+            return cached[3]
+
+        distances: Dict[str, int] = {}
+        target_id = self.graph._lookup_node_id(graduated_stage)
+        if target_id is not None:
+            incoming: Dict[int, List[int]] = {node_id: [] for node_id in self.graph.nodes}
+            for start_id, transitions in self.graph.graph.items():
+                for _, dest_id in transitions:
+                    incoming[dest_id].append(start_id)
+
+            distance_by_id = {target_id: 0}
+            frontier = [target_id]
+            while frontier:
+                next_frontier = []
+                for node_id in frontier:
+                    for start_id in incoming[node_id]:
+                        if start_id not in distance_by_id:
+                            distance_by_id[start_id] = distance_by_id[node_id] + 1
+                            next_frontier.append(start_id)
+                frontier = next_frontier
+            distances = {self.graph.nodes[node_id].name: d for node_id, d in distance_by_id.items()}
+
+        self._graduation_distances = (self.graph, self.graph._version, graduated_stage, distances)
+        return distances
+
+    def stages_to_graduation(self, stage: Stage | str, graduated_stage: str = "GRADUATED") -> Optional[int]:
+        """
+        Minimum number of stage transitions between stage and graduated_stage,
+        or None if graduated_stage cannot be reached from stage.
+        See graduation_distances.
+        """
+        name = stage if isinstance(stage, str) else stage.name
+        return self._graduation_distance_index(graduated_stage).get(name)
+
+    def fingerprint(self) -> str:
+        """
+        Stable digest of the curriculum content: its name, version, stages (see Stage.fingerprint)
+        and stage transitions (in priority order). Rules are identified by their serialized name.
+        The digest does not depend on the order in which stages were added, nor on the process
+        that computes it, so it can be used to identify a curriculum across processes and machines.
+        """
+        dump = self.model_dump(mode="json")
+        return content_fingerprint(
+            {**dump, "graph": _canonical_graph(dump["graph"], lambda stage: stage["name"], _canonical_stage)}
+        )
+
+    def diff(self, other: "Curriculum") -> CurriculumDiff:
+        """
+        Structural changes from this curriculum to other.
+
+        Stages are aligned by name. Stages that only exist on one side, but whose content
+        (see Stage.fingerprint) matches, are reported as renamed rather than removed and added.
+        Policies are aligned by their serialized rule name, and transitions by their source
+        and destination nodes. Within a stage, the task type and the changed default task
+        parameters are reported.
+
+        Both curricula are compared through their serialized form, so curricula whose rules
+        could not be imported, or whose tasks were loaded lazily, can be compared as well.
+        The comparison takes time linear in the size of the curricula.
+
+        Args:
+            other (Curriculum): The newer curriculum.
+
+        Returns:
+            CurriculumDiff: The changes, in a serializable form.
+        """
+        before, after = self.model_dump(mode="json"), other.model_dump(mode="json")
+        diff = CurriculumDiff()
+        for field in ("name", "version", "pkg_location"):
+            if before[field] != after[field]:
+                diff.changes.append(
+                    CurriculumChange(
+                        location=f"curriculum.{field}",
+                        kind="curriculum_changed",
+                        before=before[field],
+                        after=after[field],
+                    )
+                )
+
+        old_stages = {stage["name"]: stage for stage in before["graph"]["nodes"].values()}
+        new_stages = {stage["name"]: stage for stage in after["graph"]["nodes"].values()}
+
+        # Stages only present on one side are aligned by content.
+        removed = {name: stage for name, stage in old_stages.items() if name not in new_stages}
+        by_content: Dict[str, List[str]] = {}
+        for name, stage in removed.items():
+            by_content.setdefault(_stage_content_fingerprint(stage), []).append(name)
+        renames: Dict[str, str] = {}
+        for name, stage in new_stages.items():
+            if name not in old_stages and (candidates := by_content.get(_stage_content_fingerprint(stage))):
+                renames[candidates.pop(0)] = name
+
+        for name in old_stages:
+            if name in renames:
+                diff.changes.append(
+                    CurriculumChange(location=f"stage[{name}]", kind="stage_renamed", before=name, after=renames[name])
+                )
+            elif name not in new_stages:
+                diff.changes.append(CurriculumChange(location=f"stage[{name}]", kind="stage_removed", before=name))
+        renamed = set(renames.values())
+        for name in new_stages:
+            if name not in old_stages and name not in renamed:
+                diff.changes.append(CurriculumChange(location=f"stage[{name}]", kind="stage_added", after=name))
+
+        for name, old_stage in old_stages.items():
+            new_stage = new_stages.get(renames.get(name, name))
+            if new_stage is not None:
+                diff.changes.extend(_stage_changes(old_stage, new_stage))
+
+        diff.changes.extend(
+            _graph_changes(before["graph"], after["graph"], "curriculum", lambda stage: stage["name"], renames)
+        )
+        return diff
+
+    def validation_report(self, max_workers: Optional[int] = None) -> ValidationReport:
+        """
+        Checks that the curriculum can be exported and deserialized, and reports every problem found.
+
+        The curriculum is walked once, without serializing it as a whole. It checks that:
+
+        - the curriculum has stages,
+        - every stage task is of a known task type and holds valid values,
+        - every rule (policies, transitions and metrics providers) is serializable,
+          i.e. its serialized name resolves back to the same callable,
+        - every transition points to a node of its graph, and every start policy is in its stage graph.
+
+        This is stricter than validate_curriculum: rules that cannot be imported back,
+        such as local functions, fail here although they survive a json round trip.
+
+        Stages are validated independently. For very large curricula, they can be sharded
+        across a pool of max_workers processes, started with the default start method.
+        Forked workers inherit the stages, so nothing needs to be pickled but the problems
+        found. Where the workers cannot receive the stages (e.g. with another start method
+        and stages that cannot be pickled), stages are validated serially.
+
+        Args:
+            max_workers (Optional[int]): Number of worker processes. Defaults to None, i.e. serial validation.
+
+        Returns:
+            ValidationReport: All problems found.
+        """
+        report = ValidationReport()
+        stages = self.see_stages()
+        if len(stages) == 0:
+            report.problems.append(
+                ValidationProblem(location="curriculum", kind="empty_curriculum", message="Curriculum has no stages.")
+            )
+
+        known_tasks = _curriculum_known_tasks(type(self))
+        rule_cache: Dict[Tuple[type, str], Any] = {}
+        stage_problems = None
+        if max_workers is not None and max_workers > 1 and len(stages) > 1:
+            stage_problems = _sharded_stage_problems(stages, known_tasks, max_workers)
+        if stage_problems is None:
+            stage_problems = [p for stage in stages for p in _stage_problems(stage, known_tasks, rule_cache)]
+        report.problems.extend(stage_problems)
+        report.problems.extend(_graph_problems(self.graph, "curriculum", rule_cache))
+        return report
+
     def validate_curriculum(self) -> Self:
         """
         Validate curriculum for export/serialization.
+        The result is cached against the curriculum fingerprint, so validating an
+        unchanged curriculum again only costs its fingerprint. After a change,
+        only the stages that changed are validated again (see Stage.validate_stage).
+        Use validation_report for stricter checks, e.g. that every rule can be imported back.
         """
 
         if not all([self._is_task_type_known(stage.task) for stage in self.see_stages()]):
@@ -1107,6 +1924,10 @@ class Curriculum(AindBehaviorModel, Generic[TTask]):
         if len(self.see_stages()) == 0:
             raise ValueError("Curriculum is empty! Please add stages.")
 
+        key = (type(self), self.fingerprint())
+        if _is_validated(key):
+            return self
+
         for s in self.see_stages():
             s.validate_stage()
 
@@ -1123,9 +1944,293 @@ class Curriculum(AindBehaviorModel, Generic[TTask]):
             )
             raise e
 
+        _mark_validated(key)
         return self
 
 
+def _stage_content_fingerprint(stage: Dict[str, Any]) -> str:
+    """Fingerprint of a serialized stage, regardless of its name. Used to align renamed stages."""
+    return content_fingerprint({**_canonical_stage(stage), "name": None})
+
+
+def _stage_changes(before: Dict[str, Any], after: Dict[str, Any]) -> List[CurriculumChange]:
+    """
+    Changes between two versions of a serialized stage: task, default task parameters,
+    metrics provider, start policies, policies and policy transitions.
+    """
+    location = f"stage[{after['name']}]"
+    changes = []
+    old_task, new_task = before["task"], after["task"]
+    if old_task["name"] != new_task["name"]:
+        changes.append(
+            CurriculumChange(
+                location=f"{location}.task", kind="task_changed", before=old_task["name"], after=new_task["name"]
+            )
+        )
+    old_parameters, new_parameters = old_task["task_parameters"], new_task["task_parameters"]
+    changed = [
+        key for key in {**old_parameters, **new_parameters} if old_parameters.get(key) != new_parameters.get(key)
+    ]
+    if changed:
+        changes.append(
+            CurriculumChange(
+                location=f"{location}.task.task_parameters",
+                kind="task_parameters_changed",
+                before={key: old_parameters[key] for key in changed if key in old_parameters},
+                after={key: new_parameters[key] for key in changed if key in new_parameters},
+            )
+        )
+    if before["metrics_provider"] != after["metrics_provider"]:
+        changes.append(
+            CurriculumChange(
+                location=f"{location}.metrics_provider",
+                kind="metrics_provider_changed",
+                before=before["metrics_provider"],
+                after=after["metrics_provider"],
+            )
+        )
+    if before["start_policies"] != after["start_policies"]:
+        changes.append(
+            CurriculumChange(
+                location=f"{location}.start_policies",
+                kind="start_policies_changed",
+                before=before["start_policies"],
+                after=after["start_policies"],
+            )
+        )
+
+    old_policies, new_policies = set(before["graph"]["nodes"].values()), set(after["graph"]["nodes"].values())
+    for policy in before["graph"]["nodes"].values():
+        if policy not in new_policies:
+            changes.append(
+                CurriculumChange(location=f"{location}.policy[{policy}]", kind="policy_removed", before=policy)
+            )
+    for policy in after["graph"]["nodes"].values():
+        if policy not in old_policies:
+            changes.append(CurriculumChange(location=f"{location}.policy[{policy}]", kind="policy_added", after=policy))
+
+    changes.extend(_graph_changes(before["graph"], after["graph"], location, lambda policy: policy, {}))
+    return changes
+
+
+def _graph_changes(
+    before: Dict[str, Any],
+    after: Dict[str, Any],
+    location: str,
+    node_name: Callable[[Any], str],
+    renames: Dict[str, str],
+) -> List[CurriculumChange]:
+    """
+    Changes between the transitions of two versions of a serialized behavior graph.
+
+    Transitions are aligned by (source, destination) node names, nodes of before being
+    renamed through renames. Transitions between the same nodes are reported as added,
+    removed or with changed rules; transitions whose order changed as reordered.
+    """
+
+    def transitions(graph: Dict[str, Any], rename: Dict[str, str]) -> Dict[str, List[Tuple[str, str]]]:
+        """Source node name -> prioritized (rule, destination node name) transitions."""
+        names = {int(node_id): node_name(node) for node_id, node in graph["nodes"].items()}
+        names = {node_id: rename.get(name, name) for node_id, name in names.items()}
+        return {
+            names.get(int(node_id), f"#{node_id}"): [
+                (rule, names.get(dest_id, f"#{dest_id}")) for rule, dest_id in edges
+            ]
+            for node_id, edges in graph["graph"].items()
+        }
+
+    old_transitions, new_transitions = transitions(before, renames), transitions(after, {})
+    changes = []
+    for source in {**old_transitions, **new_transitions}:
+        old_edges, new_edges = old_transitions.get(source, []), new_transitions.get(source, [])
+        if old_edges == new_edges:
+            continue
+
+        old_rules: Dict[str, List[str]] = {}
+        for rule, dest in old_edges:
+            old_rules.setdefault(dest, []).append(rule)
+        new_rules: Dict[str, List[str]] = {}
+        for rule, dest in new_edges:
+            new_rules.setdefault(dest, []).append(rule)
+
+        for dest in {**old_rules, **new_rules}:
+            transition_location = f"{location}.transition[{source} -> {dest}]"
+            if dest not in new_rules:
+                kind = "transition_removed"
+            elif dest not in old_rules:
+                kind = "transition_added"
+            elif sorted(old_rules[dest]) != sorted(new_rules[dest]):
+                kind = "rule_changed"
+            else:
+                continue
+            changes.append(
+                CurriculumChange(
+                    location=transition_location,
+                    kind=kind,  # type: ignore[arg-type]
+                    before=old_rules.get(dest),
+                    after=new_rules.get(dest),
+                )
+            )
+
+        # Priorities changed if the transitions kept on both sides are in a different order.
+        new_set, old_set = set(new_edges), set(old_edges)
+        kept_before = [edge for edge in old_edges if edge in new_set]
+        kept_after = [edge for edge in new_edges if edge in old_set]
+        if kept_before != kept_after:
+            changes.append(
+                CurriculumChange(
+                    location=f"{location}.transition[{source}]",
+                    kind="priority_changed",
+                    before=[list(edge) for edge in old_edges],
+                    after=[list(edge) for edge in new_edges],
+                )
+            )
+    return changes
+
+
+def _rule_problems(rule: _Rule, location: str, rule_cache: Dict[Tuple[type, str], Any]) -> List[ValidationProblem]:
+    """
+    Checks that a rule is serializable: its serialized name must resolve to the same callable.
+    Names are resolved once per rule type, through rule_cache.
+    """
+    name = rule.name
+    if (resolved := rule_cache.get((type(rule), name))) is None:
+        try:
+            resolved = type(rule)._deserialize_rule(name).callable
+        except (TypeError, ValueError) as e:
+            resolved = e
+        rule_cache[(type(rule), name)] = resolved
+
+    if is_non_deserializable_callable(rule.callable):
+        message = f"Rule {name} could not be imported: {rule.callable.error}"
+    elif is_non_deserializable_callable(resolved):
+        message = f"Rule {name} cannot be imported back: {resolved.error}. Use a module-level function."
+    elif isinstance(resolved, Exception):
+        message = f"Rule {name} does not match the expected signature: {resolved}"
+    elif resolved is not rule.callable:
+        message = f"Rule {name} resolves to a different callable."
+    else:
+        return []
+    return [ValidationProblem(location=location, kind="unresolvable_rule", message=message)]
+
+
+def _graph_problems(
+    graph: _BehaviorGraph, location: str, rule_cache: Dict[Tuple[type, str], Any]
+) -> List[ValidationProblem]:
+    """
+    Checks the transitions of a behavior graph, and the rules of its transitions.
+    Rules that are nodes (i.e. policies) are checked as well.
+    """
+    problems = []
+    for node_id, node in graph.nodes.items():
+        if isinstance(node, _Rule):
+            problems.extend(_rule_problems(node, f"{location}.policy[{node.name}]", rule_cache))
+        for rule, dest_id in graph.graph.get(node_id, []):
+            transition_location = f"{location}.transition[{node.name} -> {dest_id}]"
+            if dest_id not in graph.nodes:
+                problems.append(
+                    ValidationProblem(
+                        location=transition_location,
+                        kind="dangling_transition",
+                        message=f"Transition points to node id {dest_id}, which is not in the graph.",
+                    )
+                )
+            problems.extend(_rule_problems(rule, transition_location, rule_cache))
+    for node_id in graph.graph.keys() - graph.nodes.keys():
+        problems.append(
+            ValidationProblem(
+                location=f"{location}.transition[{node_id}]",
+                kind="dangling_transition",
+                message=f"Transitions start from node id {node_id}, which is not in the graph.",
+            )
+        )
+    return problems
+
+
+# (stages, known tasks) validated by a worker process, set by _init_shard_worker.
+# Only ever set in worker processes, see _sharded_stage_problems.
+_worker_stages: Optional[Tuple[List[Stage], Tuple[Type[Task], ...]]] = None
+
+
+def _init_shard_worker(stages: List[Stage], known_tasks: Tuple[Type[Task], ...]) -> None:
+    """Initializer of the worker processes of _sharded_stage_problems."""
+    global _worker_stages
+    _worker_stages = (stages, known_tasks)
+
+
+def _shard_problems(start: int, stop: int) -> List[ValidationProblem]:
+    """Validates the stages start:stop given to the worker process."""
+    assert _worker_stages is not None
+    stages, known_tasks = _worker_stages
+    rule_cache: Dict[Tuple[type, str], Any] = {}
+    return [p for stage in stages[start:stop] for p in _stage_problems(stage, known_tasks, rule_cache)]
+
+
+def _sharded_stage_problems(
+    stages: List[Stage], known_tasks: Tuple[Type[Task], ...], max_workers: int
+) -> Optional[List[ValidationProblem]]:
+    """
+    Validates stages in contiguous shards across worker processes,
+    and merges the problems in stage order.
+    The stages are handed to the workers through the pool initializer: forked workers
+    inherit them, other start methods pickle them.
+    Returns None if the stages could not be validated in worker processes,
+    e.g. if they could not be pickled.
+    """
+    n_shards = min(max_workers, len(stages))
+    bounds = [len(stages) * i // n_shards for i in range(n_shards + 1)]
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_shards, initializer=_init_shard_worker, initargs=(stages, known_tasks)
+        ) as pool:
+            shards = list(pool.map(_shard_problems, bounds[:-1], bounds[1:]))
+    except (BrokenProcessPool, OSError, pickle.PicklingError, AttributeError, TypeError):
+        return None
+    return [p for shard in shards for p in shard]
+
+
+def _stage_problems(
+    stage: Stage, known_tasks: Tuple[Type[Task], ...], rule_cache: Dict[Tuple[type, str], Any]
+) -> List[ValidationProblem]:
+    """
+    Checks a single stage of a curriculum: its task, rules and policy graph.
+    """
+    location = f"stage[{stage.name}]"
+    problems = []
+
+    task = stage.task
+    if type(task) not in known_tasks:
+        problems.append(
+            ValidationProblem(
+                location=f"{location}.task",
+                kind="unknown_task",
+                message=f"Task {type(task).__name__} is not a known task type in the Curriculum.",
+            )
+        )
+    else:
+        # Checks the current values of the task against its schema, including values
+        # that were modified in place, and that they can be serialized. Validated in
+        # python mode, which the strict config applies to the dumped python values.
+        try:
+            type(task).model_validate(task.model_dump())
+        except (ValidationError, PydanticSerializationError) as e:
+            problems.append(ValidationProblem(location=f"{location}.task", kind="invalid_task", message=str(e)))
+
+    problems.extend(_graph_problems(stage.graph, location, rule_cache))
+    for policy in stage.start_policies:
+        if not stage.graph._has_node(policy):
+            problems.append(
+                ValidationProblem(
+                    location=f"{location}.start_policies",
+                    kind="missing_start_policy",
+                    message=f"Start policy {policy.name} is not in the policy graph.",
+                )
+            )
+    if stage.metrics_provider is not None:
+        problems.extend(_rule_problems(stage.metrics_provider, f"{location}.metrics_provider", rule_cache))
+    return problems
+
+
 def create_curriculum(
     name: str,
     version: str,
@@ -1134,6 +2239,8 @@ def create_curriculum(
 ) -> Type[Curriculum[TTask]]:
     """
     Creates a new curriculum model with the specified name, version, and tasks.
+    Repeated calls with the same name, version, set of tasks and pkg_location
+    return the same curriculum model type, as long as it is in use.
     Args:
         name (str): The name of the curriculum.
         version (str): The version of the curriculum, following semantic versioning.
@@ -1145,9 +2252,14 @@ def create_curriculum(
         ValueError: If no tasks are provided.
     """
 
+    tasks = tuple(tasks)
     if not any(tasks):
         raise ValueError("At least one task must be provided.")
 
+    key = (name, version, frozenset(tasks), pkg_location)
+    if (curriculum_type := _CURRICULUM_TYPES.get(key)) is not None:
+        return curriculum_type
+
     _tasks_tagged = cast(TTask, make_task_discriminator(tasks))
 
     fields: Dict[str, Any] = {
@@ -1174,7 +2286,34 @@ def create_curriculum(
             str,
             Field(default=pkg_location, frozen=False, validate_default=True),
         ]
-    return create_model(name, __base__=Curriculum[_tasks_tagged], **fields)
+    curriculum_type = create_model(name, __base__=Curriculum[_tasks_tagged], **fields)
+    return _CURRICULUM_TYPES.setdefault(key, curriculum_type)
+
+
+def _curriculum_known_tasks(curriculum_type: Type[Curriculum]) -> Tuple[Type[Task], ...]:
+    """
+    Task types known to a Curriculum type, introspected from its StageGraph[Metrics, TTask] annotation.
+    Computed once per Curriculum type, and stored on it.
+    """
+    return _cached_on_model(curriculum_type, ("known_tasks",), lambda: _introspect_known_tasks(curriculum_type))
+
+
+def _introspect_known_tasks(curriculum_type: Type[Curriculum]) -> Tuple[Type[Task], ...]:
+    """Task types known to a Curriculum type, see _curriculum_known_tasks."""
+    _generic = curriculum_type.model_fields["graph"].annotation
+    _inner_args = _generic.__dict__["__pydantic_generic_metadata__"]["args"]
+
+    _inner_union: Type
+    if len(_inner_args) == 0:
+        _inner_union = Task
+    else:
+        # TODO This may be an issue if people define a generic on TTask but not Metrics
+        _inner_args = _inner_args[1]
+        _inner_union = get_args(_inner_args.__value__)[0]
+
+    if isinstance(_inner_union, type):
+        return (_inner_union,)
+    return tuple(get_args(_inner_union))
 
 
 def make_task_discriminator(tasks: Iterable[Type[TTask]]) -> Type[TTask]:
@@ -1183,19 +2322,142 @@ def make_task_discriminator(tasks: Iterable[Type[TTask]]) -> Type[TTask]:
     This function takes a variable number of Task types and generates a
     discriminated union type using the 'name' field of each task to create
     a discriminated union.
+    The type is memoized per set of tasks, so that pydantic builds its schema once.
     Args:
         tasks (Iterable[Type[Task]]): A variable number of Task types.
     Returns:
         Type: A TypeAliasType with the discriminated union type of the provided tasks.
     """
+    tasks = tuple(dict.fromkeys(tasks))
+    key = frozenset(tasks)
+    if (discriminator := _get_cached_task_type(_TASK_DISCRIMINATORS, key)) is None:
+        discriminator = _cache_task_type(
+            _TASK_DISCRIMINATORS,
+            key,
+            cast(
+                Type[TTask],
+                TypeAliasType(
+                    "known_task_types",
+                    Annotated[
+                        Union[tasks],
+                        Field(discriminator="name"),
+                    ],
+                ),
+            ),
+        )
+    return discriminator
 
-    return cast(
-        Type[TTask],
-        TypeAliasType(
-            "known_task_types",
-            Annotated[
-                Union[tuple(set(tasks))],
-                Field(discriminator="name"),
-            ],
-        ),
-    )
+
+def task_dispatch_table(tasks: Iterable[Type[TTask]]) -> Mapping[str, Type[TTask]]:
+    """
+    Read-only mapping from task name to task type, for the given tasks.
+    The table is memoized per set of tasks.
+    Args:
+        tasks (Iterable[Type[Task]]): Task types, each with a literal (default) name.
+    Returns:
+        Mapping[str, Type[Task]]: Task name -> task type.
+    Raises:
+        ValueError: If a task has no literal name, or two tasks share a name.
+    """
+    tasks = tuple(tasks)
+    key = frozenset(tasks)
+    if (table := _get_cached_task_type(_TASK_DISPATCH_TABLES, key)) is None:
+        entries: Dict[str, Type[TTask]] = {}
+        for task_type in dict.fromkeys(tasks):
+            name = task_type.model_fields["name"].default
+            if not isinstance(name, str):
+                raise ValueError(f"Task {task_type.__name__} has no literal name to dispatch on.")
+            if entries.setdefault(name, task_type) is not task_type:
+                raise ValueError(f"Tasks {entries[name].__name__} and {task_type.__name__} are both named {name}.")
+        table = _cache_task_type(_TASK_DISPATCH_TABLES, key, MappingProxyType(entries))
+    return table
+
+
+def _get_cached_task_type(cache: "OrderedDict[FrozenSet[type], Any]", key: FrozenSet[type]) -> Any:
+    """Looks up a value derived from a set of task types, see TASK_TYPE_CACHE_SIZE. Returns None on a miss."""
+    with _task_type_caches_lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+    return value
+
+
+def _cache_task_type(cache: "OrderedDict[FrozenSet[type], Any]", key: FrozenSet[type], value: Any) -> Any:
+    """
+    Stores a value derived from a set of task types, evicting the least recently used one.
+    Returns the stored value, which is the first one stored if another thread stored it meanwhile.
+    """
+    with _task_type_caches_lock:
+        value = cache.setdefault(key, value)
+        cache.move_to_end(key)
+        if len(cache) > TASK_TYPE_CACHE_SIZE:
+            cache.popitem(last=False)
+    return value
+
+
+# Json string or bracket, optionally followed by a colon (i.e. an object key).
+_JSON_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"\s*(:)?|[{}\[\]]')
+_JSON_STRING = re.compile(r'\s*("(?:[^"\\]|\\.)*")')
+
+
+def peek_task_name(data: str | bytes) -> Optional[str]:
+    """
+    Name of a serialized task, read from its raw json without parsing the rest of it.
+    Scanning stops at the top-level "name" key, which is the first key of serialized tasks.
+    Args:
+        data (str | bytes): A serialized task.
+    Returns:
+        Optional[str]: The task name, or None if the json has no top-level string "name".
+    """
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode()
+    depth = 0
+    for token in _JSON_TOKEN.finditer(data):
+        text = token.group()
+        if text in "{[":
+            depth += 1
+        elif text in "}]":
+            depth -= 1
+            if depth == 0:
+                return None
+        elif depth == 1 and token.group(1) is not None and text.startswith('"name"'):
+            value = _JSON_STRING.match(data, token.end())
+            return json.loads(value.group(1)) if value is not None else None
+    return None
+
+
+def parse_task(tasks: Iterable[Type[TTask]], data: str | bytes) -> TTask:
+    """
+    Validates a serialized task, of one of the given task types, directly with its own validator.
+    The task type is looked up by name (see peek_task_name and task_dispatch_table),
+    so unknown tasks fail before any validation, and no union of tasks is resolved.
+    Args:
+        tasks (Iterable[Type[Task]]): Known task types.
+        data (str | bytes): A serialized task.
+    Returns:
+        Task: The validated task.
+    Raises:
+        ValueError: If the task name is missing or not one of the known tasks.
+    """
+    table = task_dispatch_table(tasks)
+    name = peek_task_name(data)
+    if (task_type := table.get(name)) is None:  # type: ignore[arg-type]
+        raise ValueError(f"Unknown task {name!r}, expected one of {sorted(table)}.")
+    return task_type.model_validate_json(data)
+
+
+@lru_cache(maxsize=TASK_TYPE_CACHE_SIZE)
+def _task_types(annotation: Any) -> Tuple[Type[Task], ...]:
+    """
+    Task types of a task annotation: a Task type, a (discriminated) union of tasks
+    such as made by make_task_discriminator, or an optional of either.
+    """
+    if isinstance(annotation, TypeAliasType):
+        return _task_types(annotation.__value__)
+    if get_origin(annotation) is Annotated:
+        return _task_types(get_args(annotation)[0])
+    if get_origin(annotation) is Union:
+        return tuple(t for arg in get_args(annotation) if arg is not NoneType for t in _task_types(arg))
+    if isinstance(annotation, type) and issubclass(annotation, Task):
+        return (annotation,)
+    return ()
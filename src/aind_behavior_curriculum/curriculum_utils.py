@@ -2,16 +2,24 @@
 Useful Placeholders when making Curriculums
 """
 
+import importlib
+import json
 import os
+import pkgutil
+import re
 import subprocess
 from pathlib import Path
-from typing import Literal, Optional
+from types import ModuleType
+from typing import Dict, List, Literal, Optional, Tuple, Type
 
 from jinja2 import Template
-from pydantic import Field
+from pydantic import BaseModel, Field
 
-from aind_behavior_curriculum.curriculum import Curriculum, Stage
+import aind_behavior_curriculum
+from aind_behavior_curriculum.base import json_schema
+from aind_behavior_curriculum.curriculum import Curriculum, Metrics, Stage
 from aind_behavior_curriculum.task import Task, TaskParameters
+from aind_behavior_curriculum.trainer import Trainer, TrainerState
 
 
 class Graduated(Task):
@@ -191,3 +199,63 @@ def export_json(curriculum: Curriculum, path: os.PathLike) -> None:
     with open(path, "w", encoding="utf-8") as f:
         print(path)
         f.write(curriculum.model_dump_json(indent=3))
+
+
+def export_schemas(
+    package: str | ModuleType,
+    path: os.PathLike,
+    model_types: Tuple[Type[BaseModel], ...] = (Task, Curriculum, Metrics, TrainerState),
+) -> List[Path]:
+    """
+    Exports the JSON schemas of every model of a package, in one pass.
+
+    The package and its submodules are imported, and every subclass of model_types
+    found in their namespaces is exported once, to `<path>/<model name>.json`.
+    The TrainerState model of every curriculum type that can be instantiated from
+    its defaults (e.g. curricula made by `create_curriculum`) is exported as well.
+    Schemas are generated once per model type, see `base.json_schema`.
+
+    Args:
+        package (str | ModuleType): The package, or its name.
+        path (os.PathLike): Directory to write the schemas to. Created if needed.
+        model_types (Tuple[Type[BaseModel], ...]): Base types of the models to export.
+
+    Returns:
+        List[Path]: The files written.
+
+    Raises:
+        ValueError: If two different models of the package have the same name.
+    """
+    if isinstance(package, str):
+        package = importlib.import_module(package)
+    modules = [package]
+    if hasattr(package, "__path__"):
+        for module_info in pkgutil.walk_packages(package.__path__, prefix=f"{package.__name__}."):
+            modules.append(importlib.import_module(module_info.name))
+
+    # Models defined by this library, e.g. re-imported by the package, are not exported.
+    library_models = {id(obj) for obj in vars(aind_behavior_curriculum).values() if isinstance(obj, type)}
+    models: Dict[str, Type[BaseModel]] = {}
+
+    def collect(model: Type[BaseModel]) -> None:
+        """Adds a model to the export, checking for name collisions."""
+        name = re.sub(r"[^0-9A-Za-z_.-]+", "_", model.__name__)
+        if models.setdefault(name, model) is not model:
+            raise ValueError(f"Two different models of {package.__name__} are named {model.__name__}.")
+
+    for module in modules:
+        for obj in list(vars(module).values()):
+            if isinstance(obj, type) and issubclass(obj, model_types) and id(obj) not in library_models:
+                collect(obj)
+                if issubclass(obj, Curriculum) and not any(f.is_required() for f in obj.model_fields.values()):
+                    collect(Trainer(obj()).trainer_state_model)
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, model in models.items():
+        file = path / f"{name}.json"
+        with open(file, "w", encoding="utf-8") as f:
+            f.write(json.dumps(json_schema(model), indent=4))
+        written.append(file)
+    return written
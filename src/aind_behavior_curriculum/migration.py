@@ -0,0 +1,233 @@
+"""
+Migration of serialized curricula and trainer states between curriculum versions.
+"""
+
+import json
+from collections import deque
+from functools import reduce
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from aind_behavior_curriculum.curriculum import Curriculum
+from aind_behavior_curriculum.serialization import _stage_documents
+from aind_behavior_curriculum.trainer import TrainerState
+
+TModel = TypeVar("TModel", bound=BaseModel)
+
+# Transforms take and return the json representation (model_dump(mode="json"))
+# of a TrainerState. Curricula are migrated as the curriculum of a TrainerState.
+Transform = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def rename_stage(old_name: str, new_name: str) -> Transform:
+    """
+    Transform renaming a stage, in the curriculum and in the trainer state.
+    """
+
+    def transform(document: Dict[str, Any]) -> Dict[str, Any]:
+        """Renames the stage."""
+        for stage in _stage_documents(TrainerState, document):
+            if stage["name"] == old_name:
+                stage["name"] = new_name
+        return document
+
+    return transform
+
+
+def remap_policy(old_rule: str, new_rule: str) -> Transform:
+    """
+    Transform replacing a policy, identified by its serialized rule name
+    (e.g. "my_package.curriculum.my_policy"), in every stage and in the active policies.
+    """
+
+    def remap(rules: List[str]) -> List[str]:
+        """Replaces old_rule in a list of rules."""
+        return [new_rule if rule == old_rule else rule for rule in rules]
+
+    def transform(document: Dict[str, Any]) -> Dict[str, Any]:
+        """Remaps the policy."""
+        for stage in _stage_documents(TrainerState, document):
+            nodes = stage["graph"]["nodes"]
+            for node_id, rule in nodes.items():
+                if rule == old_rule:
+                    nodes[node_id] = new_rule
+            stage["start_policies"] = remap(stage["start_policies"])
+        if document.get("active_policies") is not None:
+            document["active_policies"] = remap(document["active_policies"])
+        return document
+
+    return transform
+
+
+def transform_task_parameters(task_name: str, function: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Transform:
+    """
+    Transform applying function to the (json) task parameters of every task named task_name,
+    in the curriculum stages and in the trainer state.
+    """
+
+    def transform(document: Dict[str, Any]) -> Dict[str, Any]:
+        """Transforms the task parameters."""
+        tasks = [stage["task"] for stage in _stage_documents(TrainerState, document)]
+        if document.get("task") is not None:
+            tasks.append(document["task"])
+        for task in tasks:
+            if task["name"] == task_name:
+                task["task_parameters"] = function(task["task_parameters"])
+        return document
+
+    return transform
+
+
+class MigrationRegistry:
+    """
+    Registry of transforms between versions of curricula.
+
+    Curriculum authors register the transforms between consecutive versions of a
+    curriculum, identified by its name. Migrating between any two versions applies
+    the shortest chain of registered transforms. Paths and their composed transforms
+    are computed once and cached.
+
+    Transforms act on the json representation of a TrainerState, see `rename_stage`,
+    `remap_policy` and `transform_task_parameters`. Documents are migrated before
+    being validated, so that only the target version needs to be importable.
+
+    Example:
+        migrations = MigrationRegistry()
+        migrations.register("My Curriculum", "0.1.0", "0.2.0", rename_stage("StageA", "Stage A"))
+        states = list(migrations.migrate_trainer_states(MyTrainerState, records, "0.2.0"))
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty registry."""
+        # curriculum name -> from version -> to version -> transform
+        self._transforms: Dict[str, Dict[str, Dict[str, Transform]]] = {}
+        # (curriculum name, from version, to version) -> composed transform
+        self._composed: Dict[Tuple[str, str, str], Transform] = {}
+
+    def register(self, name: str, from_version: str, to_version: str, *transforms: Transform) -> None:
+        """
+        Registers the transforms migrating curriculum name from from_version to to_version.
+        Transforms are applied in order, then the curriculum version is set to to_version.
+        """
+        steps = list(transforms) + [_set_version(to_version)]
+        self._transforms.setdefault(name, {}).setdefault(from_version, {})[to_version] = _compose(steps)
+        self._composed.clear()
+
+    def migration(self, name: str, from_version: str, to_version: str) -> Callable[[Transform], Transform]:
+        """
+        Decorator registering a transform, see `register`.
+        """
+
+        def decorator(transform: Transform) -> Transform:
+            """Registers the transform."""
+            self.register(name, from_version, to_version, transform)
+            return transform
+
+        return decorator
+
+    def path(self, name: str, from_version: str, to_version: str) -> List[str]:
+        """
+        Shortest chain of versions from from_version to to_version, both included.
+
+        Raises:
+            ValueError: If no registered migrations lead from from_version to to_version.
+        """
+        edges = self._transforms.get(name, {})
+        previous: Dict[str, Optional[str]] = {from_version: None}
+        queue = deque([from_version])
+        while queue and to_version not in previous:
+            version = queue.popleft()
+            for next_version in edges.get(version, {}):
+                if next_version not in previous:
+                    previous[next_version] = version
+                    queue.append(next_version)
+
+        if to_version not in previous:
+            raise ValueError(f"No migration registered for {name} from version {from_version} to {to_version}.")
+        path = [to_version]
+        while (version := previous[path[-1]]) is not None:
+            path.append(version)
+        return path[::-1]
+
+    def _composed_transform(self, name: str, from_version: str, to_version: str) -> Transform:
+        """The transform migrating from from_version to to_version, composed once per pair of versions."""
+        key = (name, from_version, to_version)
+        if (transform := self._composed.get(key)) is None:
+            path = self.path(name, from_version, to_version)
+            transform = _compose([self._transforms[name][a][b] for a, b in zip(path, path[1:])])
+            self._composed[key] = transform
+        return transform
+
+    def migrate_trainer_state_document(self, document: Dict[str, Any], to_version: str) -> Dict[str, Any]:
+        """
+        Migrates, in place, the json representation of a TrainerState to the to_version of its curriculum.
+        Trainer states without curriculum are returned unchanged.
+        """
+        curriculum = document.get("curriculum")
+        if curriculum is None or curriculum["version"] == to_version:
+            return document
+        return self._composed_transform(curriculum["name"], curriculum["version"], to_version)(document)
+
+    def migrate_curriculum_document(self, document: Dict[str, Any], to_version: str) -> Dict[str, Any]:
+        """
+        Migrates, in place, the json representation of a Curriculum to to_version.
+        """
+        state = {"curriculum": document, "stage": None, "active_policies": None, "task": None}
+        return self.migrate_trainer_state_document(state, to_version)["curriculum"]
+
+    def migrate_curriculum(self, model_type: Type[TModel], data: str | bytes, to_version: str) -> TModel:
+        """
+        Deserializes a curriculum (json) into model_type after migrating it to to_version.
+        """
+        if not issubclass(model_type, Curriculum):
+            raise TypeError(f"{model_type.__name__} is not a Curriculum type.")
+        document = self.migrate_curriculum_document(json.loads(data), to_version)
+        # Validated as json, like the trainer states of migrate_trainer_states.
+        return model_type.model_validate_json(json.dumps(document))
+
+    def migrate_trainer_states(
+        self,
+        model_type: Type[TModel],
+        records: Iterable[str | bytes],
+        to_version: str,
+    ) -> Iterator[TModel]:
+        """
+        Streams serialized TrainerStates (json), migrated to to_version, as instances of model_type.
+
+        Every record is parsed into a document, migrated, then serialized again and validated
+        once, in json mode: python mode validation of the strict models would reject json
+        values (e.g. lists for tuples), and lax python validation would accept values strict
+        json validation rejects (e.g. "1" for an int). The migration of each distinct
+        (curriculum, source version) is composed once and reused for every record.
+
+        Args:
+            model_type (Type[TModel]): TrainerState type of the target version,
+                e.g. `Trainer(curriculum).trainer_state_model`.
+            records (Iterable[str | bytes]): Serialized trainer states, e.g. the lines of a file.
+            to_version (str): Target curriculum version.
+
+        Yields:
+            TModel: The migrated trainer states, in order.
+        """
+        if not issubclass(model_type, TrainerState):
+            raise TypeError(f"{model_type.__name__} is not a TrainerState type.")
+        for record in records:
+            document = self.migrate_trainer_state_document(json.loads(record), to_version)
+            yield model_type.model_validate_json(json.dumps(document))
+
+
+def _set_version(version: str) -> Transform:
+    """Transform setting the version of the curriculum."""
+
+    def transform(document: Dict[str, Any]) -> Dict[str, Any]:
+        """Sets the curriculum version."""
+        document["curriculum"]["version"] = version
+        return document
+
+    return transform
+
+
+def _compose(transforms: List[Transform]) -> Transform:
+    """Composes transforms, applied from left to right."""
+    return lambda document: reduce(lambda d, transform: transform(d), transforms, document)
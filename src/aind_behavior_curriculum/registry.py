@@ -0,0 +1,428 @@
+"""
+Local registry of curricula, stored in a single append-only file.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar
+
+from aind_behavior_curriculum.base import structural_copy
+from aind_behavior_curriculum.curriculum import Curriculum
+from aind_behavior_curriculum.serialization import dump_compact_json, load_compact_json
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover, not available on Windows
+    fcntl = None  # type: ignore[assignment]
+try:
+    import msvcrt
+except ImportError:  # only available on Windows
+    msvcrt = None  # type: ignore[assignment]
+
+REGISTRY_FORMAT = "aind-behavior-curriculum/registry"
+REGISTRY_FORMAT_VERSION = 2
+
+# Footer of index sections: offset of the section, magic. The NUL bytes cannot appear in json records.
+_INDEX_FOOTER = struct.Struct("<Q8s")
+_INDEX_MAGIC = b"\x00index\x00\x00"
+# Hash table slot of index sections: key hash, record offset (0 for empty slots).
+_INDEX_SLOT = struct.Struct("<QQ")
+
+TCurriculum = TypeVar("TCurriculum", bound=Curriculum)
+
+
+class CurriculumRegistry:
+    """
+    Stores many curricula, and versions of them, in a single append-only file.
+
+    After a json format header line, the file is a sequence of sections, each a
+    json header line holding the length of its body, the body and a newline:
+
+    - records, whose header holds the curriculum name, version and fingerprint,
+      and whose body is the curriculum in the compact format (see `serialization`).
+    - index sections, whose body holds the offsets of the indexed records, in the
+      order they were added, an open addressing hash table of record offsets by
+      fingerprint and by (name, version), and a footer with the section offset.
+
+    Every record is appended together with an index section covering all the
+    records, so the file ends with the index of its contents. Opening a registry
+    memory-maps the file and reads that footer, and lookups probe the hash table
+    and read the header of the records they hit: both are O(1), whatever the
+    number of records. Records appended by other processes are indexed on the
+    next lookup that misses. Should a write be interrupted, leaving no index
+    section at the end of the file, the records are scanned and indexed in
+    memory instead, until the next record is added.
+
+    Parsed curricula are cached per model type and fingerprint, so a record is
+    only parsed once. Lookups return a structural copy of the cached curriculum
+    (see `structural_copy`), which callers are free to modify.
+
+    Appends hold an exclusive lock: `fcntl.flock` on the registry file, or, on
+    Windows, `msvcrt.locking` on a `.lock` file next to it.
+
+    Example:
+        with CurriculumRegistry("curricula.registry") as registry:
+            registry.add(curriculum)
+            curriculum = registry.get(MyCurriculum, "My Curriculum", "0.1.0")
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        """
+        Opens the registry stored at path, creating it if needed.
+
+        Args:
+            path (str | os.PathLike): Path of the registry file.
+        """
+        self._path = Path(path)
+        if not self._path.exists() or self._path.stat().st_size == 0:
+            header = {"format": REGISTRY_FORMAT, "format_version": REGISTRY_FORMAT_VERSION}
+            with open(self._path, "ab") as f:
+                with _locked(f):
+                    if f.tell() == 0:
+                        f.write(json.dumps(header).encode() + b"\n")
+
+        self._mmap: Optional[mmap.mmap] = None
+        # Size of the file when it was last indexed
+        self._size = 0
+        # Position up to which the records are indexed
+        self._indexed = 0
+        # Last index section: offset of its record offsets, number of records, number of slots
+        self._index: Tuple[int, int, int] = (0, 0, 0)
+        # Records after the last index section: offsets in the order they were added,
+        # and offsets by fingerprint and by (name, version)
+        self._unindexed: List[int] = []
+        self._by_fingerprint: Dict[str, int] = {}
+        self._by_version: Dict[Tuple[str, str], int] = {}
+        # (model type, fingerprint) -> parsed curriculum
+        self._parsed: Dict[Tuple[type, str], Curriculum] = {}
+        with ExitStack() as stack:
+            self._file = stack.enter_context(open(self._path, "rb"))
+            # Closes the registry if it cannot be indexed.
+            stack.callback(self.close)
+            self._refresh()
+            stack.pop_all()
+
+    def __enter__(self) -> "CurriculumRegistry":
+        """Returns the registry."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Closes the registry."""
+        self.close()
+
+    def close(self) -> None:
+        """Closes the registry file."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __len__(self) -> int:
+        """Number of curricula in the registry."""
+        self._refresh()
+        return self._index[1] + len(self._unindexed)
+
+    def __contains__(self, key: Tuple[str, str] | str) -> bool:
+        """Whether the registry holds a curriculum with the given (name, version) or fingerprint."""
+        return self._find(key) is not None
+
+    def versions(self, name: str) -> List[str]:
+        """
+        Versions of the curriculum with the given name, in the order they were added.
+        """
+        self._refresh()
+        headers = (self._read_header(offset)[0] for offset in self._records())
+        return list(dict.fromkeys(header["version"] for header in headers if header["name"] == name))
+
+    def add(self, curriculum: Curriculum) -> str:
+        """
+        Validates and stores a curriculum. Adding a curriculum that is already stored does nothing.
+
+        Args:
+            curriculum (Curriculum): The curriculum to store.
+
+        Returns:
+            str: The fingerprint of the curriculum, see `Curriculum.fingerprint`.
+
+        Raises:
+            ValueError: If a different curriculum is stored under the same name and version.
+        """
+        curriculum.validate_curriculum()
+        fingerprint = curriculum.fingerprint()
+        version = (curriculum.name, curriculum.version)
+        body = dump_compact_json(curriculum).encode()
+        header = {
+            "name": curriculum.name,
+            "version": curriculum.version,
+            "fingerprint": fingerprint,
+            "length": len(body),
+        }
+
+        with open(self._path, "ab") as f:
+            with _locked(f):
+                # Index records appended by other processes before checking for conflicts.
+                self._refresh(locked=True)
+                stored = self._lookup(version)
+                if stored is not None and self._read_header(stored)[0]["fingerprint"] != fingerprint:
+                    raise ValueError(
+                        f"A different curriculum is already registered as {curriculum.name} {curriculum.version}."
+                    )
+                if self._lookup(fingerprint) is None:
+                    offset = os.fstat(f.fileno()).st_size
+                    keys = [fingerprint] if stored is not None else [fingerprint, version]
+                    record = json.dumps(header).encode() + b"\n" + body + b"\n"
+                    f.write(record + self._index_section(offset, keys, len(record)))
+                    f.flush()
+        self._refresh()
+        return fingerprint
+
+    def get(self, model_type: Type[TCurriculum], name: str, version: str) -> TCurriculum:
+        """
+        Loads the curriculum with the given name and version.
+
+        Args:
+            model_type (Type[TCurriculum]): The Curriculum type to deserialize into.
+            name (str): Curriculum name.
+            version (str): Curriculum version.
+
+        Raises:
+            KeyError: If no such curriculum is registered.
+        """
+        if (offset := self._find((name, version))) is None:
+            raise KeyError(f"Curriculum {name} {version} is not registered.")
+        return self._load(model_type, offset)
+
+    def get_by_fingerprint(self, model_type: Type[TCurriculum], fingerprint: str) -> TCurriculum:
+        """
+        Loads the curriculum with the given fingerprint.
+
+        Args:
+            model_type (Type[TCurriculum]): The Curriculum type to deserialize into.
+            fingerprint (str): Curriculum fingerprint, see `Curriculum.fingerprint`.
+
+        Raises:
+            KeyError: If no such curriculum is registered.
+        """
+        if (offset := self._find(fingerprint)) is None:
+            raise KeyError(f"No curriculum with fingerprint {fingerprint} is registered.")
+        return self._load(model_type, offset)
+
+    def _lookup(self, key: Tuple[str, str] | str) -> Optional[int]:
+        """Resolves the record offset of a (name, version) or fingerprint key in the index."""
+        assert self._mmap is not None
+        _, _, slots = self._index
+        if slots:
+            table = self._index[0] + 8 * self._index[1]
+            key_hash = _key_hash(key)
+            slot = key_hash % slots
+            while True:
+                stored_hash, offset = _INDEX_SLOT.unpack_from(self._mmap, table + slot * _INDEX_SLOT.size)
+                if offset == 0:
+                    break
+                if stored_hash == key_hash and _record_key(self._read_header(offset)[0], key) == key:
+                    return offset
+                slot = (slot + 1) % slots
+        if isinstance(key, str):
+            return self._by_fingerprint.get(key)
+        return self._by_version.get(key)
+
+    def _find(self, key: Tuple[str, str] | str) -> Optional[int]:
+        """Resolves the record offset of a (name, version) or fingerprint key, indexing new records on a miss."""
+        offset = self._lookup(key)
+        if offset is None and self._refresh():
+            offset = self._lookup(key)
+        return offset
+
+    def _load(self, model_type: Type[TCurriculum], offset: int) -> TCurriculum:
+        """Parses the record at offset, or takes it from the parse cache, and returns a copy of it."""
+        header, body = self._read_header(offset)
+        if (curriculum := self._parsed.get((model_type, header["fingerprint"]))) is None:
+            assert self._mmap is not None
+            curriculum = load_compact_json(model_type, self._mmap[body : body + header["length"]])
+            self._parsed[(model_type, header["fingerprint"])] = curriculum
+        return structural_copy(curriculum)  # type: ignore[return-value]
+
+    def _read_header(self, offset: int) -> Tuple[Dict[str, Any], int]:
+        """The header of the section at offset, and the offset of its body."""
+        assert self._mmap is not None
+        end = self._mmap.find(b"\n", offset)
+        return json.loads(self._mmap[offset:end]), end + 1
+
+    def _records(self) -> Iterator[int]:
+        """Offsets of the records, in the order they were added."""
+        assert self._mmap is not None
+        offsets, records, _ = self._index
+        yield from struct.unpack_from(f"<{records}Q", self._mmap, offsets)
+        yield from self._unindexed
+
+    def _index_section(self, offset: int, keys: Iterable[Tuple[str, str] | str], length: int) -> bytes:
+        """
+        The index section following a record of the given length at offset, indexing its keys
+        together with all the records indexed so far.
+        """
+        assert self._mmap is not None
+        records = [*self._records(), offset]
+        entries = [(_key_hash(key), offset) for key in keys]
+        entries += [(_key_hash(key), record) for key, record in self._by_fingerprint.items()]
+        entries += [(_key_hash(key), record) for key, record in self._by_version.items()]
+        index_offsets, index_records, slots = self._index
+        table = index_offsets + 8 * index_records
+        entries += [
+            entry
+            for entry in _INDEX_SLOT.iter_unpack(self._mmap[table : table + slots * _INDEX_SLOT.size])
+            if entry[1] != 0
+        ]
+
+        # Keep the hash table at most half full, so that probes stay short.
+        slots = 8
+        while slots < 2 * len(entries):
+            slots *= 2
+        hash_table = [0] * (2 * slots)
+        for key_hash, record in entries:
+            slot = key_hash % slots
+            while hash_table[2 * slot + 1] != 0:
+                slot = (slot + 1) % slots
+            hash_table[2 * slot : 2 * slot + 2] = key_hash, record
+        body = (
+            struct.pack(f"<{len(records)}Q", *records)
+            + struct.pack(f"<{2 * slots}Q", *hash_table)
+            + _INDEX_FOOTER.pack(offset + length, _INDEX_MAGIC)
+        )
+        header = {"index": len(records), "slots": slots, "length": len(body)}
+        return json.dumps(header).encode() + b"\n" + body + b"\n"
+
+    def _last_index(self, size: int) -> Optional[Tuple[int, int, int]]:
+        """The index section ending the file, if the file ends with a complete one."""
+        assert self._mmap is not None
+        footer = size - 1 - _INDEX_FOOTER.size
+        if footer <= self._indexed or self._mmap[size - 1 : size] != b"\n":
+            return None
+        offset, magic = _INDEX_FOOTER.unpack_from(self._mmap, footer)
+        if magic != _INDEX_MAGIC or not self._indexed <= offset < footer:
+            return None
+        header, body = self._read_header(offset)
+        if body + header.get("length", -1) != size - 1 or "index" not in header:
+            return None
+        return body, header["index"], header["slots"]
+
+    def _refresh(self, locked: bool = False) -> bool:
+        """
+        Indexes the records appended since the last refresh.
+        Returns True if new records were indexed.
+
+        Args:
+            locked (bool): Whether the caller holds the registry lock.
+        """
+        size = os.fstat(self._file.fileno()).st_size
+        if size == self._size:
+            return False
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        size = self._size = len(self._mmap)
+
+        if self._indexed == 0:
+            end = self._mmap.find(b"\n")
+            header = json.loads(self._mmap[:end]) if end >= 0 else {}
+            if header.get("format") != REGISTRY_FORMAT:
+                raise ValueError(f"{self._path} is not a curriculum registry.")
+            if header.get("format_version") != REGISTRY_FORMAT_VERSION:
+                raise ValueError(f"Unsupported registry format version {header.get('format_version')}.")
+            self._indexed = end + 1
+        if self._indexed == size:
+            return False
+
+        if (index := self._last_index(size)) is not None:
+            self._index = index
+            self._indexed = size
+            self._unindexed.clear()
+            self._by_fingerprint.clear()
+            self._by_version.clear()
+            return True
+        if not locked:
+            # Another process may be appending: wait for it to finish.
+            with _locked(self._file):
+                self._size = 0
+                return self._refresh(locked=True)
+        return self._scan(size)
+
+    def _scan(self, size: int) -> bool:
+        """
+        Indexes, in memory, the records that are not in the last index section.
+        Returns True if new records were indexed.
+        """
+        assert self._mmap is not None
+        position = self._indexed
+        indexed = False
+        while position < size:
+            end = self._mmap.find(b"\n", position)
+            if end < 0:
+                break
+            header = json.loads(self._mmap[position:end])
+            section_end = end + 1 + header["length"] + 1
+            if section_end > size:
+                # Incomplete section, from an interrupted write.
+                break
+            if "index" not in header and self._lookup(header["fingerprint"]) is None:
+                self._unindexed.append(position)
+                self._by_fingerprint[header["fingerprint"]] = position
+                if self._lookup((header["name"], header["version"])) is None:
+                    self._by_version[(header["name"], header["version"])] = position
+                indexed = True
+            position = section_end
+        self._indexed = position
+        return indexed
+
+
+def _key_hash(key: Tuple[str, str] | str) -> int:
+    """Hash of a fingerprint or (name, version) key in index sections."""
+    data = json.dumps(key if isinstance(key, str) else list(key)).encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def _record_key(header: Dict[str, Any], key: Tuple[str, str] | str) -> Tuple[str, str] | str:
+    """The key of a record header of the same kind as key."""
+    return header["fingerprint"] if isinstance(key, str) else (header["name"], header["version"])
+
+
+@contextmanager
+def _locked(file: IO[bytes]) -> Iterator[None]:
+    """
+    Holds an exclusive lock on an open registry file.
+
+    Byte range locks being mandatory on Windows, the lock is taken there on a
+    separate lock file, so that the registry stays readable by other processes.
+    """
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+        return
+
+    with open(f"{file.name}.lock", "ab") as lock:
+        lock.seek(0)
+        while True:
+            try:
+                # Retries for 10 seconds before raising.
+                msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except OSError:
+                continue
+        try:
+            yield
+        finally:
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
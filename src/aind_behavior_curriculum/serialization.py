@@ -0,0 +1,467 @@
+"""
+Compact serialization of Curriculum and TrainerState objects.
+"""
+
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from aind_behavior_curriculum.curriculum import (
+    _LAZY_TASKS_CONTEXT_KEY,
+    _RULES_CONTEXT_KEY,
+    Curriculum,
+    PolicyGraph,
+    Stage,
+    _task_types,
+    task_dispatch_table,
+)
+from aind_behavior_curriculum.trainer import TrainerState
+
+COMPACT_FORMAT = "aind-behavior-curriculum/compact"
+COMPACT_FORMAT_VERSION = 2
+# Version 1 documents store the policy graph of every stage inline.
+_SUPPORTED_FORMAT_VERSIONS = (1, COMPACT_FORMAT_VERSION)
+
+TModel = TypeVar("TModel", bound=BaseModel)
+
+_STAGE_FIELDS = ("name", "task", "graph", "start_policies", "metrics_provider")
+_TRAINER_STATE_FIELDS = ("curriculum", "stage", "active_policies", "task")
+
+
+def _canonical(value: Any) -> str:
+    """Key used to deduplicate json-like values in the header tables."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+class _CompactEncoder:
+    """
+    Builds the header tables of a compact document.
+    Every distinct rule, task, policy graph and stage is stored once and
+    referenced by its integer index in the body.
+    """
+
+    def __init__(self) -> None:
+        """Initializes empty header tables."""
+        self.rules: List[str] = []
+        self.tasks: List[Dict[str, Any]] = []
+        self.graphs: List[Dict[str, Any]] = []
+        self.stages: List[Dict[str, Any]] = []
+        self._rule_ids: Dict[str, int] = {}
+        self._task_ids: Dict[str, int] = {}
+        self._graph_ids: Dict[str, int] = {}
+        self._stage_ids: Dict[str, int] = {}
+
+    def header(self) -> Dict[str, Any]:
+        """Header tables referenced by the body."""
+        return {"rules": self.rules, "tasks": self.tasks, "graphs": self.graphs, "stages": self.stages}
+
+    def rule(self, rule: Optional[str]) -> Optional[int]:
+        """Interns a serialized rule."""
+        if rule is None:
+            return None
+        if (rule_id := self._rule_ids.get(rule)) is None:
+            rule_id = self._rule_ids[rule] = len(self.rules)
+            self.rules.append(rule)
+        return rule_id
+
+    def task(self, task: Dict[str, Any]) -> int:
+        """Interns a serialized task."""
+        key = _canonical(task)
+        if (task_id := self._task_ids.get(key)) is None:
+            task_id = self._task_ids[key] = len(self.tasks)
+            self.tasks.append(task)
+        return task_id
+
+    def graph(self, graph: Dict[str, Any], encode_node) -> Dict[str, Any]:
+        """Encodes a serialized behavior graph."""
+        node_ids = [int(k) for k in graph["nodes"]]
+        if [int(k) for k in graph["graph"]] != node_ids:
+            raise ValueError("Graph adjacency list does not match the graph nodes and cannot be encoded.")
+
+        encoded: Dict[str, Any] = {"nodes": [encode_node(node) for node in graph["nodes"].values()]}
+        if node_ids != list(range(len(node_ids))):
+            encoded["ids"] = node_ids
+        encoded["edges"] = [
+            [i for rule, dest_id in edges for i in (self.rule(rule), dest_id)] for edges in graph["graph"].values()
+        ]
+        return encoded
+
+    def policy_graph(self, graph: Dict[str, Any]) -> int:
+        """Interns a serialized policy graph."""
+        encoded = self.graph(graph, self.rule)
+        key = _canonical(encoded)
+        if (graph_id := self._graph_ids.get(key)) is None:
+            graph_id = self._graph_ids[key] = len(self.graphs)
+            self.graphs.append(encoded)
+        return graph_id
+
+    def stage(self, stage: Optional[Dict[str, Any]]) -> Optional[int]:
+        """Interns a serialized stage."""
+        if stage is None:
+            return None
+        encoded: Dict[str, Any] = {
+            "name": stage["name"],
+            "task": self.task(stage["task"]),
+            "graph": self.policy_graph(stage["graph"]),
+            "start_policies": [self.rule(p) for p in stage["start_policies"]],
+            "metrics_provider": self.rule(stage["metrics_provider"]),
+        }
+        extra = {k: v for k, v in stage.items() if k not in _STAGE_FIELDS}
+        if extra:
+            encoded["fields"] = extra
+
+        key = _canonical(encoded)
+        if (stage_id := self._stage_ids.get(key)) is None:
+            stage_id = self._stage_ids[key] = len(self.stages)
+            self.stages.append(encoded)
+        return stage_id
+
+    def curriculum(self, curriculum: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Encodes a serialized curriculum."""
+        if curriculum is None:
+            return None
+        return {
+            "fields": {k: v for k, v in curriculum.items() if k != "graph"},
+            "graph": self.graph(curriculum["graph"], self.stage),
+        }
+
+    def trainer_state(self, trainer_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Encodes a serialized trainer state."""
+        active_policies = trainer_state["active_policies"]
+        task = trainer_state.get("task")
+        return {
+            "fields": {k: v for k, v in trainer_state.items() if k not in _TRAINER_STATE_FIELDS},
+            "curriculum": self.curriculum(trainer_state["curriculum"]),
+            "stage": self.stage(trainer_state["stage"]),
+            "active_policies": None if active_policies is None else [self.rule(p) for p in active_policies],
+            "task": None if task is None else self.task(task),
+        }
+
+
+class _CompactDecoder:
+    """
+    Expands a compact document back into the
+    regular (model_dump) representation.
+    """
+
+    def __init__(self, header: Dict[str, Any], lazy_tasks: bool = False, share_policy_graphs: bool = False) -> None:
+        """
+        Initializes the decoder from the header tables of a document.
+        With lazy_tasks, stage tasks are decoded as raw json strings.
+        With share_policy_graphs, an interned policy graph is only decoded for the first
+        stage using it, see `share_policy_graphs`.
+        """
+        self.rules: List[str] = header["rules"]
+        self.tasks: List[Dict[str, Any]] = header["tasks"]
+        self.graphs: List[Dict[str, Any]] = header.get("graphs", [])
+        self.stages: List[Dict[str, Any]] = header["stages"]
+        self._policy_graphs: Dict[int, Dict[str, Any]] = {}
+        self._share_policy_graphs = share_policy_graphs
+        # Interned policy graph of every decoded stage, in decoding order (None if inline).
+        self.stage_graphs: List[Optional[int]] = []
+        self.stage_tasks: List[Dict[str, Any] | str] = (
+            [json.dumps(task) for task in self.tasks] if lazy_tasks else self.tasks
+        )
+
+    def rule(self, rule_id: Optional[int]) -> Optional[str]:
+        """Resolves an interned rule."""
+        return None if rule_id is None else self.rules[rule_id]
+
+    def graph(self, graph: Dict[str, Any], decode_node) -> Dict[str, Any]:
+        """Decodes a behavior graph."""
+        node_ids = graph.get("ids", range(len(graph["nodes"])))
+        return {
+            "nodes": {str(i): decode_node(node) for i, node in zip(node_ids, graph["nodes"])},
+            "graph": {
+                str(i): [[self.rules[edges[j]], edges[j + 1]] for j in range(0, len(edges), 2)]
+                for i, edges in zip(node_ids, graph["edges"])
+            },
+        }
+
+    def policy_graph(self, graph: int | Dict[str, Any]) -> Dict[str, Any]:
+        """Resolves an interned policy graph, or decodes an inline (version 1) one."""
+        if not isinstance(graph, int):
+            return self.graph(graph, self.rule)
+        if (decoded := self._policy_graphs.get(graph)) is None:
+            decoded = self._policy_graphs[graph] = self.graph(self.graphs[graph], self.rule)
+        return decoded
+
+    def stage(self, stage_id: Optional[int]) -> Optional[Dict[str, Any]]:
+        """Resolves an interned stage."""
+        if stage_id is None:
+            self.stage_graphs.append(None)
+            return None
+        stage = self.stages[stage_id]
+        graph = stage["graph"]
+        decoded = {
+            "name": stage["name"],
+            "task": self.stage_tasks[stage["task"]],
+            "graph": self.policy_graph(graph),
+            "start_policies": [self.rule(p) for p in stage["start_policies"]],
+            "metrics_provider": self.rule(stage["metrics_provider"]),
+            **stage.get("fields", {}),
+        }
+        graph_id = graph if isinstance(graph, int) else None
+        if self._share_policy_graphs and graph_id is not None and graph_id in self.stage_graphs:
+            # Left to its (cheap) default, the graph of the first stage is shared instead
+            del decoded["graph"]
+        self.stage_graphs.append(graph_id)
+        return decoded
+
+    def share_policy_graphs(self, stages: Iterable[Optional[Stage]]) -> None:
+        """
+        Makes the validated stages, given in decoding order, share the validated policy graph
+        of the first stage of the same type using the same interned policy graph.
+        """
+        templates: Dict[Tuple[type, int], PolicyGraph] = {}
+        for stage, graph_id in zip(stages, self.stage_graphs, strict=True):
+            if stage is None or graph_id is None:
+                continue
+            template = templates.setdefault((type(stage), graph_id), stage.graph)
+            if template is not stage.graph:
+                stage.share_policy_graph(template)
+
+    def curriculum(self, curriculum: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Decodes a curriculum."""
+        if curriculum is None:
+            return None
+        return {**curriculum["fields"], "graph": self.graph(curriculum["graph"], self.stage)}
+
+    def trainer_state(self, trainer_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Decodes a trainer state."""
+        active_policies = trainer_state["active_policies"]
+        task = trainer_state["task"]
+        return {
+            "curriculum": self.curriculum(trainer_state["curriculum"]),
+            "stage": self.stage(trainer_state["stage"]),
+            "active_policies": None if active_policies is None else [self.rule(p) for p in active_policies],
+            "task": None if task is None else self.tasks[task],
+            **trainer_state["fields"],
+        }
+
+
+def to_compact(model: Curriculum | TrainerState) -> Dict[str, Any]:
+    """
+    Encodes a Curriculum or TrainerState into the compact representation.
+
+    The compact representation stores every distinct rule, task, policy graph
+    and stage once in a header and references them by integer index in the body.
+    It can be converted back with `from_compact`.
+
+    Args:
+        model (Curriculum | TrainerState): The object to encode.
+
+    Returns:
+        Dict[str, Any]: A json-serializable compact document.
+    """
+    encoder = _CompactEncoder()
+    dump = model.model_dump(mode="json")
+    if isinstance(model, Curriculum):
+        kind, body = "Curriculum", encoder.curriculum(dump)
+    elif isinstance(model, TrainerState):
+        kind, body = "TrainerState", encoder.trainer_state(dump)
+    else:
+        raise TypeError(f"Compact serialization is not supported for {type(model).__name__}.")
+
+    return {
+        "format": COMPACT_FORMAT,
+        "format_version": COMPACT_FORMAT_VERSION,
+        "kind": kind,
+        **encoder.header(),
+        "body": body,
+    }
+
+
+def expand_compact(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Expands a compact document into the regular json representation,
+    i.e. the output of `model_dump(mode="json")`.
+
+    Args:
+        document (Dict[str, Any]): A compact document created by `to_compact`.
+
+    Returns:
+        Dict[str, Any]: The regular json representation.
+    """
+    return _expand_compact(document)
+
+
+def _expand_compact(document: Dict[str, Any], lazy_tasks: bool = False) -> Dict[str, Any]:
+    """Expands a compact document, optionally keeping stage tasks as raw json strings."""
+    _check_compact_format(document)
+    return _expand_with_decoder(document, _CompactDecoder(document, lazy_tasks=lazy_tasks))
+
+
+def _check_compact_format(document: Dict[str, Any]) -> None:
+    """Raises a ValueError if the document is not a supported compact document."""
+    if document.get("format") != COMPACT_FORMAT:
+        raise ValueError("Document is not in the compact curriculum format.")
+    if document.get("format_version") not in _SUPPORTED_FORMAT_VERSIONS:
+        raise ValueError(f"Unsupported compact format version {document.get('format_version')}.")
+
+
+def _expand_with_decoder(document: Dict[str, Any], decoder: _CompactDecoder) -> Dict[str, Any]:
+    """Expands the body of a compact document with the given decoder."""
+    if document["kind"] == "Curriculum":
+        return decoder.curriculum(document["body"])
+    if document["kind"] == "TrainerState":
+        return decoder.trainer_state(document["body"])
+    raise ValueError(f"Unknown compact document kind {document['kind']}.")
+
+
+def _validate(
+    model_type: Type[TModel], document: Dict[str, Any], lazy_tasks: bool, rules: Optional[Dict[Any, Any]] = None
+) -> TModel:
+    """
+    Validates a regular json document, whose stage tasks are raw json strings if lazy_tasks.
+    Rules are reused from, and added to, rules if given (see `load_trainer_states`).
+    """
+    context = _validation_context(lazy_tasks, rules)
+    return model_type.model_validate_json(json.dumps(document), context=context)
+
+
+def _validation_context(lazy_tasks: bool, rules: Optional[Dict[Any, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Validation context of a lazy and/or bulk load, or None."""
+    context: Dict[str, Any] = {}
+    if lazy_tasks:
+        context[_LAZY_TASKS_CONTEXT_KEY] = True
+    if rules is not None:
+        context[_RULES_CONTEXT_KEY] = rules
+    return context or None
+
+
+def _stage_documents(model_type: Type[BaseModel], document: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Stages of a regular json Curriculum or TrainerState document:
+    the curriculum stages, then the current stage of a trainer state.
+    """
+    if issubclass(model_type, TrainerState):
+        if document.get("curriculum") is not None:
+            yield from document["curriculum"]["graph"]["nodes"].values()
+        if document.get("stage") is not None:
+            yield document["stage"]
+    elif issubclass(model_type, Curriculum):
+        yield from document["graph"]["nodes"].values()
+    else:
+        raise TypeError(f"{model_type.__name__} is not a Curriculum or TrainerState type.")
+
+
+def _defer_stage_tasks(model_type: Type[BaseModel], document: Dict[str, Any]) -> Dict[str, Any]:
+    """Replaces, in place, the stage tasks of a regular json document by raw json strings."""
+    for stage in _stage_documents(model_type, document):
+        stage["task"] = json.dumps(stage["task"])
+    return document
+
+
+def from_compact(model_type: Type[TModel], document: Dict[str, Any], lazy_tasks: bool = False) -> TModel:
+    """
+    Decodes a compact document into an instance of model_type.
+    Identical policy graphs are only validated once, and their stages share its
+    nodes and transitions (see `Curriculum.deduplicate_policy_graphs`).
+
+    Args:
+        model_type (Type[TModel]): The Curriculum or TrainerState type to deserialize into.
+        document (Dict[str, Any]): A compact document created by `to_compact`.
+        lazy_tasks (bool): If True, the task of each stage is only validated
+            once it is accessed. See `load_json`.
+
+    Returns:
+        TModel: The deserialized instance.
+    """
+    _check_compact_format(document)
+    decoder = _CompactDecoder(document, lazy_tasks=lazy_tasks, share_policy_graphs=True)
+    model = _validate(model_type, _expand_with_decoder(document, decoder), lazy_tasks)
+
+    # Stages in decoding order: the curriculum stages, then the stage of the trainer state
+    stages: List[Optional[Stage]] = []
+    curriculum = model.curriculum if isinstance(model, TrainerState) else model
+    if curriculum is not None:
+        stages.extend(curriculum.see_stages())
+    if isinstance(model, TrainerState):
+        stages.append(model.stage)
+    decoder.share_policy_graphs(stages)
+    return model
+
+
+def dump_compact_json(model: Curriculum | TrainerState, indent: Optional[int] = None) -> str:
+    """
+    Serializes a Curriculum or TrainerState to a compact json string.
+    """
+    separators = None if indent is not None else (",", ":")
+    return json.dumps(to_compact(model), indent=indent, separators=separators)
+
+
+def load_compact_json(model_type: Type[TModel], data: str | bytes, lazy_tasks: bool = False) -> TModel:
+    """
+    Deserializes a compact json string into an instance of model_type.
+    """
+    return from_compact(model_type, json.loads(data), lazy_tasks=lazy_tasks)
+
+
+def load_json(model_type: Type[TModel], data: str | bytes, lazy_tasks: bool = False) -> TModel:
+    """
+    Deserializes a (regular) json string into an instance of model_type.
+
+    With lazy_tasks, the task of each stage is kept as raw json and only
+    validated when first accessed (e.g. through `Stage.task` or `Stage.get_task`),
+    so that loading a large curriculum only pays for the stages that are used.
+    Every other field is validated as usual.
+
+    Args:
+        model_type (Type[TModel]): The Curriculum or TrainerState type to deserialize into.
+        data (str | bytes): The output of `model_dump_json`.
+        lazy_tasks (bool): Defer the validation of stage tasks.
+
+    Returns:
+        TModel: The deserialized instance.
+    """
+    if not lazy_tasks:
+        return model_type.model_validate_json(data)
+    return _validate(model_type, _defer_stage_tasks(model_type, json.loads(data)), lazy_tasks)
+
+
+def load_trainer_states(
+    model_type: Type[TModel], records: Iterable[str | bytes], lazy_tasks: bool = True
+) -> Iterator[TModel]:
+    """
+    Streams serialized TrainerStates (json), e.g. the rows of a history table, as instances of model_type.
+
+    Records are validated from json with a single `model_validate_json` call each. Rules are
+    deserialized (imported and type checked) once per load rather than once per record, which is
+    where bulk loads spend most of their time: records usually hold the same curriculum.
+
+    With lazy_tasks, stage tasks are kept as raw json and only validated once accessed, directly
+    by the validator of their task type (see `curriculum.parse_task`). The name of every task of
+    a record is then read from the parsed record and looked up in the dispatch table of
+    model_type before the record is validated. Otherwise, unknown tasks fail on the
+    discriminator of their task union, before any task is validated.
+
+    Args:
+        model_type (Type[TModel]): TrainerState type of a curriculum, e.g. `Trainer(curriculum).trainer_state_model`.
+        records (Iterable[str | bytes]): Serialized trainer states.
+        lazy_tasks (bool): Defer the validation of stage tasks. Defaults to True.
+
+    Yields:
+        TModel: The trainer states, in order.
+
+    Raises:
+        ValueError: If a record holds a task that is not known to model_type.
+    """
+    if not issubclass(model_type, TrainerState):
+        raise TypeError(f"{model_type.__name__} is not a TrainerState type.")
+    table = task_dispatch_table(_task_types(model_type.model_fields["task"].annotation))
+    rules: Dict[Any, Any] = {}
+    for i, record in enumerate(records):
+        if not lazy_tasks:
+            yield model_type.model_validate_json(record, context=_validation_context(lazy_tasks, rules))
+            continue
+
+        document = json.loads(record)
+        names = [stage["task"].get("name") for stage in _stage_documents(model_type, document)]
+        if document.get("task") is not None:
+            names.append(document["task"].get("name"))
+        for name in names:
+            if name not in table:
+                raise ValueError(f"Record {i} holds unknown task {name!r}, expected one of {sorted(table)}.")
+        yield _validate(model_type, _defer_stage_tasks(model_type, document), lazy_tasks, rules)
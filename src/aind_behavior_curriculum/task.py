@@ -2,14 +2,16 @@
 Base Behavior Models
 """
 
+import weakref
 from string import capwords
-from typing import Annotated, Generic, Literal, Optional, Type, TypeVar
+from typing import Annotated, Any, Generic, Literal, Optional, Tuple, Type, TypeVar
 
 from pydantic import Field, SerializeAsAny, create_model
 
 from aind_behavior_curriculum.base import (
     AindBehaviorModel,
     AindBehaviorModelExtra,
+    content_fingerprint,
 )
 
 SEMVER_REGEX = r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"
@@ -43,9 +45,20 @@ class Task(AindBehaviorModel, Generic[TTaskParameters]):
         description="Optional stage name the `Task` object instance represents.",
     )
 
+    def fingerprint(self) -> str:
+        """
+        Stable digest of the task content: its name, version, description and parameters.
+        Equal tasks have the same fingerprint, in any process.
+        """
+        return content_fingerprint(self.model_dump(mode="json"))
+
 
 TTask = TypeVar("TTask", bound="Task")
 
+# (name, task parameters, version, description) -> Task type created by create_task.
+# Values are weak, so that task types nobody uses any more are released.
+_TASK_TYPES: "weakref.WeakValueDictionary[Tuple[str, type, Optional[str], str], Any]" = weakref.WeakValueDictionary()
+
 
 def create_task(
     *,
@@ -56,6 +69,7 @@ def create_task(
 ) -> Type[Task[TTaskParameters]]:
     """
     Factory method for creating a Task object.
+    Repeated calls with the same arguments return the same Task type, as long as it is in use.
 
     Args:
         name: Name of the task.
@@ -72,7 +86,11 @@ def create_task(
         """Converts a string from snake_case to PascalCase"""
         return "".join(map(capwords, v.split("_")))
 
-    return create_model(
+    key = (name, task_parameters, version, description)
+    if (task_type := _TASK_TYPES.get(key)) is not None:
+        return task_type
+
+    task_type = create_model(
         _snake_to_pascal(name),
         __base__=Task[task_parameters],
         name=Annotated[
@@ -93,3 +111,4 @@ def create_task(
             Field(default=description, frozen=True, validate_default=True),
         ],
     )
+    return _TASK_TYPES.setdefault(key, task_type)
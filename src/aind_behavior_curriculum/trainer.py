@@ -2,14 +2,17 @@
 Core Trainer primitive.
 """
 
+import threading
+import weakref
 from abc import abstractmethod
+from collections import OrderedDict
 from collections.abc import Iterable
 from functools import reduce
-from typing import Annotated, Generic, List, Optional, Self, Type, TypeVar
+from typing import Annotated, ClassVar, FrozenSet, Generic, List, Literal, Optional, Self, Tuple, Type, TypeVar
 
 from pydantic import Field, create_model
 
-from aind_behavior_curriculum.base import AindBehaviorModel
+from aind_behavior_curriculum.base import AindBehaviorModel, structural_copy
 from aind_behavior_curriculum.curriculum import (
     Curriculum,
     Metrics,
@@ -24,6 +27,8 @@ TCurriculum = TypeVar("TCurriculum", bound=Curriculum)
 TMetrics = TypeVar("TMetrics", bound=Metrics)
 TTask = TypeVar("TTask", bound=Task)
 
+STAGE_ENTRY_TASK_CACHE_SIZE = 256
+
 
 class TrainerState(AindBehaviorModel, Generic[TCurriculum]):
     """
@@ -54,6 +59,13 @@ class TrainerState(AindBehaviorModel, Generic[TCurriculum]):
         validate_default=True,
         description="The active policies for the current stage",
     )
+    # Note: Like stage, this will deserialize to a base Task object
+    # unless the type-aware TrainerState is used.
+    task: Optional[Task] = Field(
+        default=None,
+        validate_default=True,
+        description="Subject-specific task resulting from the active policies. If None, the stage's task is used.",
+    )
 
     @classmethod
     def default(cls) -> Self:
@@ -70,6 +82,20 @@ class TrainerState(AindBehaviorModel, Generic[TCurriculum]):
             active_policies=None,
         )
 
+    def get_task(self) -> Optional[Task]:
+        """
+        Get a copy of the subject's current task: the subject-specific
+        task if set, otherwise the task of the current stage.
+        """
+        task = self._current_task()
+        return structural_copy(task) if task is not None else None
+
+    def _current_task(self) -> Optional[Task]:
+        """Returns the subject's current task without copying."""
+        if self.task is not None:
+            return self.task
+        return self.stage.task if self.stage is not None else None
+
     def __eq__(self, other: object) -> bool:
         """
         TrainerState Equality
@@ -94,6 +120,29 @@ class TrainerState(AindBehaviorModel, Generic[TCurriculum]):
         return set(self_rules) == set(other_rules)
 
 
+class EvaluationTrace(AindBehaviorModel):
+    """
+    Record of the transitions taken during a single Trainer evaluation.
+    """
+
+    policy_hops: List[List[Policy]] = Field(
+        default_factory=list,
+        description="Active policies after each policy transition hop, in the order they were applied.",
+    )
+    policy_stop_reason: Optional[Literal["fixed_point", "cycle", "hop_limit"]] = Field(
+        default=None,
+        description="Why policy evaluation stopped. None if the subject transitioned stages.",
+    )
+    stage_hops: List[str] = Field(
+        default_factory=list,
+        description="Names of the stages entered by each stage transition hop, in the order they were taken.",
+    )
+    stage_stop_reason: Optional[Literal["fixed_point", "cycle", "hop_limit"]] = Field(
+        default=None,
+        description="Why stage evaluation stopped. None if the subject did not transition stages.",
+    )
+
+
 class Trainer(Generic[TCurriculum]):
     """
     Trainer class for managing and evaluating curriculum stages and policy transitions,
@@ -114,6 +163,15 @@ class Trainer(Generic[TCurriculum]):
             Filters unique policies based on their rule functions and reassembles the Policy objects.
     """
 
+    # (task type, task json, start policies) -> task, shared by all trainers.
+    _stage_entry_tasks: ClassVar[OrderedDict[Tuple[type, str, Tuple[Policy, ...]], Task]] = OrderedDict()
+    _stage_entry_tasks_lock: ClassVar[threading.Lock] = threading.Lock()
+    # (curriculum type, curriculum name, known tasks) -> trainer state type, shared by all trainers.
+    # Values are weak, so that trainer state types of curricula nobody uses any more are released.
+    _trainer_state_types: ClassVar["weakref.WeakValueDictionary[Tuple[type, str, FrozenSet[type]], type]"] = (
+        weakref.WeakValueDictionary()
+    )
+
     def __init__(self, curriculum: TCurriculum):
         """
         Initializes the Trainer with the given curriculum.
@@ -155,6 +213,50 @@ class Trainer(Generic[TCurriculum]):
             stage=init_stage,
         )
 
+    def get_stage_entry_task(
+        self,
+        stage: Stage | str,
+        start_policies: Optional[Iterable[Policy]] = None,
+    ) -> Task:
+        """
+        Task of a subject entering a stage of the curriculum: the stage's task
+        updated by the start policies, evaluated on empty Metrics.
+
+        Policies are expected to be pure functions, so the result only depends on the
+        task of the stage and the (ordered) start policies. It is cached by these,
+        and shared by all trainers, such that enrolling a cohort of subjects
+        computes each entry task once.
+
+        Args:
+            stage (Stage | str): The stage, or the name of a stage of the curriculum.
+            start_policies (Optional[Iterable[Policy]]): The policies the subject starts with.
+                Defaults to the start policies of the stage.
+
+        Returns:
+            Task: A copy of the entry task, which can be safely modified.
+        """
+        if isinstance(stage, str):
+            stage = self.curriculum.get_stage(stage)
+        if start_policies is None:
+            start_policies = stage.start_policies
+        start_policies = tuple(Policy.normalize_rule_or_callable(p) for p in start_policies)
+
+        stage_task = stage.get_task()
+        # Policies are compared by equality, names are not unique (e.g. closures of a same factory)
+        key = (type(stage_task), stage_task.model_dump_json(), start_policies)
+        cache = Trainer._stage_entry_tasks
+        with Trainer._stage_entry_tasks_lock:
+            task = cache.get(key)
+            if task is not None:
+                cache.move_to_end(key)
+        if task is None:
+            task = self.get_net_parameter_update(stage_task, start_policies, Metrics())
+            with Trainer._stage_entry_tasks_lock:
+                cache[key] = task
+                if len(cache) > STAGE_ENTRY_TASK_CACHE_SIZE:
+                    cache.popitem(last=False)
+        return structural_copy(task)
+
     @property
     def trainer_state_model(self) -> Type[TrainerState[TCurriculum]]:
         """
@@ -171,6 +273,7 @@ class Trainer(Generic[TCurriculum]):
         stage: Optional[Stage],
         is_on_curriculum: bool = True,
         active_policies: Optional[Iterable[Policy]] = None,
+        task: Optional[Task] = None,
     ) -> TrainerState[TCurriculum]:
         """
         Creates a new instance of the type-aware TrainerState class.
@@ -183,23 +286,78 @@ class Trainer(Generic[TCurriculum]):
             stage=stage,
             is_on_curriculum=is_on_curriculum,
             active_policies=list(active_policies) if active_policies else None,
+            task=task,
+        )
+
+    def rebind_trainer_state(self, trainer_state: TrainerState[TCurriculum]) -> TrainerState[TCurriculum]:
+        """
+        Rebinds a (typically deserialized) TrainerState to the objects of this trainer's curriculum.
+        The stage is looked up by name and the active policies by equality, and they
+        are replaced by the stage and policies owned by the curriculum. The subject's current task is
+        preserved as the subject-specific task of the returned state.
+
+        Args:
+            trainer_state (TrainerState): The trainer state to rebind.
+
+        Returns:
+            TrainerState: A copy of the trainer state bound to the curriculum.
+
+        Raises:
+            ValueError: If the stage or an active policy is not part of the curriculum.
+        """
+        stage = trainer_state.stage
+        if stage is None:
+            return trainer_state.model_copy(update={"curriculum": self.curriculum})
+
+        canonical_stage = self.curriculum.get_stage(stage.name)
+        task = trainer_state.task
+        if task is None and canonical_stage is not stage:
+            # States created before the subject-specific task existed
+            # keep the subject's task in the stage.
+            task = stage.task
+
+        active_policies = trainer_state.active_policies
+        if active_policies is not None:
+            graph = canonical_stage.graph
+            active_policies = [graph.nodes[graph._get_node_id(policy)] for policy in active_policies]
+
+        return trainer_state.model_copy(
+            update={
+                "curriculum": self.curriculum,
+                "stage": canonical_stage,
+                "active_policies": active_policies,
+                "task": task,
+            }
         )
 
     @staticmethod
     def _construct_trainer_state_type_from_curriculum(
         curriculum: TCurriculum,
     ) -> Type[TrainerState[TCurriculum]]:
-        """Constructs a task-type-aware TrainerState"""
-        _union_type = make_task_discriminator(curriculum._known_tasks)
+        """
+        Constructs a task-type-aware TrainerState.
+        The type is memoized, so that trainers of the same curriculum type share it.
+        """
+        known_tasks = curriculum._known_tasks
+        key = (type(curriculum), curriculum.name, frozenset(known_tasks))
+        if (trainer_state_type := Trainer._trainer_state_types.get(key)) is not None:
+            return trainer_state_type
+
+        _union_type = make_task_discriminator(known_tasks)
 
-        return create_model(
+        trainer_state_type = create_model(
             f"{curriculum.name}TrainerState",
             __base__=TrainerState[type(curriculum)],
             stage=Annotated[
                 Optional[Stage[Metrics, _union_type]],
                 Field(frozen=True, validate_default=True),
             ],
+            task=Annotated[
+                Optional[_union_type],
+                Field(default=None, validate_default=True),
+            ],
         )
+        return Trainer._trainer_state_types.setdefault(key, trainer_state_type)
 
     @staticmethod
     def _evaluate_stage_transition(curriculum: TCurriculum, current_stage: Stage, metrics: TMetrics) -> Optional[Stage]:
@@ -215,9 +373,8 @@ class Trainer(Generic[TCurriculum]):
             Optional[Stage]: The new stage if a transition is made, otherwise None.
         """
         updated_stage: Optional[Stage] = None
-        # This line binds the Stage object to the curriculum.
-        # TODO may be worth finding a better way to hash the stage object.
-        stage_transitions = curriculum.see_stage_transitions(current_stage)
+        # This line binds the Stage object to the curriculum (by name).
+        stage_transitions = curriculum._get_stage_transitions(current_stage)
         for stage_eval, dest_stage in stage_transitions:
             # On the first (and only first) true evaluation we transition.
             if stage_eval.invoke(metrics):  # type: ignore
@@ -245,7 +402,7 @@ class Trainer(Generic[TCurriculum]):
         dest_policies: list[Policy[TMetrics, TTask]] = []
 
         for active_policy in active_policies:
-            policy_transitions = current_stage.see_policy_transitions(active_policy)
+            policy_transitions = current_stage._get_policy_transitions(Policy.normalize_rule_or_callable(active_policy))
 
             _has_transitioned = False
             for policy_eval, dest_policy in policy_transitions:
@@ -260,49 +417,184 @@ class Trainer(Generic[TCurriculum]):
 
         return cls._get_unique_policies(dest_policies)
 
-    def evaluate(self, trainer_state: TrainerState[TCurriculum], metrics: Metrics) -> TrainerState[TCurriculum]:
+    def _evaluate_policy_hops(
+        self,
+        current_stage: Stage[TMetrics, TTask],
+        active_policies: List[Policy[TMetrics, TTask]],
+        task: TTask,
+        metrics: TMetrics,
+        max_policy_hops: int,
+        trace: EvaluationTrace,
+    ) -> Tuple[List[Policy[TMetrics, TTask]], TTask]:
+        """
+        Evaluates policy transitions and applies the resulting policies to the task, repeatedly,
+        until the active policies reach a fixed point, revisit an earlier set of
+        active policies (cycle), or max_policy_hops hops were applied.
+        Each hop is equivalent to one single-hop evaluation with the same metrics.
+        The first hop is always applied.
+        """
+        graph = current_stage.graph
+
+        def node_ids(policies: List[Policy[TMetrics, TTask]]) -> FrozenSet[int]:
+            """Identifies a set of active policies by the ids of their nodes in the policy graph."""
+            return frozenset(graph._get_node_id(Policy.normalize_rule_or_callable(p)) for p in policies)
+
+        visited = {node_ids(active_policies)}
+        while True:
+            updated_policies = self._evaluate_policy_transitions(current_stage, active_policies, metrics)
+            if trace.policy_hops:
+                updated_ids = node_ids(updated_policies)
+                if updated_ids == node_ids(active_policies):
+                    trace.policy_stop_reason = "fixed_point"
+                    break
+                if updated_ids in visited:
+                    trace.policy_stop_reason = "cycle"
+                    break
+                visited.add(updated_ids)
+
+            active_policies = updated_policies
+            task = self.get_net_parameter_update(task, active_policies, metrics)
+            trace.policy_hops.append(active_policies)
+            if len(trace.policy_hops) >= max_policy_hops:
+                trace.policy_stop_reason = "hop_limit"
+                break
+        return active_policies, task
+
+    def _evaluate_stage_hops(
+        self,
+        current_stage: Stage,
+        metrics: TMetrics,
+        max_stage_hops: int,
+        trace: EvaluationTrace,
+    ) -> Optional[Stage]:
+        """
+        Evaluates stage transitions repeatedly, from the stage reached by the previous hop,
+        until no transition applies (fixed point), a transition leads back to a stage
+        visited during this evaluation (cycle), or max_stage_hops hops were taken.
+        Each hop is equivalent to one single-hop evaluation with the same metrics.
+        Returns the last stage reached, or None if no stage transition applied.
+        """
+        graph = self.curriculum.graph
+        visited = {graph._get_node_id(current_stage)}
+        stage = None
+        while True:
+            updated_stage = self._evaluate_stage_transition(self.curriculum, stage or current_stage, metrics)
+            if stage is not None:
+                if updated_stage is None:
+                    trace.stage_stop_reason = "fixed_point"
+                    break
+                if graph._get_node_id(updated_stage) in visited:
+                    trace.stage_stop_reason = "cycle"
+                    break
+            if updated_stage is None:
+                break
+
+            stage = updated_stage
+            visited.add(graph._get_node_id(stage))
+            trace.stage_hops.append(stage.name)
+            if len(trace.stage_hops) >= max_stage_hops:
+                trace.stage_stop_reason = "hop_limit"
+                break
+        return stage
+
+    def evaluate(
+        self,
+        trainer_state: TrainerState[TCurriculum],
+        metrics: Metrics,
+        max_policy_hops: int = 1,
+        max_stage_hops: int = 1,
+    ) -> TrainerState[TCurriculum]:
         """
         Evaluates the current state of the trainer and updates the stage and policies based on the provided metrics.
+        Stages of the curriculum are never modified: the task resulting from the active policies
+        is stored as the subject-specific task of the returned state.
         Args:
             trainer_state (TrainerState): The current state of the trainer, including the current stage and active policies.
             metrics (TMetrics): The metrics used to evaluate the current state and determine transitions.
+            max_policy_hops (int): Maximum number of policy transitions evaluated in a row. By default,
+                each active policy advances by at most one transition. See `evaluate_with_trace`.
+            max_stage_hops (int): Maximum number of stage transitions taken in a row. By default,
+                the subject advances by at most one stage. See `evaluate_with_trace`.
+        Returns:
+            TrainerState: The updated state of the trainer, including the new stage, active policies and task.
+        Raises:
+            ValueError: If the current stage or active policies are not set in the trainer state.
+        """
+        return self.evaluate_with_trace(
+            trainer_state, metrics, max_policy_hops=max_policy_hops, max_stage_hops=max_stage_hops
+        )[0]
+
+    def evaluate_with_trace(
+        self,
+        trainer_state: TrainerState[TCurriculum],
+        metrics: Metrics,
+        max_policy_hops: int = 1,
+        max_stage_hops: int = 1,
+    ) -> Tuple[TrainerState[TCurriculum], EvaluationTrace]:
+        """
+        Same as `evaluate`, and also returns the transitions taken.
+
+        With max_policy_hops > 1, policy transitions are evaluated repeatedly within this call,
+        as if the subject was evaluated again with the same metrics, until the active policies
+        stop changing, a set of active policies is revisited, or max_policy_hops hops were taken.
+
+        Likewise, with max_stage_hops > 1, stage transitions are taken repeatedly, until no
+        transition of the reached stage applies, a transition leads back to a stage visited
+        during this evaluation, or max_stage_hops hops were taken. This lets a subject that
+        was not evaluated for a while catch up to the latest stage it qualifies for in a single
+        evaluation. As with a single hop, the reached stage starts from its start policies.
+        Args:
+            trainer_state (TrainerState): The current state of the trainer, including the current stage
+                and active policies.
+            metrics (TMetrics): The metrics used to evaluate the current state and determine transitions.
+            max_policy_hops (int): Maximum number of policy transitions evaluated in a row.
+            max_stage_hops (int): Maximum number of stage transitions taken in a row.
         Returns:
-            TrainerState: The updated state of the trainer, including the new stage and active policies.
+            Tuple[TrainerState, EvaluationTrace]: The updated state of the trainer and the transitions taken.
         Raises:
             ValueError: If the current stage or active policies are not set in the trainer state.
         """
+        if max_policy_hops < 1:
+            raise ValueError("max_policy_hops must be at least 1.")
+        if max_stage_hops < 1:
+            raise ValueError("max_stage_hops must be at least 1.")
+
         current_stage = trainer_state.stage
         active_policies: Optional[Iterable[Policy[Metrics, Task]]] = trainer_state.active_policies
+        trace = EvaluationTrace()
 
         if current_stage is None:
             raise ValueError("No current stage. This likely means subject is off-curriculum.")
 
         # 1) Evaluate stage transitions
-        updated_stage = self._evaluate_stage_transition(self.curriculum, current_stage, metrics)
+        updated_stage = self._evaluate_stage_hops(current_stage, metrics, max_stage_hops, trace)
+        updated_task: Optional[Task] = None
 
         # 2) Evaluate policy transitions
         # If we've already transitioned stages, we don't need to check policies.
         if updated_stage is None:
-            updated_stage = current_stage
+            updated_stage = self.curriculum.get_stage(current_stage.name)
 
-            active_policies = active_policies if active_policies is not None else []
+            active_policies = list(active_policies) if active_policies is not None else []
 
-            active_policies = self._evaluate_policy_transitions(current_stage, active_policies, metrics)
             # 3) Bootstrap updated parameters with new policies
-            updated_task = self.get_net_parameter_update(updated_stage.get_task(), active_policies, metrics)
-            updated_stage.set_task(updated_task)
+            active_policies, updated_task = self._evaluate_policy_hops(
+                updated_stage, active_policies, trainer_state.get_task(), metrics, max_policy_hops, trace
+            )
 
         # If we've transitioned stages, we keep to default task_parameters,
         # and reset active_policies to the start_policies of the new stage.
         else:
             active_policies = updated_stage.start_policies
 
-        return self._trainer_state_factory(
+        updated_state = self._trainer_state_factory(
             curriculum=self.curriculum,
             stage=updated_stage,
             is_on_curriculum=True,
             active_policies=active_policies,
+            task=updated_task,
         )
+        return updated_state, trace
 
     @staticmethod
     def get_net_parameter_update(
@@ -346,6 +638,11 @@ class TrainerServer:
     3) Call Trainer.evaluate_subject() or Trainer.override_subject_status() x N
     """
 
+    # Maximum number of policy transitions evaluated in a row by evaluate_subjects, see Trainer.evaluate.
+    max_policy_hops: int = 1
+    # Maximum number of stage transitions taken in a row by evaluate_subjects, see Trainer.evaluate.
+    max_stage_hops: int = 1
+
     def __init__(self):
         """
         Trainer manages a list of subjects initialized here.
@@ -393,13 +690,10 @@ class TrainerServer:
         Updates subject history, which involves many steps.
         Stage parameters and policies are expected to be part
         of stage-- not checked here b/c this is a private utility.
+        The updated task is stored in the trainer state, the stage is not modified.
 
-        If any of {stage, updated_stage_parameters, stage_policies} are None,
-        all of the elements are expected to be None.
+        If stage is None, all of the elements are expected to be None.
         """
-        if not (stage is None or updated_task is None or stage_policies is None):
-            stage.set_task(updated_task)
-
         trainer = Trainer(curriculum)
         if stage is None:
             trainer_state = trainer.create_trainer_state(stage=None, is_on_curriculum=False, active_policies=None)
@@ -408,6 +702,7 @@ class TrainerServer:
                 stage=stage,
                 is_on_curriculum=True,
                 active_policies=(list(stage_policies) if stage_policies else None),
+                task=updated_task,
             )
 
         self.write_data(s_id, curriculum, trainer_state)
@@ -443,11 +738,8 @@ class TrainerServer:
 
         _start_policies = list(start_policies)
 
-        initial_task = Trainer.get_net_parameter_update(
-            start_stage.get_task(),
-            _start_policies,
-            curr_metrics=Metrics(),  # Metrics is empty on registration.
-        )
+        # Metrics is empty on registration.
+        initial_task = Trainer(curriculum).get_stage_entry_task(start_stage, _start_policies)
         self._update_subject_trainer_state(
             subject_id,
             curriculum,
@@ -465,7 +757,8 @@ class TrainerServer:
         subject stage along curriculum.
         The time-step between evaluate_subject calls is flexible--
         this function will skip subject to the latest stage/policy
-        they are applicable for.
+        they are applicable for, taking up to max_stage_hops stage
+        transitions and max_policy_hops policy transitions.
 
         Evaluation checks for stage transitions before policy transitions.
 
@@ -479,10 +772,15 @@ class TrainerServer:
             trainer = Trainer(curriculum)
 
             if trainer_state.stage is not None:
-                updated_trainer_state = trainer.evaluate(trainer_state, curr_metrics)
+                updated_trainer_state = trainer.evaluate(
+                    trainer_state,
+                    curr_metrics,
+                    max_policy_hops=self.max_policy_hops,
+                    max_stage_hops=self.max_stage_hops,
+                )
                 if updated_trainer_state.stage is None:
                     raise ValueError("Trainer.evaluate() returned None stage. This should not happen.")
-                updated_task = updated_trainer_state.stage.get_task()
+                updated_task = updated_trainer_state.task
             else:
                 updated_trainer_state = trainer.create_trainer_state(
                     stage=None,
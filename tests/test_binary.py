@@ -0,0 +1,82 @@
+"""
+Binary Serialization Test Suite
+"""
+
+import os
+import tempfile
+import unittest
+
+import example_project as ex
+import example_project_2 as ex2
+
+from aind_behavior_curriculum import Trainer
+from aind_behavior_curriculum.binary import BinaryDocument, dump_binary, from_binary, load_binary, to_binary
+
+
+class BinarySerializationTests(unittest.TestCase):
+    """Unit tests for the binary curriculum encoding"""
+
+    def test_round_trip_curriculum(self):
+        for curriculum_type, curr in (
+            (ex.MyCurriculum, ex.construct_curriculum()),
+            (ex2.MyCurriculum, ex2.construct_tree_curriculum()),
+            (ex2.MyCurriculum, ex2.construct_stage_triangle_curriculum()),
+            (ex.MyCurriculum, ex.MyCurriculum(name="My Curriculum")),
+        ):
+            data = to_binary(curr)
+            recovered = from_binary(curriculum_type, data)
+            self.assertEqual(curr.model_dump_json(), recovered.model_dump_json())
+            self.assertEqual(curr.fingerprint(), recovered.fingerprint())
+            if len(curr.see_stages()) > 0:
+                self.assertLess(len(data), len(curr.model_dump_json()))
+
+    def test_round_trip_trainer_state(self):
+        ex_curr = ex.construct_curriculum()
+        trainer = Trainer(ex_curr)
+        state = trainer.create_enrollment()
+        task = state.get_task()
+        task.task_parameters.field_a = 8
+
+        for trainer_state in (
+            state,
+            trainer.create_trainer_state(stage=state.stage, active_policies=state.active_policies, task=task),
+            trainer.create_trainer_state(stage=None, is_on_curriculum=False),
+        ):
+            recovered = from_binary(trainer.trainer_state_model, to_binary(trainer_state))
+            self.assertEqual(trainer_state.model_dump_json(), recovered.model_dump_json())
+
+    def test_memory_mapped_stage(self):
+        ex_curr = ex.construct_curriculum()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "curriculum.bin")
+            dump_binary(ex_curr, path)
+
+            with BinaryDocument.open(path) as document:
+                self.assertEqual(document.kind, "Curriculum")
+                self.assertEqual(document.stage_names(), [stage.name for stage in ex_curr.see_stages()])
+
+                name = ex_curr.see_stages()[1].name
+                stage = document.load_stage(ex.MyCurriculum, name)
+                self.assertEqual(stage.model_dump_json(), ex_curr.get_stage(name).model_dump_json())
+                # Only the records of the requested stage were decoded
+                self.assertEqual(len(document._stages._decoded), 1)
+                self.assertEqual(len(document._tasks._decoded), 1)
+                with self.assertRaises(KeyError):
+                    document.load_stage(ex.MyCurriculum, "Not a stage")
+
+            recovered = load_binary(ex.MyCurriculum, path, lazy_tasks=True)
+            self.assertFalse(any(stage.is_task_loaded for stage in recovered.see_stages()))
+            self.assertEqual(ex_curr.model_dump_json(), recovered.model_dump_json())
+
+    def test_invalid_documents(self):
+        data = to_binary(ex.construct_curriculum())
+        with self.assertRaises(ValueError):
+            from_binary(ex.MyCurriculum, b"not a binary document")
+        with self.assertRaises(ValueError):
+            from_binary(ex.MyCurriculum, data[: len(data) // 2])
+        with self.assertRaises(ValueError):
+            from_binary(ex.MyCurriculum, data[:4] + b"\xff\xff" + data[6:])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,21 +2,48 @@
 Curriculum Test Suite
 """
 
+import json
+import multiprocessing
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+from unittest import mock
 
 import example_project as ex
 import example_project_2 as ex2
-from pydantic import BaseModel, PydanticUserError
+from pydantic import BaseModel, Field, PydanticUserError
 
 from aind_behavior_curriculum import (
+    GRADUATED,
     Curriculum,
+    Graduated,
     Metrics,
     Policy,
+    PolicyTransition,
     Stage,
+    StageGraph,
     Task,
+    TaskParameters,
     create_curriculum,
+    create_task,
+    export_schemas,
+    load_json,
+    parse_task,
+    peek_task_name,
+    task_dispatch_table,
+)
+from aind_behavior_curriculum.base import structural_copy
+from aind_behavior_curriculum.curriculum import (
+    _BehaviorGraph,
+    _curriculum_known_tasks,
+    _is_validated,
+    _mark_validated,
+    _sharded_stage_problems,
+    _validated_models,
+    make_task_discriminator,
 )
-from aind_behavior_curriculum.curriculum import make_task_discriminator
 
 
 def init_stage_rule(metrics: Metrics, task: Task) -> Task:
@@ -101,6 +128,207 @@ class CurriculumTests(unittest.TestCase):
         instance_prime = ex.MyCurriculum.model_validate_json(parent_json)
         self.assertEqual(ex_curr, instance_prime)
 
+    def test_fingerprint(self):
+        """Fingerprints identify the content, independently of the construction order."""
+        taskA = ex.TaskA(task_parameters=ex.TaskAParameters())
+        taskB = ex.TaskB(task_parameters=ex.TaskBParameters())
+
+        def build(reverse: bool) -> Curriculum:
+            stageA = Stage(name="StageA", task=taskA)
+            stageB = Stage(name="StageB", task=taskB)
+            policies = [(ex.INIT_STAGE, ex.stageA_policyA, ex.t1_5), (ex.stageA_policyA, ex.stageA_policyB, ex.t1_5)]
+            for start, dest, rule in reversed(policies) if reverse else policies:
+                stageA.add_policy_transition(start, dest, rule)
+            stageA.set_start_policies(ex.INIT_STAGE)
+
+            curriculum = ex.MyCurriculum()
+            if reverse:
+                curriculum.add_stage(stageB)
+            curriculum.add_stage_transition(stageA, stageB, ex.t2_10)
+            return curriculum
+
+        ex_curr, reversed_curr = build(False), build(True)
+        self.assertNotEqual(ex_curr.model_dump_json(), reversed_curr.model_dump_json())
+        self.assertEqual(ex_curr.fingerprint(), reversed_curr.fingerprint())
+        self.assertEqual(ex_curr.get_stage("StageA").fingerprint(), reversed_curr.get_stage("StageA").fingerprint())
+        self.assertEqual(
+            ex_curr.fingerprint(), ex.MyCurriculum.model_validate_json(ex_curr.model_dump_json()).fingerprint()
+        )
+
+        # Task parameters, transition priorities and rules are part of the content
+        fingerprint = ex_curr.fingerprint()
+        stageA = ex_curr.get_stage("StageA")
+        transitions = stageA.see_policy_transitions(ex.INIT_STAGE)
+        stageA.add_policy_transition(ex.INIT_STAGE, ex.stageA_policyB, ex.t2_10)
+        self.assertNotEqual(ex_curr.fingerprint(), fingerprint)
+        stageA.set_policy_transition_priority(
+            ex.INIT_STAGE, list(reversed(stageA.see_policy_transitions(ex.INIT_STAGE)))
+        )
+        self.assertNotEqual(ex_curr.fingerprint(), fingerprint)
+        stageA.remove_policy_transition(ex.INIT_STAGE, ex.stageA_policyB, ex.t2_10)
+        stageA.set_policy_transition_priority(ex.INIT_STAGE, transitions)
+        self.assertEqual(ex_curr.fingerprint(), fingerprint)
+
+        task = stageA.get_task()
+        self.assertEqual(task.fingerprint(), taskA.fingerprint())
+        task.task_parameters.field_a = 8
+        self.assertNotEqual(task.fingerprint(), taskA.fingerprint())
+        stageA.set_task(task)
+        self.assertNotEqual(ex_curr.fingerprint(), fingerprint)
+
+    def test_diff(self):
+        ex_curr = ex.construct_curriculum()
+        self.assertTrue(ex_curr.diff(ex.construct_curriculum()).is_empty)
+
+        # The new version is edited in its serialized form, with a rule that cannot be imported.
+        document = ex_curr.model_dump(mode="json")
+        stageA, stageB = document["graph"]["nodes"]["0"], document["graph"]["nodes"]["2"]
+        stageA["task"]["task_parameters"]["field_a"] = 5
+        stageA["graph"]["nodes"]["1"] = "not_a_module.new_policy"
+        stageA["graph"]["graph"]["0"].reverse()
+        stageB["name"] = "StageB v2"
+        document["graph"]["graph"]["0"][1][0] = "not_a_module.new_transition"
+        new_curr = ex.MyCurriculum.model_validate_json(json.dumps(document))
+
+        diff = ex_curr.diff(new_curr)
+        changes = {(change.kind, change.location): change for change in diff.changes}
+        A = "example_project.curriculum."
+        self.assertEqual(
+            set(changes),
+            {
+                ("stage_renamed", "stage[StageB]"),
+                ("task_parameters_changed", "stage[StageA].task.task_parameters"),
+                ("policy_removed", f"stage[StageA].policy[{A}stageA_policyB_rule]"),
+                ("policy_added", "stage[StageA].policy[not_a_module.new_policy]"),
+                ("transition_removed", f"stage[StageA].transition[{A}init_stage_rule -> {A}stageA_policyB_rule]"),
+                ("transition_added", f"stage[StageA].transition[{A}init_stage_rule -> not_a_module.new_policy]"),
+                ("transition_removed", f"stage[StageA].transition[{A}stageA_policyA_rule -> {A}stageA_policyB_rule]"),
+                ("transition_added", f"stage[StageA].transition[{A}stageA_policyA_rule -> not_a_module.new_policy]"),
+                ("rule_changed", "curriculum.transition[StageA -> StageB v2]"),
+            },
+        )
+        self.assertEqual(changes[("stage_renamed", "stage[StageB]")].after, "StageB v2")
+        parameters = changes[("task_parameters_changed", "stage[StageA].task.task_parameters")]
+        self.assertEqual((parameters.before, parameters.after), ({"field_a": 0}, {"field_a": 5}))
+
+        # Priorities are reordered, but the same transitions are kept
+        stage = ex_curr.get_stage("StageB")
+        stage.set_policy_transition_priority(ex.INIT_STAGE, list(reversed(stage.see_policy_transitions(ex.INIT_STAGE))))
+        self.assertEqual(
+            [(c.kind, c.location) for c in ex.construct_curriculum().diff(ex_curr).changes],
+            [("priority_changed", f"stage[StageB].transition[{A}init_stage_rule]")],
+        )
+
+        # The change set is serializable
+        self.assertEqual(type(diff).model_validate_json(diff.model_dump_json()), diff)
+
+    def test_export_schemas(self):
+        with tempfile.TemporaryDirectory() as directory:
+            files = export_schemas("example_project", directory)
+            self.assertEqual(
+                sorted(file.name for file in files),
+                [
+                    "ExampleMetrics.json",
+                    "ExampleTask.json",
+                    "My_Curriculum.json",
+                    "My_CurriculumTrainerState.json",
+                    "Task_A.json",
+                    "Task_B.json",
+                ],
+            )
+            with open(Path(directory) / "My_Curriculum.json", encoding="utf-8") as f:
+                self.assertEqual(json.load(f), ex.MyCurriculum.model_json_schema())
+
+    def test_validation_cache(self):
+        """Validation results are cached against the curriculum and stage contents."""
+        _validated_models.clear()
+        ex_curr = ex.construct_curriculum()
+        ex_curr.validate_curriculum()
+
+        with (
+            mock.patch.object(Stage, "model_validate_json", side_effect=Stage.model_validate_json) as stage_validate,
+            mock.patch.object(
+                ex.MyCurriculum, "model_validate_json", side_effect=ex.MyCurriculum.model_validate_json
+            ) as curriculum_validate,
+        ):
+            # Unchanged curricula are not validated again, even as a copy
+            ex_curr.validate_curriculum()
+            ex.MyCurriculum.model_validate_json(ex_curr.model_dump_json()).validate_curriculum()
+            self.assertEqual(stage_validate.call_count, 0)
+            self.assertEqual(curriculum_validate.call_count, 1)
+
+            # Only the modified stage is validated again
+            task = ex_curr.get_stage("StageA").get_task()
+            task.task_parameters.field_a = 8
+            ex_curr.get_stage("StageA").set_task(task)
+            ex_curr.validate_curriculum()
+            self.assertEqual(stage_validate.call_count, 1)
+            self.assertEqual(curriculum_validate.call_count, 2)
+
+    def test_validation_cache_is_thread_safe(self):
+        """The validation cache can be shared by threads, e.g. by a TrainerServer."""
+        _validated_models.clear()
+
+        def validate(offset: int) -> None:
+            for i in range(2000):
+                key = (Curriculum, str((offset + i) % 64))
+                if not _is_validated(key):
+                    _mark_validated(key)
+
+        with mock.patch("aind_behavior_curriculum.curriculum.VALIDATION_CACHE_SIZE", 16):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(validate, range(0, 64, 8)))
+        self.assertLessEqual(len(_validated_models), 16)
+        _validated_models.clear()
+
+    def test_validation_report(self):
+        """All problems are reported at once."""
+        ex_curr = ex.construct_curriculum()
+        # Tasks are checked without building intermediate json strings
+        with mock.patch.object(ex.TaskA, "model_dump_json") as model_dump_json:
+            self.assertTrue(ex_curr.validation_report().is_valid)
+        model_dump_json.assert_not_called()
+        self.assertFalse(ex.MyCurriculum().validation_report().is_valid)
+
+        def local_policy(metrics: ex.ExampleMetrics, task: ex.TaskA) -> ex.TaskA:
+            return task
+
+        stageA = ex_curr.get_stage("StageA")
+        stageA.add_policy(local_policy)
+        # Local rules survive a json round trip, only the report flags them
+        ex_curr.validate_curriculum()
+        self.assertEqual([p.kind for p in ex_curr.validation_report().problems], ["unresolvable_rule"])
+
+        # Bypasses validate_assignment, as an in place modification would
+        stageA.task.task_parameters.__dict__["field_a"] = "not an int"
+        ex_curr.graph.add_node(Stage(name="Unknown", task=ex2.DummyTask(task_parameters=ex2.DummyParameters())))
+        ex_curr.graph.graph[0].append((ex.t2_10, 42))
+
+        report = ex_curr.validation_report()
+        self.assertEqual(
+            sorted(problem.kind for problem in report.problems),
+            ["dangling_transition", "invalid_task", "unknown_task", "unresolvable_rule"],
+        )
+        rule_problem = next(p for p in report.problems if p.kind == "unresolvable_rule")
+        self.assertTrue(rule_problem.location.startswith("stage[StageA].policy["))
+        with self.assertRaises(ValueError):
+            ex_curr.validate_curriculum()
+
+        # Stages holding local rules cannot be sent to worker processes and are validated serially
+        self.assertEqual(ex_curr.validation_report(max_workers=2), report)
+
+        # Sharding stages across worker processes finds the same problems, in the same order
+        ex_curr = ex.construct_curriculum()
+        stageA_graph = ex_curr.get_stage("StageA").graph
+        stageA_graph.graph[next(iter(stageA_graph.graph))].append((ex.t1_5, 42))
+        ex_curr.get_stage("StageB").start_policies.append(ex.stageA_policyA)
+        stages, known_tasks = ex_curr.see_stages(), _curriculum_known_tasks(type(ex_curr))
+        serial = ex_curr.validation_report().problems
+        self.assertEqual(len(serial), 2)
+        if multiprocessing.get_start_method() == "fork":
+            self.assertEqual(_sharded_stage_problems(stages, known_tasks, max_workers=2), serial)
+        self.assertEqual(ex_curr.validation_report(max_workers=8).problems, serial)
+
     def test_round_trip_edit_task_parameters(self):
         ex_curr = ex.construct_curriculum()
 
@@ -403,6 +631,251 @@ class CurriculumTests(unittest.TestCase):
 
         self.assertEqual(ex_curr.see_stage_transitions(stageA), new_priority)
 
+    def test_get_stage_and_policy_by_name(self):
+        ex_curr = ex.construct_curriculum()
+        stageA = ex_curr.see_stages()[0]
+
+        self.assertIs(ex_curr.get_stage("StageA"), stageA)
+        self.assertIs(stageA.get_policy(ex.stageA_policyA.name), stageA.see_policies()[2])
+        with self.assertRaises(ValueError):
+            ex_curr.get_stage("Not a stage")
+        with self.assertRaises(ValueError):
+            stageA.get_policy(ex.stageB_policyA.name)
+
+        # The index follows graph edits
+        ex_curr.remove_stage(stageA)
+        with self.assertRaises(ValueError):
+            ex_curr.get_stage("StageA")
+        stageA.remove_policy(ex.stageA_policyA)
+        with self.assertRaises(ValueError):
+            stageA.get_policy(ex.stageA_policyA.name)
+
+        # ...and is rebuilt on deserialization
+        recovered = ex.MyCurriculum.model_validate_json(ex_curr.model_dump_json())
+        self.assertEqual(recovered.get_stage("StageB"), ex_curr.get_stage("StageB"))
+        self.assertIs(recovered.get_stage("StageB"), recovered.see_stages()[1])
+
+    def test_same_name_policies(self):
+        """
+        Closures created by the same factory share a qualified name
+        but are distinct policies.
+        """
+
+        def make_policy() -> Policy:
+            def policy(metrics, task):
+                return task.model_copy(update={"task_parameters": task.task_parameters})
+
+            return Policy(policy)
+
+        def make_transition(threshold: int) -> PolicyTransition:
+            def rule(metrics):
+                return metrics.m1 > threshold
+
+            return PolicyTransition(rule)
+
+        p1, p2, p3 = make_policy(), make_policy(), make_policy()
+        self.assertEqual(p1.name, p2.name)
+        self.assertNotEqual(p1, p2)
+
+        stage = Stage(name="StageA", task=ex.TaskA(task_parameters=ex.TaskAParameters()))
+        stage.add_policy_transition(p1, p2, make_transition(1))
+        stage.add_policy_transition(p2, p3, make_transition(2))
+        stage.add_policy_transition(p1, p3, make_transition(3))
+
+        self.assertEqual(stage.see_policies(), [p1, p2, p3])
+        self.assertEqual([dest for _, dest in stage.see_policy_transitions(p1)], [p2, p3])
+        self.assertEqual([dest for _, dest in stage.see_policy_transitions(p2)], [p3])
+
+        stage.remove_policy(p2)
+        self.assertEqual(stage.see_policies(), [p1, p3])
+        self.assertEqual([dest for _, dest in stage.see_policy_transitions(p1)], [p3])
+
+    def test_graduation_distances(self):
+        """
+        For graph:
+        A -> B -> GRADUATED
+        A -> GRADUATED
+        C -> A
+        D (floating)
+        """
+        ex_curr = ex.construct_curriculum()
+        stageA = ex_curr.get_stage("StageA")
+        self.assertEqual(ex_curr.graduation_distances(), {"GRADUATED": 0, "StageA": 1, "StageB": 1})
+
+        stageC = Stage(name="StageC", task=ex.TaskA(task_parameters=ex.TaskAParameters()))
+        stageD = Stage(name="StageD", task=ex.TaskA(task_parameters=ex.TaskAParameters()))
+        ex_curr.add_stage_transition(stageC, stageA, ex.t2_5)
+        ex_curr.add_stage(stageD)
+        self.assertEqual(ex_curr.stages_to_graduation(stageC), 2)
+        self.assertIsNone(ex_curr.stages_to_graduation("StageD"))
+
+        # Cache is invalidated by graph edits
+        ex_curr.remove_stage_transition(stageA, ex_curr.get_stage("GRADUATED"), ex.t2_10)
+        self.assertEqual(ex_curr.stages_to_graduation("StageA"), 2)
+        self.assertEqual(ex_curr.stages_to_graduation("StageC"), 3)
+
+        self.assertEqual(ex_curr.graduation_distances("StageB"), {"StageB": 0, "StageA": 1, "StageC": 2})
+        self.assertEqual(ex_curr.graduation_distances("Not a stage"), {})
+
+    def test_linear_construction_and_loading(self):
+        """Building and loading a curriculum scale linearly with its stage and transition count."""
+        dummy_task = ex2.DummyTask(task_parameters=ex2.DummyParameters())
+
+        def build(n_stages: int) -> Curriculum:
+            curriculum = ex2.MyCurriculum()
+            stages = [Stage(name=f"Stage {i}", task=dummy_task) for i in range(n_stages)]
+            for start, dest in zip(stages, stages[1:]):
+                curriculum.add_stage_transition(start, dest, ex2.m1_stage_transition)
+                curriculum.add_stage_transition(dest, start, ex2.m2_stage_transition)
+            return curriculum
+
+        # Node indexes are built once per graph, not once per added node
+        n_stages = 500
+        n_transitions = 2 * (n_stages - 1)
+        rebuild_node_index = _BehaviorGraph._rebuild_node_index
+        with (
+            mock.patch.object(
+                _BehaviorGraph, "_rebuild_node_index", autospec=True, side_effect=rebuild_node_index
+            ) as rebuild,
+            mock.patch.object(Stage, "__eq__", autospec=True, side_effect=Stage.__eq__) as stage_eq,
+        ):
+            curriculum = build(n_stages)
+            self.assertLessEqual(rebuild.call_count, n_stages + 1)
+            # Resolving a node compares it to the nodes of the same name only,
+            # a linear scan of the nodes would take ~n_stages comparisons per transition
+            self.assertLessEqual(stage_eq.call_count, 8 * n_transitions)
+
+            rebuild.reset_mock()
+            stage_eq.reset_mock()
+            recovered = ex2.MyCurriculum.model_validate_json(curriculum.model_dump_json())
+            self.assertLessEqual(rebuild.call_count, n_stages + 1)
+            self.assertEqual(stage_eq.call_count, 0)
+        self.assertEqual(curriculum, recovered)
+
+    def test_cached_transition_tables(self):
+        """Transition tables are reused across lookups and rebuilt on graph edits."""
+        ex_curr = ex.construct_curriculum()
+        stageA = ex_curr.get_stage("StageA")
+
+        transitions = stageA._get_policy_transitions(ex.INIT_STAGE)
+        self.assertIs(transitions, stageA._get_policy_transitions(ex.INIT_STAGE))
+        self.assertEqual(list(transitions), stageA.see_policy_transitions(ex.INIT_STAGE))
+        self.assertEqual(list(ex_curr._get_stage_transitions(stageA)), ex_curr.see_stage_transitions(stageA))
+
+        stageA.set_policy_transition_priority(ex.INIT_STAGE, list(reversed(transitions)))
+        self.assertEqual(stageA._get_policy_transitions(ex.INIT_STAGE), tuple(reversed(transitions)))
+
+        ex_curr.remove_stage(ex_curr.get_stage("StageB"))
+        self.assertEqual(ex_curr._get_stage_transitions(stageA), ((ex.t2_10, GRADUATED),))
+
+        # The public view reads the graph live, including direct edits of the graph field
+        init_id = stageA.graph._get_node_id(ex.INIT_STAGE)
+        stageA.graph.graph[init_id].clear()
+        self.assertEqual(stageA.see_policy_transitions(ex.INIT_STAGE), [])
+        ex_curr.graph.graph[ex_curr.graph._get_node_id(stageA)].clear()
+        self.assertEqual(ex_curr.see_stage_transitions(stageA), [])
+
+    def test_shared_policy_graphs(self):
+        """Stages with identical policy graphs share one graph until they modify it."""
+        ex_curr = ex2.construct_stage_triangle_curriculum()
+        for stage in ex_curr.see_stages():
+            stage.add_policy_transition(ex2.policy_1, ex2.policy_2, ex2.m1_policy_transition)
+            stage.set_start_policies(ex2.policy_1)
+        expected_json = ex_curr.model_dump_json()
+
+        self.assertEqual(ex_curr.deduplicate_policy_graphs(), 1)
+        stage_1, stage_2, stage_3 = ex_curr.see_stages()
+        self.assertIs(stage_1.graph.nodes, stage_2.graph.nodes)
+        self.assertIs(stage_1.graph.graph, stage_3.graph.graph)
+        self.assertEqual(ex_curr.model_dump_json(), expected_json)
+
+        # Transition tables are shared through the graph
+        self.assertIs(stage_1._get_policy_transitions(ex2.policy_1), stage_2._get_policy_transitions(ex2.policy_1))
+
+        # Modifying a stage copies the shared nodes and transitions
+        stage_2.add_policy_transition(ex2.policy_2, ex2.policy_3, ex2.m1_policy_transition)
+        self.assertIsNot(stage_1.graph.graph, stage_2.graph.graph)
+        self.assertIs(stage_1.graph.graph, stage_3.graph.graph)
+        self.assertEqual(stage_1.see_policy_transitions(ex2.policy_2), [])
+        self.assertEqual(len(stage_2.see_policy_transitions(ex2.policy_2)), 1)
+        self.assertEqual(ex_curr.deduplicate_policy_graphs(), 2)
+
+        # Including through the graph API
+        stage_1.graph.add_node(ex2.policy_3)
+        self.assertIn(ex2.policy_3, stage_1.see_policies())
+        self.assertNotIn(ex2.policy_3, stage_3.see_policies())
+
+        # Start policies must be part of the shared graph
+        with self.assertRaises(ValueError):
+            stage_3.share_policy_graph(Stage(name="Stage 5", task=stage_1.task).graph)
+
+        # Copies neither change the copied stage nor share its containers
+        for copy_stage in (structural_copy(stage_3), stage_3.model_copy(deep=True)):
+            self.assertFalse(copy_stage.graph._shared)
+            copy_stage.graph.add_node(ex2.policy_3)
+            self.assertNotIn(ex2.policy_3, stage_3.see_policies())
+        self.assertTrue(stage_3.graph._shared)
+        self.assertIs(stage_3.graph.graph, ex_curr.see_stages()[2].graph.graph)
+
+        # Copying or constructing with an unshared graph does not mark it shared
+        stage_4 = Stage(name="Stage 4", task=stage_1.task)
+        stage_4.add_policy(ex2.policy_1)
+        stage_4.model_copy()
+        structural_copy(ex_curr)
+        Stage(name="Stage 5", task=stage_1.task, graph=stage_4.graph)
+        self.assertFalse(stage_4.graph._shared)
+        stage_4.graph.add_node(ex2.policy_2)
+        self.assertIn(ex2.policy_2, stage_4.see_policies())
+
+    def test_known_tasks(self):
+        """Known tasks are introspected once per Curriculum type and stage tasks are checked incrementally."""
+        ex_curr = ex.construct_curriculum()
+        self.assertEqual(set(ex_curr._known_tasks), {ex.TaskA, ex.TaskB, ex.Graduated})
+
+        with mock.patch.object(StageGraph, "see_nodes", autospec=True, side_effect=StageGraph.see_nodes) as see_nodes:
+            _ = ex_curr._known_tasks
+            new_stage = Stage(name="StageC", task=ex.TaskB(task_parameters=ex.TaskBParameters()))
+            ex_curr.add_stage_transition(ex_curr.get_stage("StageB"), new_stage, ex.t2_10)
+            _ = ex_curr._known_tasks
+            self.assertEqual(see_nodes.call_count, 0)
+
+        # Stages with unknown tasks are rejected as they are added
+        unknown_stage = Stage(name="Unknown", task=ex2.DummyTask(task_parameters=ex2.DummyParameters()))
+        with self.assertRaises(ValueError):
+            ex_curr.add_stage(unknown_stage)
+        with self.assertRaises(ValueError):
+            ex_curr.add_stage_transition(new_stage, unknown_stage, ex.t2_10)
+        self.assertNotIn("Unknown", [stage.name for stage in ex_curr.see_stages()])
+
+        # Stages added outside of the curriculum API are checked again
+        ex_curr.graph.add_node(unknown_stage)
+        with self.assertRaises(ValueError):
+            _ = ex_curr._known_tasks
+
+    def test_get_and_set_task_isolation(self):
+        """Tasks handed out or taken in by a Stage never alias the Stage's task."""
+
+        class ScheduleParameters(TaskParameters):
+            schedule: List[float] = Field(default_factory=lambda: [0.0, 1.0])
+            blocks: Dict[str, List[int]] = Field(default_factory=lambda: {"a": [1, 2]})
+
+        ScheduleTask = create_task(name="schedule_task", task_parameters=ScheduleParameters)
+        stage = Stage(name="Stage", task=ScheduleTask(task_parameters=ScheduleParameters()))
+
+        task = stage.get_task()
+        self.assertEqual(task, stage.task)
+        task.task_parameters.schedule.append(2.0)
+        task.task_parameters.blocks["a"].append(3)
+        task.task_parameters.field_x = 1
+        self.assertEqual(stage.task.task_parameters.schedule, [0.0, 1.0])
+        self.assertEqual(stage.task.task_parameters.blocks, {"a": [1, 2]})
+        self.assertFalse(hasattr(stage.task.task_parameters, "field_x"))
+
+        stage.set_task(task)
+        task.task_parameters.schedule.clear()
+        self.assertEqual(stage.task.task_parameters.schedule, [0.0, 1.0, 2.0])
+        self.assertEqual(stage.task.task_parameters.field_x, 1)
+
     def test_create_curriculum(self):
         _ = create_curriculum("test_curriculum", "1.2.3", (ex.TaskA, ex.TaskB))
         _ = create_curriculum("test_curriculum", "1.2.3", (ex.TaskA, ex.TaskB, ex.TaskB))
@@ -413,6 +886,20 @@ class CurriculumTests(unittest.TestCase):
             pkg_location="example_project",
         )
 
+    def test_create_curriculum_is_memoized(self):
+        curriculum_type = create_curriculum("test_curriculum", "1.2.3", (ex.TaskA, ex.TaskB))
+        self.assertIs(curriculum_type, create_curriculum("test_curriculum", "1.2.3", iter([ex.TaskB, ex.TaskA])))
+        self.assertIsNot(curriculum_type, create_curriculum("test_curriculum", "1.2.4", (ex.TaskA, ex.TaskB)))
+        self.assertIsNot(curriculum_type, create_curriculum("test_curriculum", "1.2.3", (ex.TaskA,)))
+        self.assertIsNot(
+            curriculum_type,
+            create_curriculum("test_curriculum", "1.2.3", (ex.TaskA, ex.TaskB), pkg_location="example_project"),
+        )
+        self.assertIs(
+            ex.MyCurriculum,
+            create_curriculum(name="My Curriculum", version="0.1.0", tasks=(ex.TaskA, ex.TaskB, ex.Graduated)),
+        )
+
     def test_create_curriculum_equivalence(self):
         _tasks = make_task_discriminator((ex.TaskA, ex.TaskB))
 
@@ -446,6 +933,53 @@ class CurriculumTests(unittest.TestCase):
             expected_curriculum.model_validate_json(expected_curriculum.model_dump_json()),
         )
 
+    def test_task_discriminator_is_memoized(self):
+        _tasks = make_task_discriminator((ex.TaskA, ex.TaskB))
+        self.assertIs(_tasks, make_task_discriminator([ex.TaskB, ex.TaskA, ex.TaskB]))
+        self.assertIsNot(_tasks, make_task_discriminator((ex.TaskA,)))
+        self.assertIs(
+            ex.construct_curriculum().task_discriminator_type(),
+            make_task_discriminator((ex.TaskA, ex.TaskB, ex.Graduated)),
+        )
+
+    def test_task_dispatch_table(self):
+        table = task_dispatch_table([ex.TaskA, ex.TaskB, Graduated])
+        self.assertEqual(dict(table), {"Task A": ex.TaskA, "Task B": ex.TaskB, "Graduated": Graduated})
+        self.assertIs(table, task_dispatch_table([Graduated, ex.TaskB, ex.TaskA]))
+        with self.assertRaises(TypeError):
+            table["Task C"] = ex.TaskA
+        with self.assertRaises(ValueError):
+            task_dispatch_table([Task])
+        with self.assertRaises(ValueError):
+            task_dispatch_table([ex.TaskA, create_task(name="Task A", task_parameters=TaskParameters, version="1.0.0")])
+
+    def test_peek_task_name(self):
+        task = ex.TaskA(task_parameters=ex.TaskAParameters(field_a=3))
+        self.assertEqual(peek_task_name(task.model_dump_json()), "Task A")
+        self.assertEqual(peek_task_name(task.model_dump_json().encode()), "Task A")
+        # Only the top-level name counts
+        self.assertEqual(peek_task_name('{"task_parameters": {"name": "inner"}, "name" : "Task \\"A\\""}'), 'Task "A"')
+        self.assertEqual(peek_task_name('{"description": "name", "task_parameters": {"name": "inner"}}'), None)
+        self.assertEqual(peek_task_name('{"name": 3}'), None)
+
+    def test_parse_task(self):
+        tasks = (ex.TaskA, ex.TaskB)
+        task = ex.TaskB(task_parameters=ex.TaskBParameters(field_b=0.5))
+        self.assertEqual(parse_task(tasks, task.model_dump_json()), task)
+
+        # Unknown tasks fail before validation
+        with mock.patch.object(ex.TaskA, "model_validate_json") as validate:
+            with self.assertRaises(ValueError):
+                parse_task(tasks, '{"name": "Task C", "task_parameters": {}}')
+            validate.assert_not_called()
+
+        # Lazily loaded stage tasks are parsed through the dispatch table
+        ex_curr = ex.construct_curriculum()
+        recovered = load_json(ex.MyCurriculum, ex_curr.model_dump_json(), lazy_tasks=True)
+        with mock.patch("aind_behavior_curriculum.curriculum.type_adapter") as adapter:
+            self.assertEqual(recovered.get_stage("StageB").task, ex_curr.get_stage("StageB").task)
+            adapter.assert_not_called()
+
     def test_create_curriculum_with_invalid_tagged_union(self):
         class NotATask(BaseModel):
             not_name: str = "Not a Task"
@@ -0,0 +1,100 @@
+"""
+Curriculum Migration Test Suite
+"""
+
+import json
+import unittest
+from unittest import mock
+
+import example_project as ex
+
+from aind_behavior_curriculum import Trainer
+from aind_behavior_curriculum.migration import (
+    MigrationRegistry,
+    remap_policy,
+    rename_stage,
+    transform_task_parameters,
+)
+
+OLD_POLICY = "example_project.curriculum.old_stageA_policyB_rule"
+NEW_POLICY = "example_project.curriculum.stageA_policyB_rule"
+
+
+def downgrade(document):
+    """Turns a serialized TrainerState of the current curriculum into one of version 0.0.1."""
+    document["curriculum"]["version"] = "0.0.1"
+    stages = list(document["curriculum"]["graph"]["nodes"].values()) + [document["stage"]]
+    for stage in stages:
+        if stage["name"] == "StageA":
+            stage["name"] = "Stage A"
+            stage["task"]["task_parameters"] = {"a": stage["task"]["task_parameters"]["field_a"]}
+            nodes = stage["graph"]["nodes"]
+            for node_id, rule in nodes.items():
+                if rule == NEW_POLICY:
+                    nodes[node_id] = OLD_POLICY
+    document["active_policies"] = [OLD_POLICY if p == NEW_POLICY else p for p in document["active_policies"]]
+    return document
+
+
+def make_migrations():
+    """Migrations of the example curriculum: 0.0.1 -> 0.0.5 -> 0.1.0"""
+    migrations = MigrationRegistry()
+    migrations.register("My Curriculum", "0.0.1", "0.0.5", rename_stage("Stage A", "StageA"))
+
+    @migrations.migration("My Curriculum", "0.0.5", "0.1.0")
+    def rename_fields(document):
+        document = transform_task_parameters("Task A", lambda p: {"field_a": p["a"]})(document)
+        return remap_policy(OLD_POLICY, NEW_POLICY)(document)
+
+    return migrations
+
+
+class MigrationTests(unittest.TestCase):
+    """Unit tests for curriculum migrations"""
+
+    def test_path(self):
+        migrations = make_migrations()
+        self.assertEqual(migrations.path("My Curriculum", "0.0.1", "0.1.0"), ["0.0.1", "0.0.5", "0.1.0"])
+        self.assertEqual(migrations.path("My Curriculum", "0.0.5", "0.1.0"), ["0.0.5", "0.1.0"])
+        with self.assertRaises(ValueError):
+            migrations.path("My Curriculum", "0.1.0", "0.0.1")
+        with self.assertRaises(ValueError):
+            migrations.path("Other Curriculum", "0.0.1", "0.1.0")
+
+    def test_migrate_trainer_states(self):
+        ex_curr = ex.construct_curriculum()
+        trainer = Trainer(ex_curr)
+        stageA, stageB = ex_curr.get_stage("StageA"), ex_curr.get_stage("StageB")
+        states = [
+            trainer.create_enrollment(),
+            trainer.create_trainer_state(stage=stageA, active_policies=[ex.stageA_policyB]),
+            trainer.create_trainer_state(stage=stageB, active_policies=[ex.stageB_policyA]),
+        ]
+        records = [json.dumps(downgrade(state.model_dump(mode="json"))) for state in states]
+
+        migrations = make_migrations()
+        with mock.patch.object(migrations, "path", wraps=migrations.path) as path:
+            migrated = list(migrations.migrate_trainer_states(trainer.trainer_state_model, records * 10, "0.1.0"))
+            # The migration is composed once per source version
+            self.assertEqual(path.call_count, 1)
+
+        self.assertEqual(len(migrated), 30)
+        for state, recovered in zip(states * 10, migrated):
+            self.assertEqual(state.model_dump_json(), recovered.model_dump_json())
+
+        # Records already at the target version are left unchanged
+        current = list(
+            migrations.migrate_trainer_states(trainer.trainer_state_model, [states[0].model_dump_json()], "0.1.0")
+        )
+        self.assertEqual(current[0].model_dump_json(), states[0].model_dump_json())
+
+    def test_migrate_curriculum(self):
+        ex_curr = ex.construct_curriculum()
+        old = downgrade(Trainer(ex_curr).create_enrollment().model_dump(mode="json"))["curriculum"]
+
+        recovered = make_migrations().migrate_curriculum(ex.MyCurriculum, json.dumps(old), "0.1.0")
+        self.assertEqual(recovered.model_dump_json(), ex_curr.model_dump_json())
+
+
+if __name__ == "__main__":
+    unittest.main()
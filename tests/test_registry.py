@@ -0,0 +1,145 @@
+"""
+Curriculum Registry Test Suite
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import example_project as ex
+import example_project_2 as ex2
+
+from aind_behavior_curriculum import CurriculumRegistry
+from aind_behavior_curriculum import registry as registry_module
+
+
+class CurriculumRegistryTests(unittest.TestCase):
+    """Unit tests for the curriculum registry"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "curricula.registry")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_add_and_get(self):
+        ex_curr = ex.construct_curriculum()
+        with CurriculumRegistry(self.path) as registry:
+            self.assertEqual(len(registry), 0)
+            fingerprint = registry.add(ex_curr)
+            self.assertEqual(fingerprint, ex_curr.fingerprint())
+
+            recovered = registry.get(ex.MyCurriculum, ex_curr.name, ex_curr.version)
+            self.assertEqual(recovered.model_dump_json(), ex_curr.model_dump_json())
+            # Parsed curricula are cached, and every lookup returns its own copy
+            with mock.patch.object(registry_module, "load_compact_json") as load:
+                copy = registry.get_by_fingerprint(ex.MyCurriculum, fingerprint)
+            load.assert_not_called()
+            self.assertIsNot(copy, recovered)
+            task = copy.get_stage("StageA").get_task()
+            task.task_parameters.field_a = 8
+            copy.get_stage("StageA").set_task(task)
+            stage = copy.get_stage("StageA")
+            with self.assertWarns(UserWarning):
+                stage.remove_policy(next(iter(stage.graph.nodes.values())))
+            again = registry.get(ex.MyCurriculum, ex_curr.name, ex_curr.version)
+            self.assertEqual(again.model_dump_json(), ex_curr.model_dump_json())
+            self.assertEqual(again.fingerprint(), fingerprint)
+
+            self.assertIn((ex_curr.name, ex_curr.version), registry)
+            self.assertIn(fingerprint, registry)
+            self.assertNotIn((ex_curr.name, "9.9.9"), registry)
+            with self.assertRaises(KeyError):
+                registry.get(ex.MyCurriculum, ex_curr.name, "9.9.9")
+
+            # Adding the same curriculum again does not append a record
+            size = os.path.getsize(self.path)
+            registry.add(ex.construct_curriculum())
+            self.assertEqual(os.path.getsize(self.path), size)
+
+            # Versions are immutable
+            modified = ex.construct_curriculum()
+            task = modified.get_stage("StageA").get_task()
+            task.task_parameters.field_a = 8
+            modified.get_stage("StageA").set_task(task)
+            with self.assertRaises(ValueError):
+                registry.add(modified)
+
+    def test_multiple_curricula_and_processes(self):
+        with CurriculumRegistry(self.path) as registry, CurriculumRegistry(self.path) as other:
+            ex_curr = ex.construct_curriculum()
+            registry.add(ex_curr)
+            tree = ex2.construct_tree_curriculum()
+            other.add(tree)
+
+            # Records appended through another handle are indexed on lookup
+            recovered = registry.get(ex2.MyCurriculum, tree.name, tree.version)
+            self.assertEqual(recovered.model_dump_json(), tree.model_dump_json())
+            self.assertEqual(len(registry), 2)
+            # Both example curricula share their name
+            self.assertEqual(registry.versions(tree.name), [ex_curr.version, tree.version])
+
+        # The store is reopened from disk
+        with CurriculumRegistry(self.path) as registry:
+            self.assertEqual(len(registry), 2)
+            self.assertEqual(registry.get(ex2.MyCurriculum, tree.name, tree.version).fingerprint(), tree.fingerprint())
+
+    def test_persisted_index(self):
+        tree = ex2.construct_tree_curriculum()
+        with CurriculumRegistry(self.path) as registry:
+            registry.add(ex.construct_curriculum())
+            registry.add(tree)
+
+        # Reopening reads the index section ending the file, rather than every record
+        with mock.patch.object(CurriculumRegistry, "_scan") as scan, CurriculumRegistry(self.path) as registry:
+            self.assertEqual(len(registry), 2)
+            self.assertIn(tree.fingerprint(), registry)
+            recovered = registry.get(ex2.MyCurriculum, tree.name, tree.version)
+            self.assertEqual(recovered.model_dump_json(), tree.model_dump_json())
+        scan.assert_not_called()
+
+    def test_interrupted_write(self):
+        ex_curr = ex.construct_curriculum()
+        tree = ex2.construct_tree_curriculum()
+        with CurriculumRegistry(self.path) as registry:
+            registry.add(ex_curr)
+        with open(self.path, "ab") as f:
+            f.write(b'{"name": "Partial", "version": "0.1.0", "fingerprint": "0", "length": 100}\n{"pa')
+
+        # Records before the interrupted write are still found, and the next record is indexed after it
+        with CurriculumRegistry(self.path) as registry:
+            self.assertEqual(len(registry), 1)
+            self.assertIn(ex_curr.fingerprint(), registry)
+            registry.add(tree)
+        with CurriculumRegistry(self.path) as registry:
+            self.assertEqual(len(registry), 2)
+            self.assertEqual(registry.get(ex2.MyCurriculum, tree.name, tree.version).fingerprint(), tree.fingerprint())
+
+    def test_locking_without_fcntl(self):
+        msvcrt = mock.Mock()
+        with mock.patch.object(registry_module, "fcntl", None), mock.patch.object(registry_module, "msvcrt", msvcrt):
+            with CurriculumRegistry(self.path) as registry:
+                registry.add(ex.construct_curriculum())
+                self.assertEqual(len(registry), 1)
+        # The lock is taken on a lock file next to the registry
+        self.assertTrue(os.path.exists(self.path + ".lock"))
+        self.assertEqual(
+            [call.args[1] for call in msvcrt.locking.call_args_list],
+            [msvcrt.LK_LOCK, msvcrt.LK_UNLCK] * 2,
+        )
+
+    def test_invalid_store(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write('{"format": "something else"}\n')
+        with mock.patch.object(
+            CurriculumRegistry, "close", autospec=True, side_effect=CurriculumRegistry.close
+        ) as close:
+            with self.assertRaises(ValueError):
+                CurriculumRegistry(self.path)
+        close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,269 @@
+"""
+Compact Serialization Test Suite
+"""
+
+import importlib
+import json
+import unittest
+from unittest import mock
+
+import example_project as ex
+import example_project_2 as ex2
+from pydantic import ValidationError
+
+from aind_behavior_curriculum import Curriculum, Stage, Trainer
+from aind_behavior_curriculum.curriculum import PolicyGraph, _UnparsedTask
+from aind_behavior_curriculum.serialization import (
+    dump_compact_json,
+    expand_compact,
+    load_compact_json,
+    load_json,
+    load_trainer_states,
+    to_compact,
+)
+
+
+class CompactSerializationTests(unittest.TestCase):
+    """Unit tests for the compact curriculum encoding"""
+
+    def test_round_trip_curriculum(self):
+        ex_curr = ex.construct_curriculum()
+
+        compact_json = dump_compact_json(ex_curr)
+        recovered = load_compact_json(ex.MyCurriculum, compact_json)
+
+        self.assertEqual(ex_curr, recovered)
+        self.assertEqual(ex_curr.model_dump_json(), recovered.model_dump_json())
+
+        # Deserialize from Parent
+        instance_parent = load_compact_json(Curriculum, compact_json)
+        self.assertEqual(ex_curr.model_dump_json(), instance_parent.model_dump_json())
+
+    def test_round_trip_empty_curriculum(self):
+        ex_curr = ex.MyCurriculum(name="My Curriculum")
+        recovered = load_compact_json(ex.MyCurriculum, dump_compact_json(ex_curr))
+        self.assertEqual(ex_curr, recovered)
+
+    def test_expand_matches_model_dump(self):
+        for curr in (
+            ex.construct_curriculum(),
+            ex2.construct_tree_curriculum(),
+            ex2.construct_stage_triangle_curriculum(),
+        ):
+            self.assertEqual(expand_compact(to_compact(curr)), curr.model_dump(mode="json"))
+
+    def test_round_trip_after_removals(self):
+        """Node ids are no longer contiguous after removing nodes."""
+        dummy_task = ex2.DummyTask(task_parameters=ex2.DummyParameters())
+        stageA = Stage(name="Stage A", task=dummy_task)
+        stageA.add_policy_transition(ex2.policy_1, ex2.policy_2, ex2.m1_policy_transition)
+        stageA.add_policy_transition(ex2.policy_2, ex2.policy_3, ex2.m1_policy_transition)
+        stageA.remove_policy(ex2.policy_1)
+        stageB = Stage(name="Stage B", task=dummy_task)
+        stageC = Stage(name="Stage C", task=dummy_task)
+
+        ex_curr = ex2.MyCurriculum()
+        ex_curr.add_stage_transition(stageC, stageA, ex2.m1_stage_transition)
+        ex_curr.add_stage_transition(stageA, stageB, ex2.m2_stage_transition)
+        ex_curr.remove_stage(stageC)
+
+        compact = to_compact(ex_curr)
+        self.assertEqual(compact["body"]["graph"]["ids"], [1, 2])
+        recovered = load_compact_json(ex2.MyCurriculum, json.dumps(compact))
+        self.assertEqual(ex_curr.model_dump_json(), recovered.model_dump_json())
+
+    def test_header_deduplicates(self):
+        ex_curr = ex2.construct_stage_triangle_curriculum()
+        compact = to_compact(ex_curr)
+
+        self.assertEqual(len(compact["rules"]), 2)
+        self.assertEqual(len(compact["tasks"]), 1)
+        self.assertEqual(len(compact["graphs"]), 1)
+        self.assertEqual(len(compact["stages"]), 3)
+        self.assertLess(len(dump_compact_json(ex_curr)), len(ex_curr.model_dump_json()))
+
+    def test_shared_policy_graphs(self):
+        ex_curr = ex2.construct_stage_triangle_curriculum()
+        for stage in ex_curr.see_stages():
+            stage.add_policy_transition(ex2.policy_1, ex2.policy_2, ex2.m1_policy_transition)
+            stage.set_start_policies(ex2.policy_1)
+
+        compact = to_compact(ex_curr)
+        self.assertEqual(len(compact["graphs"]), 1)
+        self.assertEqual({stage["graph"] for stage in compact["stages"]}, {0})
+
+        # Stages of the loaded curriculum share their policy graph, which is validated once
+        with mock.patch.object(
+            PolicyGraph, "_rebuild_node_index", autospec=True, side_effect=PolicyGraph._rebuild_node_index
+        ) as rebuild_node_index:
+            recovered = load_compact_json(ex2.MyCurriculum, json.dumps(compact))
+        self.assertEqual(ex_curr.model_dump_json(), recovered.model_dump_json())
+        self.assertEqual(len({id(stage.graph.graph) for stage in recovered.see_stages()}), 1)
+        validated_graphs = [call.args[0] for call in rebuild_node_index.call_args_list if len(call.args[0].nodes) == 2]
+        self.assertEqual(len(validated_graphs), 1)
+
+        # Version 1 documents store policy graphs inline
+        compact["format_version"] = 1
+        for stage in compact["stages"]:
+            stage["graph"] = compact["graphs"][stage["graph"]]
+        del compact["graphs"]
+        self.assertEqual(expand_compact(compact), ex_curr.model_dump(mode="json"))
+
+    def test_round_trip_trainer_state(self):
+        ex_curr = ex.construct_curriculum()
+        trainer = Trainer(ex_curr)
+        state = trainer.create_enrollment()
+
+        compact = to_compact(state)
+        # The state stage is shared with the curriculum table
+        self.assertEqual(len(compact["stages"]), 3)
+
+        recovered = load_compact_json(trainer.trainer_state_model, json.dumps(compact))
+        self.assertEqual(state, recovered)
+        self.assertEqual(state.model_dump_json(), recovered.model_dump_json())
+
+        task = state.get_task()
+        task.task_parameters.field_a = 8
+        with_task = trainer.create_trainer_state(stage=state.stage, active_policies=state.active_policies, task=task)
+        compact = to_compact(with_task)
+        self.assertEqual(len(compact["tasks"]), 4)
+        recovered = load_compact_json(trainer.trainer_state_model, json.dumps(compact))
+        self.assertEqual(with_task.model_dump_json(), recovered.model_dump_json())
+
+        off_curriculum = trainer.create_trainer_state(stage=None, is_on_curriculum=False)
+        recovered = load_compact_json(trainer.trainer_state_model, dump_compact_json(off_curriculum))
+        self.assertEqual(off_curriculum.model_dump_json(), recovered.model_dump_json())
+
+    def test_lazy_task_loading(self):
+        ex_curr = ex.construct_curriculum()
+        curriculum_json = ex_curr.model_dump_json()
+
+        for recovered in (
+            load_json(ex.MyCurriculum, curriculum_json, lazy_tasks=True),
+            load_compact_json(ex.MyCurriculum, dump_compact_json(ex_curr), lazy_tasks=True),
+        ):
+            stages = recovered.see_stages()
+            self.assertFalse(any(stage.is_task_loaded for stage in stages))
+
+            # Only the accessed task is validated
+            self.assertEqual(stages[1].task, ex_curr.see_stages()[1].task)
+            self.assertEqual([stage.is_task_loaded for stage in stages], [False, True, False])
+            # The loaded task is kept by the stage, loading the task of a copy leaves the original unloaded
+            self.assertIs(stages[1].task, stages[1].task)
+            stage_copy = stages[0].model_copy(deep=True)
+            self.assertEqual(stage_copy.task, ex_curr.see_stages()[0].task)
+            self.assertEqual([stage.is_task_loaded for stage in stages], [False, True, False])
+
+            # Serialization loads the remaining tasks into the stages, each payload is parsed once
+            with mock.patch.object(_UnparsedTask, "load", autospec=True, side_effect=_UnparsedTask.load) as load:
+                for _ in range(3):
+                    self.assertEqual(curriculum_json, recovered.model_dump_json())
+                recovered.fingerprint()
+            self.assertEqual(load.call_count, 2)
+            self.assertTrue(all(stage.is_task_loaded for stage in stages))
+            self.assertEqual(ex_curr, recovered)
+
+    def test_lazy_task_loading_trainer_state(self):
+        ex_curr = ex.construct_curriculum()
+        trainer = Trainer(ex_curr)
+        state = trainer.create_enrollment()
+        state_json = state.model_dump_json()
+
+        recovered = load_json(trainer.trainer_state_model, state_json, lazy_tasks=True)
+        self.assertFalse(recovered.stage.is_task_loaded)
+        self.assertEqual(state, recovered)
+
+        lazy_trainer = Trainer(recovered.curriculum)
+        updated = lazy_trainer.evaluate(lazy_trainer.rebind_trainer_state(recovered), ex.ExampleMetrics(theta_1=50))
+        self.assertEqual(updated.get_task(), trainer.evaluate(state, ex.ExampleMetrics(theta_1=50)).get_task())
+        # Only the subject's own stage task was needed
+        self.assertTrue(recovered.stage.is_task_loaded)
+        self.assertFalse(any(stage.is_task_loaded for stage in lazy_trainer.curriculum.see_stages()))
+
+    def test_lazy_task_validation(self):
+        document = ex.construct_curriculum().model_dump(mode="json")
+        document["graph"]["nodes"]["0"]["task"]["task_parameters"]["field_a"] = "not an int"
+
+        # Invalid tasks only fail once accessed
+        recovered = load_json(ex.MyCurriculum, json.dumps(document), lazy_tasks=True)
+        with self.assertRaises(ValidationError):
+            _ = recovered.see_stages()[0].task
+        with self.assertRaises(ValidationError):
+            load_json(ex.MyCurriculum, json.dumps(document))
+
+        # Raw json tasks are rejected outside of lazy loading
+        document = ex.construct_curriculum().model_dump(mode="json")
+        document["graph"]["nodes"]["0"]["task"] = json.dumps(document["graph"]["nodes"]["0"]["task"])
+        with self.assertRaises(ValidationError):
+            ex.MyCurriculum.model_validate_json(json.dumps(document))
+
+    def test_load_trainer_states(self):
+        ex_curr = ex.construct_curriculum()
+        trainer = Trainer(ex_curr)
+        states = [
+            trainer.create_enrollment(),
+            trainer.create_trainer_state(stage=ex_curr.get_stage("StageB"), active_policies=[ex.stageB_policyA]),
+            trainer.create_trainer_state(stage=None, is_on_curriculum=False),
+        ]
+        records = [state.model_dump_json() for state in states]
+
+        for lazy_tasks in (True, False):
+            loaded = list(load_trainer_states(trainer.trainer_state_model, records, lazy_tasks=lazy_tasks))
+            self.assertEqual(loaded[0].stage.is_task_loaded, not lazy_tasks)
+            self.assertEqual([state.model_dump_json() for state in loaded], records)
+
+        # Records holding unknown tasks fail before being validated
+        document = json.loads(records[1])
+        document["stage"]["task"]["name"] = "Task C"
+        for lazy_tasks in (True, False):
+            states = load_trainer_states(
+                trainer.trainer_state_model, [records[0], json.dumps(document)], lazy_tasks=lazy_tasks
+            )
+            self.assertEqual(next(states).model_dump_json(), records[0])
+            with self.assertRaises(ValueError):
+                next(states)
+
+    def test_load_trainer_states_deserializes_rules_once(self):
+        trainer = Trainer(ex.construct_curriculum())
+        records = [trainer.create_enrollment().model_dump_json() for _ in range(20)]
+
+        def count_rule_imports(load):
+            with mock.patch("importlib.import_module", wraps=importlib.import_module) as import_module:
+                states = load()
+            return states, import_module.call_count
+
+        _, per_record = count_rule_imports(lambda: trainer.trainer_state_model.model_validate_json(records[0]))
+        self.assertGreater(per_record, 0)
+        _, plain = count_rule_imports(
+            lambda: [trainer.trainer_state_model.model_validate_json(record) for record in records]
+        )
+        self.assertEqual(plain, len(records) * per_record)
+
+        for lazy_tasks in (True, False):
+            _, single = count_rule_imports(
+                lambda lazy_tasks=lazy_tasks: list(
+                    load_trainer_states(trainer.trainer_state_model, records[:1], lazy_tasks=lazy_tasks)
+                )
+            )
+            states, bulk = count_rule_imports(
+                lambda lazy_tasks=lazy_tasks: list(
+                    load_trainer_states(trainer.trainer_state_model, records, lazy_tasks=lazy_tasks)
+                )
+            )
+            # Each distinct rule is deserialized once per load, however many records hold it
+            self.assertLessEqual(single, per_record)
+            self.assertEqual(bulk, single)
+            self.assertEqual([state.model_dump_json() for state in states], records)
+            # Rules are shared, the models holding them are not
+            self.assertIs(states[0].stage.start_policies[0], states[1].stage.start_policies[0])
+            self.assertIsNot(states[0].stage, states[1].stage)
+
+    def test_invalid_documents(self):
+        with self.assertRaises(TypeError):
+            to_compact(ex.TaskA(task_parameters=ex.TaskAParameters()))
+        with self.assertRaises(ValueError):
+            expand_compact({"format": "not-compact"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,11 +2,16 @@
 Task Test Suite
 """
 
+import gc
+import json
 import unittest
+import weakref
+from typing import Optional
+from unittest import mock
 
 import example_project as ex
 
-from aind_behavior_curriculum import Task
+from aind_behavior_curriculum import Task, TaskParameters, create_task, json_schema, list_type_adapter, type_adapter
 
 
 class TaskTests(unittest.TestCase):
@@ -76,6 +81,56 @@ class TaskTests(unittest.TestCase):
         instance_prime = ex.ExampleTask.model_validate_json(parent_json)
         self.assertEqual(ex_task, instance_prime)
 
+    def test_create_task_is_memoized(self):
+        task_type = create_task(name="memoized_task", task_parameters=ex.ExampleTaskParameters, version="1.0.0")
+        self.assertIs(
+            task_type, create_task(name="memoized_task", task_parameters=ex.ExampleTaskParameters, version="1.0.0")
+        )
+        self.assertIsNot(
+            task_type, create_task(name="memoized_task", task_parameters=ex.ExampleTaskParameters, version="1.0.1")
+        )
+        self.assertIsNot(task_type, create_task(name="memoized_task", task_parameters=TaskParameters, version="1.0.0"))
+
+    def test_cached_schema_and_adapters(self):
+        task_type = create_task(name="schema_task", task_parameters=ex.ExampleTaskParameters)
+        with mock.patch.object(task_type, "model_json_schema", wraps=task_type.model_json_schema) as generate:
+            schema = json_schema(task_type)
+            self.assertEqual(json_schema(task_type), schema)
+            self.assertEqual(generate.call_count, 1)
+        self.assertEqual(schema, task_type.model_json_schema())
+
+        # Callers receive a copy of the cached schema
+        schema["properties"].clear()
+        self.assertNotEqual(json_schema(task_type), schema)
+
+        self.assertIs(type_adapter(task_type), type_adapter(task_type))
+        self.assertIs(list_type_adapter(task_type), list_type_adapter(task_type))
+        tasks = [task_type(task_parameters=ex.ExampleTaskParameters(field_1=i)) for i in range(3)]
+        data = json.dumps([task.model_dump(mode="json") for task in tasks])
+        self.assertEqual(list_type_adapter(task_type).validate_json(data), tasks)
+        self.assertEqual(type_adapter(task_type).validate_json(tasks[0].model_dump_json()), tasks[0])
+
+    def test_cached_schema_and_adapters_are_released_with_the_type(self):
+        class TransientParameters(TaskParameters):
+            field_1: int = 0
+
+        task_type = create_task(name="transient_task", task_parameters=TransientParameters)
+        self.assertIs(task_type, create_task(name="transient_task", task_parameters=TransientParameters))
+        json_schema(task_type)
+        type_adapter(task_type)
+        list_type_adapter(task_type)
+        self.assertIs(type_adapter(task_type), type_adapter(task_type))
+
+        reference = weakref.ref(task_type)
+        del task_type
+        gc.collect()
+        self.assertIsNone(reference())
+
+        # Adapters of other types (e.g. unions of tasks) are kept in a bounded cache
+        union = Optional[ex.ExampleTask]
+        self.assertIs(type_adapter(union), type_adapter(union))
+        self.assertIs(list_type_adapter(union), list_type_adapter(union))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,14 +3,26 @@ Trainer Test Suite
 """
 
 import unittest
+import warnings
+from unittest import mock
 
 import example_project as ex
 import example_project_2 as ex2
+from pydantic import ValidationError
 
-from aind_behavior_curriculum import GRADUATED, Stage, Trainer, TrainerState
+from aind_behavior_curriculum import GRADUATED, Policy, Stage, Trainer, TrainerState
 
 
 class TrainerTests(unittest.TestCase):
+    def setUp(self):
+        # Stage entry tasks are cached on the Trainer class, start every test from an empty cache.
+        self._stage_entry_tasks = Trainer._stage_entry_tasks.copy()
+        Trainer._stage_entry_tasks.clear()
+
+    def tearDown(self):
+        Trainer._stage_entry_tasks.clear()
+        Trainer._stage_entry_tasks.update(self._stage_entry_tasks)
+
     def test_create_enrollment(self):
         """Tests the syntactic sugar method for creating a initial
         state for the trainer"""
@@ -52,6 +64,172 @@ class TrainerTests(unittest.TestCase):
         self.assertEqual(enrollment, expected)
         self.assertEqual(enrollment.model_dump(), expected.model_dump())
 
+    def test_rebind_trainer_state(self):
+        """Tests that a deserialized state can be rebound to the curriculum objects."""
+        curr = ex.construct_curriculum()
+        trainer = Trainer(curr)
+        stageA = curr.get_stage("StageA")
+
+        task = stageA.get_task()
+        task.task_parameters.field_a = 8
+        stage = stageA.model_copy(deep=True)
+        stage.set_task(task)
+        state = trainer.create_trainer_state(stage=stage, active_policies=[ex.stageA_policyA])
+        deserialized = trainer.trainer_state_model.model_validate_json(state.model_dump_json())
+
+        rebound = trainer.rebind_trainer_state(deserialized)
+        self.assertIs(rebound.curriculum, curr)
+        self.assertIs(rebound.stage, stageA)
+        self.assertIs(rebound.active_policies[0], stageA.get_policy(ex.stageA_policyA.name))
+        self.assertEqual(rebound.task.task_parameters.field_a, 8)
+        self.assertEqual(stageA.task.task_parameters.field_a, 0)
+        self.assertEqual(rebound, state)
+
+        # The subject-specific task is preserved as well
+        state = trainer.create_trainer_state(stage=stageA, active_policies=[ex.stageA_policyA], task=task)
+        rebound = trainer.rebind_trainer_state(trainer.trainer_state_model.model_validate_json(state.model_dump_json()))
+        self.assertIs(rebound.stage, stageA)
+        self.assertEqual(rebound.task, task)
+
+        off_curriculum = trainer.create_trainer_state(stage=None, is_on_curriculum=False)
+        self.assertIsNone(trainer.rebind_trainer_state(off_curriculum).stage)
+
+        unknown = trainer.create_trainer_state(stage=Stage(name="StageZ", task=task))
+        with self.assertRaises(ValueError):
+            trainer.rebind_trainer_state(unknown)
+        unknown_policy = trainer.create_trainer_state(stage=stageA, active_policies=[ex.stageB_policyA])
+        with self.assertRaises(ValueError):
+            trainer.rebind_trainer_state(unknown_policy)
+
+    def test_trainer_state_model_is_shared(self):
+        """Tests that trainers of the same curriculum type share their trainer state model."""
+        trainer = Trainer(ex.construct_curriculum())
+        self.assertIs(trainer.trainer_state_model, Trainer(ex.construct_curriculum()).trainer_state_model)
+        self.assertIsNot(trainer.trainer_state_model, Trainer(ex2.construct_tree_curriculum()).trainer_state_model)
+
+    def test_stage_entry_task_cache(self):
+        """Tests that stage entry tasks are computed once and returned as copies."""
+        curr = ex.construct_curriculum()
+        stageA = curr.get_stage("StageA")
+        trainer = Trainer(curr)
+
+        with mock.patch.object(Trainer, "get_net_parameter_update", wraps=Trainer.get_net_parameter_update) as update:
+            task = trainer.get_stage_entry_task(stageA)
+            self.assertEqual(task, stageA.task)
+            self.assertEqual(update.call_count, 1)
+
+            # Cached for equal curricula, the returned task is a copy
+            task.task_parameters.field_a = 8
+            other = Trainer(ex.construct_curriculum()).get_stage_entry_task("StageA")
+            self.assertEqual(other, stageA.task)
+            self.assertEqual(update.call_count, 1)
+
+    def test_stage_entry_task_cache_keys(self):
+        """Tests that stage entry tasks are keyed by stage task and start policies."""
+        curr = ex.construct_curriculum()
+        stageA = curr.get_stage("StageA")
+        trainer = Trainer(curr)
+
+        with mock.patch.object(Trainer, "get_net_parameter_update", wraps=Trainer.get_net_parameter_update) as update:
+            trainer.get_stage_entry_task(stageA)
+            trainer.get_stage_entry_task(stageA, [ex.stageA_policyA])
+            trainer.get_stage_entry_task(stageA, [ex.stageA_policyA])
+            self.assertEqual(update.call_count, 2)
+
+        # Keyed by stage task content
+        task = stageA.get_task()
+        task.task_parameters.field_a = 3
+        stageA.set_task(task)
+        self.assertEqual(trainer.get_stage_entry_task(stageA).task_parameters.field_a, 3)
+
+        # The task of the given stage is used, even if it differs from the curriculum's
+        stage_copy = stageA.model_copy(deep=True)
+        task.task_parameters.field_a = 5
+        stage_copy.set_task(task)
+        self.assertEqual(trainer.get_stage_entry_task(stage_copy).task_parameters.field_a, 5)
+        self.assertEqual(trainer.get_stage_entry_task("StageA").task_parameters.field_a, 3)
+
+        # Policies sharing a qualified name are distinct keys
+        def make_policy(field_a: int) -> Policy:
+            def policy(metrics, task):
+                task.task_parameters.field_a = field_a
+                return task
+
+            return Policy(policy)
+
+        self.assertEqual(trainer.get_stage_entry_task(stageA, [make_policy(1)]).task_parameters.field_a, 1)
+        self.assertEqual(trainer.get_stage_entry_task(stageA, [make_policy(2)]).task_parameters.field_a, 2)
+
+    def test_register_cohort_computes_stage_entry_task_once(self):
+        """Tests that registering a cohort on the same stage computes its entry task once."""
+        curr = ex.construct_curriculum()
+        stageA = curr.get_stage("StageA")
+        tr = ex.ExampleTrainer()
+
+        with mock.patch.object(Trainer, "get_net_parameter_update", wraps=Trainer.get_net_parameter_update) as update:
+            for subject_id in range(5):
+                tr.register_subject(subject_id, curr, stageA)
+            self.assertEqual(update.call_count, 1)
+
+    def test_register_subject_validates_curriculum(self):
+        """Tests that every registration validates the curriculum, which is only checked again once changed."""
+        curr = ex.construct_curriculum()
+        stageA = curr.get_stage("StageA")
+        tr = ex.ExampleTrainer()
+
+        tr.register_subject(0, curr, stageA)
+        # An unchanged curriculum is not round-tripped again
+        curriculum_type = type(curr)
+        with mock.patch.object(
+            curriculum_type, "model_validate_json", wraps=curriculum_type.model_validate_json
+        ) as round_trip:
+            for subject_id in range(1, 5):
+                tr.register_subject(subject_id, curr, stageA)
+        round_trip.assert_not_called()
+
+        # A curriculum changed after a registration is validated again
+        stageB_task = curr.get_stage("StageB").task
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            object.__setattr__(stageB_task.task_parameters, "field_b", "not a number")
+            with self.assertRaises(ValidationError):
+                curr.validate_curriculum()
+            with self.assertRaises(ValidationError):
+                tr.register_subject(5, curr, stageA)
+        self.assertNotIn(5, tr.subject_ids)
+
+    def test_evaluation_does_not_mutate_curriculum(self):
+        """Tests that the subject's task lives in the trainer state and not in the curriculum stages."""
+        curr = ex.construct_curriculum()
+        curr_json = curr.model_dump_json()
+        stageA = curr.get_stage("StageA")
+
+        tr = ex.ExampleTrainer()
+        tr.register_subject(0, curr, stageA)
+        tr.register_subject(1, curr, stageA)
+        ex.MICE_METRICS[0] = ex.ExampleMetrics(theta_1=8)
+        ex.MICE_METRICS[1] = ex.ExampleMetrics(theta_1=12)
+        tr.evaluate_subjects()
+
+        self.assertEqual(curr.model_dump_json(), curr_json)
+        self.assertEqual(tr.subject_history[0][-1].task.task_parameters.field_a, 8)
+        self.assertEqual(tr.subject_history[1][-1].task.task_parameters.field_a, 16)
+        self.assertEqual(tr.subject_history[0][-1].get_task().task_parameters.field_a, 8)
+        self.assertEqual(tr.subject_history[0][-1].stage.task.task_parameters.field_a, 0)
+
+        # A single trainer evaluates many subjects without modifying the curriculum
+        trainer = Trainer(curr)
+        states = [trainer.create_enrollment() for _ in range(3)]
+        metrics = [ex.ExampleMetrics(theta_1=t) for t in (0, 8, 12)]
+        updated = [trainer.evaluate(s, m) for s, m in zip(states, metrics)]
+        self.assertEqual([s.get_task().task_parameters.field_a for s in updated], [0, 8, 16])
+        self.assertEqual(curr.model_dump_json(), curr_json)
+
+        # Stage transitions reset to the default task of the new stage
+        graduated = trainer.evaluate(updated[2], ex.ExampleMetrics(theta_2=12))
+        self.assertEqual(graduated.stage, GRADUATED)
+        self.assertIsNone(graduated.task)
+
     def test_pure_stage_evaluation(self):
         """
         Tests if multiple trajectories through stages
@@ -482,6 +660,105 @@ class TrainerTests(unittest.TestCase):
 
         self.assertEqual(tr.subject_history[0], M0)
 
+    def test_multi_hop_policy_evaluation(self):
+        """
+        Tests that policy transitions can be evaluated to a fixed point in a single evaluation.
+        """
+        curr = ex2.construct_track_curriculum()
+        trainer = Trainer(curr)
+        metrics = ex2.ExampleMetrics2(m1=10, m2=10)
+        state = trainer.create_enrollment()
+
+        # Equivalent to repeated single-hop evaluations
+        expected = trainer.evaluate(trainer.evaluate(state, metrics), metrics)
+        updated, trace = trainer.evaluate_with_trace(state, metrics, max_policy_hops=10)
+        self.assertEqual(updated, expected)
+        self.assertEqual(updated.get_task(), expected.get_task())
+        self.assertEqual(updated.get_task().task_parameters, ex2.DummyParameters(field_1=10, field_2=10))
+        self.assertEqual(
+            [set(hop) for hop in trace.policy_hops],
+            [{ex2.policy_2, ex2.policy_5}, {ex2.policy_3, ex2.policy_6}],
+        )
+        self.assertEqual(trace.policy_stop_reason, "fixed_point")
+
+        # Single hop by default
+        updated, trace = trainer.evaluate_with_trace(state, metrics)
+        self.assertEqual(len(trace.policy_hops), 1)
+        self.assertEqual(trace.policy_stop_reason, "hop_limit")
+
+        # Cycles are detected
+        curr = ex2.construct_policy_triangle_curriculum()
+        trainer = Trainer(curr)
+        updated, trace = trainer.evaluate_with_trace(trainer.create_enrollment(), metrics, max_policy_hops=10)
+        self.assertEqual(trace.policy_hops, [[ex2.policy_2], [ex2.policy_3]])
+        self.assertEqual(trace.policy_stop_reason, "cycle")
+        self.assertEqual(updated.active_policies, [ex2.policy_3])
+
+        with self.assertRaises(ValueError):
+            trainer.evaluate(trainer.create_enrollment(), metrics, max_policy_hops=0)
+
+        # Trainer servers opt in with max_policy_hops
+        curr = ex2.construct_track_curriculum()
+        tr = ex2.ExampleTrainer()
+        tr.max_policy_hops = 10
+        tr.register_subject(0, curr, curr.see_stages()[0])
+        ex2.MICE_METRICS[0] = metrics
+        tr.evaluate_subjects()
+        self.assertEqual(set(tr.subject_history[0][-1].active_policies), {ex2.policy_3, ex2.policy_6})
+
+    def test_multi_hop_stage_evaluation(self):
+        """
+        Tests that stage transitions can be taken to a fixed point in a single evaluation.
+        """
+        dummy_task = ex2.DummyTask(task_parameters=ex2.DummyParameters())
+        stages = [Stage(name=f"Stage {i}", task=dummy_task) for i in range(1, 4)]
+        curr = ex2.MyCurriculum(name="My Curriculum")
+        curr.add_stage_transition(stages[0], stages[1], ex2.m1_stage_transition)
+        curr.add_stage_transition(stages[1], stages[2], ex2.m1_stage_transition)
+        trainer = Trainer(curr)
+        metrics = ex2.ExampleMetrics2(m1=10, m2=0)
+        state = trainer.create_enrollment()
+
+        # Equivalent to repeated single-hop evaluations
+        expected = trainer.evaluate(trainer.evaluate(state, metrics), metrics)
+        updated, trace = trainer.evaluate_with_trace(state, metrics, max_stage_hops=10)
+        self.assertEqual(updated, expected)
+        self.assertEqual(updated.stage.name, "Stage 3")
+        self.assertEqual(trace.stage_hops, ["Stage 2", "Stage 3"])
+        self.assertEqual(trace.stage_stop_reason, "fixed_point")
+        self.assertEqual(trace.policy_hops, [])
+
+        # Single hop by default
+        updated, trace = trainer.evaluate_with_trace(state, metrics)
+        self.assertEqual(updated.stage.name, "Stage 2")
+        self.assertEqual(trace.stage_hops, ["Stage 2"])
+        self.assertEqual(trace.stage_stop_reason, "hop_limit")
+
+        # No stage transition
+        updated, trace = trainer.evaluate_with_trace(state, ex2.ExampleMetrics2(m1=0, m2=0), max_stage_hops=10)
+        self.assertEqual(updated.stage.name, "Stage 1")
+        self.assertEqual((trace.stage_hops, trace.stage_stop_reason), ([], None))
+
+        # Cycles are detected
+        curr = ex2.construct_stage_triangle_curriculum()
+        trainer = Trainer(curr)
+        updated, trace = trainer.evaluate_with_trace(trainer.create_enrollment(), metrics, max_stage_hops=10)
+        self.assertEqual(trace.stage_hops, ["Stage 2", "Stage 3"])
+        self.assertEqual(trace.stage_stop_reason, "cycle")
+        self.assertEqual(updated.stage.name, "Stage 3")
+
+        with self.assertRaises(ValueError):
+            trainer.evaluate(trainer.create_enrollment(), metrics, max_stage_hops=0)
+
+        # Trainer servers opt in with max_stage_hops
+        curr = ex2.construct_stage_triangle_curriculum()
+        tr = ex2.ExampleTrainer()
+        tr.max_stage_hops = 10
+        tr.register_subject(0, curr, curr.see_stages()[0])
+        ex2.MICE_METRICS[0] = metrics
+        tr.evaluate_subjects()
+        self.assertEqual(tr.subject_history[0][-1].stage.name, "Stage 3")
+
     def test_policy_tree(self):
         """
         Tests multiple active policies along policy graph